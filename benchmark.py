@@ -0,0 +1,378 @@
+# Benchmarks the conversion on synthetic list files
+# Generates list files in the layout of the real ones (see parsers.list_formats)
+# at a given size, then times parsing them on their own and importing them into
+# a SQLite database, split into parsing, id resolution (select/select_or_insert
+# and the dictionaries) and database writes.
+#
+# usage: python benchmark.py [--titles N] [--list-dir DIR] [--keep] [--save FILE] [--baseline FILE]
+
+import os
+import sys
+import time
+import json
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing
+import parsers
+import tosql
+from settings import Database, Options, DatabaseTypes
+
+list_names = ["actresses", "actors", "movies", "ratings", "business", "locations", "biographies"]
+
+#
+# Synthetic list files
+#
+
+roman = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+months = ["January", "February", "March", "April", "May", "June", "July", "August",
+	"September", "October", "November", "December"]
+words = ["Night", "Day", "Love", "Death", "Return", "City", "Man", "Woman", "Dark", "Blue", "House",
+	"Story", "Last", "First", "Secret", "Life", "Dead", "King", "Girl", "Time", "Island", "War",
+	"Fire", "Summer", "Heart", "River", "Ghost", "Money", "Road", "Dream"]
+first_names = ["John", "Mary", "James", "Anna", "Robert", "Linda", "Michael", "Sarah", "David",
+	"Laura", "Jose", "Marie", "Hans", "Yuki", "Pierre", "Olga"]
+last_names = ["Smith", "Johnson", "Garcia", "Muller", "Rossi", "Tanaka", "Dubois", "Kowalski",
+	"O'Brien", "Silva", "Nguyen", "Jensen", "Costa", "Ivanov", "Berg", "Moreau"]
+places = ["Los Angeles, California, USA", "New York City, New York, USA", "London, England, UK",
+	"Paris, France", "Berlin, Germany", "Toronto, Ontario, Canada", "Tokyo, Japan",
+	"Rome, Lazio, Italy", "Sydney, New South Wales, Australia", "Mumbai, Maharashtra, India"]
+characters = ["Himself", "Herself", "Narrator", "Doctor", "Police Officer", "Waitress", "Guest",
+	"Himself - Host", "Nurse #2", "Reporter"]
+
+def title_text(rnd):
+	return " ".join(rnd.sample(words, rnd.randint(1, 4)))
+
+
+def make_titles(rnd, count):
+	"""returns count distinct titles as written in the lists, along with the
+	year (range) of the movies list"""
+	titles = []
+	seen = set()
+	while len(titles) < count:
+		year = "????" if rnd.random() < 0.03 else str(rnd.randint(1900, 2012))
+		number = "/" + rnd.choice(roman) if rnd.random() < 0.1 else ""
+		kind = rnd.random()
+		if kind < 0.45:
+			# episode of a series
+			series = '"%s" (%s%s)' % (title_text(rnd), year, number)
+			if rnd.random() < 0.7:
+				title = "%s {%s (#%d.%d)}" % (series, title_text(rnd), rnd.randint(1, 20), rnd.randint(1, 30))
+			else:
+				title = "%s {(%s-%02d-%02d)}" % (series, year if year != "????" else "2000", rnd.randint(1, 12), rnd.randint(1, 28))
+			if rnd.random() < 0.01:
+				title += " {{SUSPENDED}}"
+			span = year if year == "????" or rnd.random() < 0.5 else "%s-%d" % (year, int(year) + rnd.randint(0, 10))
+		else:
+			title = "%s (%s%s)" % (title_text(rnd), year, number)
+			if kind > 0.85:
+				title += " (%s)" % (rnd.choice(["TV", "V", "VG"]))
+			span = year
+		if title not in seen:
+			seen.add(title)
+			titles.append((title, span))
+	return titles
+
+
+def make_names(rnd, count):
+	"""returns count distinct names as written in the lists"""
+	names = []
+	seen = set()
+	while len(names) < count:
+		kind = rnd.random()
+		if kind < 0.05:
+			name = "%s%d" % (rnd.choice(last_names), len(names))
+		else:
+			name = "%s, %s" % (rnd.choice(last_names), rnd.choice(first_names))
+			if kind > 0.97:
+				name = "'%s' %s" % (rnd.choice(words), name)
+		if name in seen:
+			name = "%s (%s)" % (name, roman[len(names) % len(roman)])
+		if name not in seen:
+			seen.add(name)
+			names.append(name)
+	return names
+
+
+def write_people_list(f, rnd, banner, names, titles):
+	f.write("CRC: 0x%08X  File: %s  Date: Fri Dec 21 00:00:00 2012\n\n" % (rnd.getrandbits(32), banner))
+	f.write("%s\n%s\n\n" % (banner, "=" * len(banner)))
+	f.write("Name\t\t\tTitles \n")
+	f.write(parsers.list_formats["actors"].header)
+	for name in names:
+		for i, (title, span) in enumerate(rnd.sample(titles, rnd.randint(1, 8))):
+			line = title
+			if rnd.random() < 0.1:
+				line += "  (%s)" % (rnd.choice(["voice", "uncredited", "as %s" % (rnd.choice(first_names))]))
+			if rnd.random() < 0.8:
+				line += "  [%s]" % (rnd.choice(characters))
+			if rnd.random() < 0.6:
+				line += "  <%d>" % (rnd.randint(1, 60))
+			f.write("%s\t%s%s\n" % (name if i == 0 else "", "\t\t" if i > 0 else "", line))
+		f.write("\n")
+	f.write(parsers.list_formats["actors"].footer)
+	f.write("SUBMITTING UPDATES\n==================\n")
+
+
+def generate(list_dir, titles = 100000, seed = 1):
+	"""writes synthetic list files for titles productions (and about as many
+	people) to list_dir"""
+	rnd = random.Random(seed)
+	if not os.path.isdir(list_dir):
+		os.makedirs(list_dir)
+	productions = make_titles(rnd, titles)
+	actors = make_names(rnd, titles/2)
+	actresses = make_names(rnd, titles/3)
+	path = lambda name: os.path.join(list_dir, name + Options.file_extension)
+	separator = "-" * 79 + "\n"
+
+	with open(path("actors"), "w") as f:
+		write_people_list(f, rnd, "THE ACTORS LIST", actors, productions)
+	with open(path("actresses"), "w") as f:
+		write_people_list(f, rnd, "THE ACTRESSES LIST", actresses, productions)
+
+	with open(path("movies"), "w") as f:
+		f.write("CRC: 0x%08X  File: movies.list\n\nMOVIES LIST\n" % (rnd.getrandbits(32)))
+		f.write(parsers.list_formats["movies"].header + "\n")
+		for title, span in productions:
+			f.write("%s%s%s\n" % (title, "\t" * max(1, 9 - len(title)//8), span))
+		f.write(parsers.list_formats["movies"].footer)
+
+	with open(path("ratings"), "w") as f:
+		f.write("CRC: 0x%08X  File: ratings.list\n\n" % (rnd.getrandbits(32)))
+		f.write(parsers.list_formats["ratings"].header + "\n")
+		f.write("New  Distribution  Votes  Rank  Title\n")
+		for title, span in rnd.sample(productions, len(productions)//3):
+			distribution = "".join(rnd.choice("0123456789.*") for i in xrange(10))
+			f.write("%6s%s  %6d   %.1f  %s\n" % ("*" if rnd.random() < 0.05 else "", distribution, rnd.randint(5, 500000), rnd.randint(10, 100)/10.0, title))
+		f.write("\n" + parsers.list_formats["ratings"].footer + "\nREPORT FOOTER\n")
+
+	with open(path("business"), "w") as f:
+		f.write("CRC: 0x%08X  File: business.list\n\n" % (rnd.getrandbits(32)))
+		f.write(parsers.list_formats["business"].header + "=============\n\n")
+		for title, span in rnd.sample(productions, len(productions)//8):
+			f.write(separator + "MV: %s\n\n" % (title))
+			for i in xrange(rnd.randint(1, 4)):
+				f.write("BT: %s %s\n" % (rnd.choice(["USD", "EUR", "GBP"]), "{:,}".format(rnd.randint(10000, 100000000))))
+			for i in xrange(rnd.randint(0, 3)):
+				f.write("GR: USD %s (%s) (%d %s %s)\n" % ("{:,}".format(rnd.randint(1000, 500000000)), rnd.choice(["USA", "UK", "Worldwide"]),
+					rnd.randint(1, 28), rnd.choice(months), span[:4].replace("????", "2000")))
+			if rnd.random() < 0.5:
+				f.write("OW: USD %s (USA) (%d %s %s) (%s screens)\n" % ("{:,}".format(rnd.randint(1000, 90000000)), rnd.randint(1, 28),
+					rnd.choice(months), span[:4].replace("????", "2000"), "{:,}".format(rnd.randint(1, 4000))))
+			f.write("\nWG: USD 1,000 (USA) (%d %s %s)\n\nBY: Someone\n\n" % (rnd.randint(1, 28), rnd.choice(months), span[:4]))
+		f.write(separator)
+
+	with open(path("locations"), "w") as f:
+		f.write("CRC: 0x%08X  File: locations.list\n\n" % (rnd.getrandbits(32)))
+		f.write(parsers.list_formats["locations"].header + "==============\n\n")
+		for title, span in rnd.sample(productions, len(productions)//3):
+			location = rnd.choice(places)
+			if rnd.random() < 0.1:
+				location = "Pinewood Studios - " + location
+			info = "\t(%s)" % (rnd.choice(["studio", "location", "scene"])) if rnd.random() < 0.3 else ""
+			f.write("%s\t\t%s%s\n" % (title, location, info))
+		f.write(parsers.list_formats["locations"].footer)
+
+	with open(path("biographies"), "w") as f:
+		f.write("CRC: 0x%08X  File: biographies.list\n\n" % (rnd.getrandbits(32)))
+		f.write(parsers.list_formats["biographies"].header + "==============\n")
+		for name in rnd.sample(actors + actresses, (len(actors) + len(actresses))//4):
+			f.write(separator + "NM: %s\n\n" % (name))
+			f.write("RN: %s %s\n\n" % (rnd.choice(first_names), rnd.choice(last_names)))
+			f.write("DB: %d %s %d, %s\n\n" % (rnd.randint(1, 28), rnd.choice(months), rnd.randint(1880, 1995), rnd.choice(places)))
+			if rnd.random() < 0.3:
+				f.write("DD: %d %s %d, %s (%s)\n\n" % (rnd.randint(1, 28), rnd.choice(months), rnd.randint(1950, 2012), rnd.choice(places),
+					rnd.choice(["heart attack", "cancer", "natural causes"])))
+			f.write("BG: %s\n\nBY: Someone\n\n" % (" ".join(rnd.choice(words) for i in xrange(40))))
+		f.write(separator)
+
+
+def count_lines(file_name):
+	f = open(file_name, "rb")
+	lines = sum(block.count("\n") for block in iter(lambda: f.read(1048576), ""))
+	f.close()
+	return lines
+
+
+#
+# Timing
+#
+
+class TimedCursor:
+	"""wraps a cursor (or connection), adding up the time spent in it by the
+	main thread as db and by the background writer thread as writer"""
+	def __init__(self, target, timer):
+		self.target = target
+		self.timer = timer
+		self.main_thread = threading.current_thread()
+
+	def timed(self, method, *args):
+		start = time.time()
+		try:
+			return getattr(self.target, method)(*args)
+		finally:
+			self.timer["db" if threading.current_thread() is self.main_thread else "writer"] += time.time() - start
+
+	def execute(self, *args):
+		return self.timed("execute", *args)
+
+	def executemany(self, *args):
+		return self.timed("executemany", *args)
+
+	def fetchone(self):
+		return self.timed("fetchone")
+
+	def commit(self):
+		return self.timed("commit")
+
+	def __getattr__(self, name):
+		return getattr(self.target, name)
+
+
+def timed_writer(writer, timer):
+	"""wraps a write_* function, adding up the time spent in it outside of the
+	database as id resolution"""
+	def write(c, records, state):
+		start = time.time()
+		db = timer["db"]
+		writer(c, records, state)
+		timer["resolve"] += (time.time() - start) - (timer["db"] - db)
+	return write
+
+
+def bench_parse(list_dir):
+	"""times the parsers on their own"""
+	results = {}
+	for name in list_names:
+		format = parsers.list_formats[name]
+		start = time.time()
+		f = open(os.path.join(list_dir, name + Options.file_extension), "rb")
+		parsers.skip_header(f, format.header, format.skip_lines)
+		records = 0
+		for lines in parsers.read_chunks(f, format.footer, format.separator, Options.parse_chunk_lines):
+			records += len(format.parser(lines))
+		f.close()
+		results[name] = {"seconds": time.time() - start, "records": records}
+	return results
+
+
+def bench_import(list_dir, database):
+	"""times importing the lists into a new SQLite database"""
+	Database.type = DatabaseTypes.SQLITE
+	Database.database = database
+	Database.clear_old_db = True
+	Options.list_dir = list_dir
+	Options.show_progress = False
+	Options.use_cache = False
+	Options.snapshot = False
+	Options.incremental = False
+	Options.use_copy = False
+	Options.mysql_load_data = False
+	for name in ["people", "productions", "biographies"]:
+		if Options.use_dict and name != "biographies":
+			tosql.dicts[name] = {}
+		tosql.counts[name] = 1
+	tosql.insert_buffers.clear()
+	tosql.appended.clear()
+	tosql.rejected.clear()
+	tosql.pipeline["batches"] = 0
+	pool = None
+	if Options.parse_processes > 1:
+		pool = multiprocessing.Pool(Options.parse_processes)
+	conn, c = tosql.connect_db(Database, create_tables_enabled = True)
+	if Options.write_queue and Options.use_dict:
+		tosql.start_writer()
+	writers = {
+		"actresses": (tosql.write_people, {"gender": parsers.ActorsGender.FEMALE, "production": None}),
+		"actors": (tosql.write_people, {"gender": parsers.ActorsGender.MALE, "production": None}),
+		"movies": (tosql.write_movies, {"production": None}),
+		"ratings": (tosql.write_ratings, {"production": None}),
+		"business": (tosql.write_business, {"production": None}),
+		"locations": (tosql.write_locations, {"production": None}),
+		"biographies": (tosql.write_biographies, {"person": None}),
+	}
+	results = {}
+	for name in list_names:
+		writer, state = writers[name]
+		state["list"] = name
+		timer = {"db": 0.0, "writer": 0.0, "resolve": 0.0}
+		start = time.time()
+		tosql.process_list(TimedCursor(conn, timer), TimedCursor(c, timer), pool, tosql.mk(name),
+			parsers.list_formats[name], timed_writer(writer, timer), state)
+		total = time.time() - start
+		if tosql.pipeline["queue"]:
+			# the writer thread overlaps with the parsing and the main thread's
+			# time in the write_* functions includes waiting for it, so only
+			# the writer's own time in the database is reported
+			results[name] = {"seconds": total, "parse": None, "resolve": None, "db": timer["writer"]}
+		else:
+			results[name] = {"seconds": total, "parse": total - timer["resolve"] - timer["db"],
+				"resolve": timer["resolve"], "db": timer["db"]}
+	if pool:
+		pool.close()
+		pool.join()
+	tosql.stop_writer()
+	c.close()
+	conn.close()
+	return results
+
+
+def rate(lines, seconds):
+	return "%10.0f" % (lines/seconds) if seconds is not None and seconds > 0 else "%10s" % ("-")
+
+
+def report(lines, parse, imported, baseline = None):
+	print "%-12s %9s %10s | %10s %10s %10s %10s  (lines/sec)" % ("list", "lines", "parse only", "parse", "resolve", "db", "import")
+	for name in list_names:
+		p = parse[name]
+		i = imported[name]
+		print "%-12s %9d %s | %s %s %s %s" % (name, lines[name], rate(lines[name], p["seconds"]),
+			rate(lines[name], i["parse"]), rate(lines[name], i["resolve"]), rate(lines[name], i["db"]), rate(lines[name], i["seconds"]))
+	if any(imported[name]["parse"] is None for name in list_names):
+		print "(no parse/resolve split with the background writer, db is the time of the writer thread)"
+	if baseline:
+		print
+		print "change of the import time against the baseline:"
+		for name in list_names:
+			if name in baseline["import"]:
+				before = baseline["import"][name]["seconds"]
+				now = imported[name]["seconds"]
+				print "%-12s %+7.1f%%%s" % (name, (now - before)/before*100, "  <- slower" if now > before*1.1 else "")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Benchmarks the conversion on synthetic list files.")
+	parser.add_argument("--titles", type = int, default = 100000, help = "number of productions to generate")
+	parser.add_argument("--seed", type = int, default = 1, help = "seed for the generated lists")
+	parser.add_argument("--list-dir", help = "directory for the generated lists (a temporary one by default), "
+		"lists already there are reused")
+	parser.add_argument("--keep", action = "store_true", help = "keep the generated lists and the database")
+	parser.add_argument("--save", help = "write the results to a json file")
+	parser.add_argument("--baseline", help = "compare against the results saved by an earlier run")
+	args = parser.parse_args()
+
+	work_dir = tempfile.mkdtemp(prefix = "imdb-benchmark-")
+	list_dir = args.list_dir or os.path.join(work_dir, "lists")
+	if not os.path.exists(os.path.join(list_dir, "actors" + Options.file_extension)):
+		print "benchmark [status]: generating lists for %d titles in %s." % (args.titles, list_dir)
+		generate(list_dir, args.titles, args.seed)
+	if Options.use_native and not parsers.use_native():
+		print "benchmark [warning]: the native parser hasn't been built (see native/), using regex."
+		Options.use_native = False
+	lines = dict((name, count_lines(os.path.join(list_dir, name + Options.file_extension))) for name in list_names)
+	print "benchmark [status]: parsing."
+	parse = bench_parse(list_dir)
+	print "benchmark [status]: importing."
+	imported = bench_import(list_dir, os.path.join(work_dir, "benchmark.db"))
+	baseline = json.load(open(args.baseline)) if args.baseline else None
+	report(lines, parse, imported, baseline)
+	if args.save:
+		json.dump({"lines": lines, "parse": parse, "import": imported, "options": {"use_native": Options.use_native,
+			"use_dict": Options.use_dict, "parse_processes": Options.parse_processes, "write_queue": Options.write_queue}}, open(args.save, "w"), indent = 1)
+	if args.keep:
+		print "benchmark [status]: kept the lists and database in %s." % (work_dir)
+	else:
+		shutil.rmtree(work_dir)
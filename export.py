@@ -0,0 +1,127 @@
+# Export of the tables to Parquet or Arrow IPC files with pyarrow, the target
+# used for DatabaseTypes.ARROW (see connect_db in tosql.py). Instead of being
+# inserted the buffered rows of each table are gathered into row groups of
+# Options.export_row_group_rows rows and streamed to <table>.parquet (or
+# <table>.arrow) in the Database.database directory as they are parsed.
+# The column types are taken from the sqlite use_dict schema, rows of tables
+# whose ids are generated by the database get consecutive ids.
+
+import os
+import re
+from settings import Options
+
+arrow_types = {
+	"integer": "int64",
+	"real": "float64",
+	"text": "string"
+}
+
+def read_columns(schema_file):
+	"""reads the (column, type) pairs of each table of a sqlite schema"""
+	tables = {}
+	for name, body in re.findall(r"create table (\w+) \((.*?)\);", open(schema_file).read(), re.S | re.I):
+		tables[name] = [tuple(column.split()[:2]) for column in body.split(",")]
+	return tables
+
+
+def to_integer(v):
+	return v if v is None or isinstance(v, (int, long)) else int(v)
+
+
+def to_real(v):
+	return v if v is None or isinstance(v, float) else float(v)
+
+
+converters = {
+	"integer": to_integer,
+	"real": to_real
+}
+
+class TableWriter:
+	"""gathers the rows of a table and writes them a row group at a time"""
+	def __init__(self, export, name, columns):
+		self.export = export
+		self.name = name
+		self.columns = columns
+		self.schema = export.pa.schema([export.pa.field(column, getattr(export.pa, arrow_types.get(type.lower(), "string"))())
+			for column, type in columns])
+		self.values = dict([(column, []) for column, type in columns])
+		self.count = 0
+		self.next_id = 1
+		self.writer = None
+		self.path = os.path.join(export.directory, name + "." + Options.export_format)
+
+	def add(self, keys, rows):
+		id_column = "id" + self.name
+		for column, type in self.columns:
+			values = self.values[column]
+			convert = converters.get(type.lower())
+			if column in keys:
+				i = keys.index(column)
+				values.extend([convert(row[i]) for row in rows] if convert else [row[i] for row in rows])
+			elif column == id_column:
+				values.extend(xrange(self.next_id, self.next_id + len(rows)))
+			else:
+				values.extend([None] * len(rows))
+		self.next_id += len(rows)
+		self.count += len(rows)
+		if self.count >= Options.export_row_group_rows:
+			self.flush()
+
+	def flush(self):
+		if not self.count:
+			return
+		pa = self.export.pa
+		arrays = [pa.array(self.values[field.name], type = field.type) for field in self.schema]
+		batch = pa.RecordBatch.from_arrays(arrays, [field.name for field in self.schema])
+		if not self.writer:
+			if Options.export_format == "parquet":
+				self.writer = self.export.pq.ParquetWriter(self.path, self.schema, compression = Options.export_compression)
+			else:
+				new_file = pa.ipc.new_file if hasattr(pa, "ipc") else pa.RecordBatchFileWriter
+				self.sink = pa.OSFile(self.path, "wb")
+				self.writer = new_file(self.sink, self.schema)
+		if Options.export_format == "parquet":
+			self.writer.write_table(pa.Table.from_batches([batch]))
+		else:
+			self.writer.write_batch(batch)
+		for values in self.values.itervalues():
+			del values[:]
+		self.count = 0
+
+	def close(self):
+		self.flush()
+		if self.writer:
+			self.writer.close()
+			if Options.export_format != "parquet":
+				self.sink.close()
+			self.writer = None
+
+
+class ArrowExport:
+	"""stands in for both the connection and the cursor of a database"""
+	def __init__(self, directory, schema_file):
+		if Options.export_format not in ("parquet", "arrow"):
+			raise ValueError("unknown export format %s, use parquet or arrow" % (Options.export_format))
+		self.pa = __import__("pyarrow")
+		self.pq = __import__("pyarrow.parquet", fromlist = ["parquet"])
+		self.directory = directory
+		if not os.path.isdir(directory):
+			os.makedirs(directory)
+		self.columns = read_columns(schema_file)
+		self.tables = {}
+
+	def write_rows(self, name, keys, rows):
+		"""adds rows (tuples of the values of the keys columns) to a table"""
+		if name not in self.tables:
+			self.tables[name] = TableWriter(self, name, self.columns[name])
+		self.tables[name].add(list(keys), rows)
+
+	def commit(self):
+		# row groups are written as they fill up
+		pass
+
+	def close(self):
+		for table in self.tables.itervalues():
+			table.close()
+		self.tables = {}
@@ -0,0 +1,155 @@
+# Memory mapped on-disk id dictionaries, used to cache the people and productions
+# dictionaries between runs (see save_dict/load_dict in tosql.py)
+#
+# File layout (little endian):
+#	header		magic, format version, number of entries, next free id and the
+#				size of the sources block
+#	sources		one "md5<tab>path" line per list file the ids were read from
+#	index		one (key offset, key length, id) record per entry, sorted by key
+#	keys		the concatenated keys
+# Lookups binary search the index in place, so nothing has to be deserialized.
+
+import os
+import mmap
+import struct
+import hashlib
+import tempfile
+import shutil
+import heapq
+
+MAGIC 		= "IMDBIDS\0"
+VERSION 	= 2
+HEADER 		= struct.Struct("<8sIQQI")	# magic, version, count, next id, sources size
+RECORD 		= struct.Struct("<QII")		# key offset, key length, id
+
+class StaleCacheError(Exception):
+	"""raised when a cache was written by another format version or from list
+	files that have changed since"""
+	pass
+
+
+def file_checksum(path):
+	"""md5 hex digest of a file's contents"""
+	md5 = hashlib.md5()
+	f = open(path, "rb")
+	block = f.read(1048576)
+	while block:
+		md5.update(block)
+		block = f.read(1048576)
+	f.close()
+	return md5.hexdigest()
+
+
+def write_id_cache(path, items, count, next_id, sources):
+	"""writes count (key, id) items, which must be sorted by key, to path.
+	sources are the list files the ids were read from, their checksums are
+	stored so a cache of outdated files can be detected."""
+	sources_block = "".join(["%s\t%s\n" % (file_checksum(source), source) for source in sources])
+	keys = tempfile.TemporaryFile()
+	f = open(path, "wb")
+	f.write(HEADER.pack(MAGIC, VERSION, count, next_id, len(sources_block)))
+	f.write(sources_block)
+	offset = 0
+	written = 0
+	for key, id in items:
+		f.write(RECORD.pack(offset, len(key), id))
+		keys.write(key)
+		offset += len(key)
+		written += 1
+	if written != count:
+		raise ValueError("write_id_cache: expected %d entries, got %d" % (count, written))
+	keys.seek(0)
+	shutil.copyfileobj(keys, f)
+	keys.close()
+	f.close()
+
+
+class IdCache:
+	"""read only view of a cache file, with a dictionary on top for the ids
+	assigned and a set for the keys removed after it was loaded"""
+	def __init__(self, path, verify = True):
+		self.file = open(path, "rb")
+		self.mm = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+		magic, version, self.count, self.next_id, sources_size = HEADER.unpack_from(self.mm, 0)
+		if magic != MAGIC or version != VERSION:
+			self.close()
+			raise StaleCacheError("%s: unsupported cache format" % (path))
+		sources_block = self.mm[HEADER.size:HEADER.size+sources_size]
+		self.sources = [line.split("\t", 1) for line in sources_block.splitlines()]
+		if verify:
+			for checksum, source in self.sources:
+				if not os.path.exists(source) or file_checksum(source) != checksum:
+					self.close()
+					raise StaleCacheError("%s: %s has changed since the cache was written" % (path, source))
+		self.index_offset = HEADER.size + sources_size
+		self.keys_offset = self.index_offset + self.count*RECORD.size
+		self.added = {}
+		self.removed = set()
+		self.length = self.count
+
+	def close(self):
+		self.mm.close()
+		self.file.close()
+
+	def _record(self, i):
+		offset, length, id = RECORD.unpack_from(self.mm, self.index_offset + i*RECORD.size)
+		start = self.keys_offset + offset
+		return self.mm[start:start+length], id
+
+	def lookup(self, key):
+		"""binary searches the file for key, returning its id or None"""
+		lo = 0
+		hi = self.count
+		while lo < hi:
+			mid = (lo + hi)//2
+			mid_key, id = self._record(mid)
+			if mid_key < key:
+				lo = mid + 1
+			elif mid_key > key:
+				hi = mid
+			else:
+				return id
+		return None
+
+	def get(self, key, default = None):
+		if key in self.added:
+			return self.added[key]
+		if key in self.removed:
+			return default
+		id = self.lookup(key)
+		return default if id is None else id
+
+	def __contains__(self, key):
+		return self.get(key) is not None
+
+	def __getitem__(self, key):
+		id = self.get(key)
+		if id is None:
+			raise KeyError(key)
+		return id
+
+	def __setitem__(self, key, id):
+		if key not in self:
+			self.length += 1
+		self.added[key] = id
+
+	def __delitem__(self, key):
+		if key not in self:
+			raise KeyError(key)
+		self.added.pop(key, None)
+		self.removed.add(key)
+		self.length -= 1
+
+	def __len__(self):
+		return self.length
+
+	def __iter__(self):
+		for key, id in self.iteritems():
+			yield key
+
+	def iteritems(self):
+		"""iterates over the (key, id) items sorted by key"""
+		stored = (self._record(i) for i in xrange(self.count))
+		stored = ((key, id) for key, id in stored if key not in self.removed and key not in self.added)
+		added = ((key, self.added[key]) for key in sorted(self.added))
+		return heapq.merge(stored, added)
@@ -1,9 +1,6 @@
-from tosql import executescript, get_schema_prefix, connect_db
+from tosql import executescript, get_schema_prefix, connect_db, mk_index
 from settings import Database, Options, DatabaseTypes
 
-def mk_index(name):
-	return "%s/%s.index.sql" % (Options.schema_dir, name)
-
 def create_indices(cursor):
 	executescript(cursor, open(mk_index(get_schema_prefix(Database.type))), debug = True)
 
@@ -2,323 +2,677 @@
  * This is an attempt to use a native parser instead of a python regex to achieve
  * better performance from the sqlite conversion script
  * Ameer Ayoub <ameer.ayoub@gmail.com>
+ *
+ * Each function scans a line the way the regex of the same name in
+ * parsers.ParseRegexes would match it and returns a Match object with the same
+ * group numbering (match.group(n) gives the text of group n or None). Only the
+ * path the regex tries first is followed, lines where that path fails and the
+ * regex would have to backtrack are handed to the fallback (the compiled regex's
+ * match function) if one is given, otherwise False is returned. None is only
+ * returned for lines the regex can't match (e.g. a missing prefix).
+ *
+ * Build with `python setup.py build_ext --inplace` in this folder.
  */
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
-#include <stdio.h>
 #include <string.h>
-#include <ctype.h>
 
-#define MAX_NICKNAME_LEN 			256
-#define MAX_LASTNAME_LEN 			256
-#define MAX_FIRSTNAME_LEN 			256
-#define MAX_ACTORNUMBER_LEN 		16
-#define MAX_TITLE_LEN				256
-#define MAX_YEAR_LEN				5
-#define	MAX_CODE_LEN				3
-#define MAX_EXTRA_INFO_LEN			128
-#define MAX_EPISODE_TITLE_LEN		256
-#define MAX_EPISODE_SERIES_LEN		8
-#define MAX_EPISODE_NUMBER_LEN		8
-#define MAX_CHARACTER_NAME_LEN		256
-#define MAX_BILLING_POSITION_LEN	8
-#define MAX_NUMBER_LEN				16
-//#define LINE_SIZE 				511
+#define MAX_GROUPS		20
+#define DECLINED		-1	/* the regex has to decide */
+#define NO_MATCH		-2	/* the regex can't match */
 
-#define skip_whitespace(PTR) while(isspace(*PTR)){++PTR;}
-#define year_d(POS) (*(POS) == '?' || isdigit(*(POS)))
+/* the \s, \d and \w classes of (non unicode, non locale) python regexes */
+#define is_space(C) ((C) == ' ' || (C) == '\t' || (C) == '\n' || (C) == '\r' || (C) == '\f' || (C) == '\v')
+#define is_digit(C) ((C) >= '0' && (C) <= '9')
+#define is_word(C) (is_digit(C) || ((C) >= 'a' && (C) <= 'z') || ((C) >= 'A' && (C) <= 'Z') || (C) == '_')
+#define is_upper(C) ((C) >= 'A' && (C) <= 'Z')
+#define skip_space(S, LEN, POS) while((POS) < (LEN) && is_space((S)[POS])){++(POS);}
 
-int 
-_parse_actor(
-	const char *input,
-   	char *nickname,
-   	char *lastname,
-   	char *firstname,
-   	char *actornumber){
-	const char *current_pos = input;
-	const char *pos; // temp
-	int is_nick = 0;
-	// initialize all information to empty strings
-	*nickname = '\0';
-	*lastname = '\0';
-	*firstname = '\0';
-	*actornumber = '\0';
-	if (!*current_pos){
-		// error : can not process 0 length string
-		return 0;
+typedef struct {
+	PyObject_HEAD
+	PyObject *string;
+	int groups;
+	Py_ssize_t spans[MAX_GROUPS+1][2];
+} Match;
+
+static PyTypeObject MatchType;
+
+static void
+match_dealloc(Match *self){
+	Py_XDECREF(self->string);
+	PyObject_Del(self);
+}
+
+static PyObject *
+_match_group(Match *self, long n){
+	if (n < 0 || n > self->groups){
+		PyErr_SetString(PyExc_IndexError, "no such group");
+		return NULL;
+	}
+	if (self->spans[n][0] < 0){
+		Py_RETURN_NONE;
 	}
-	// check for nickname
-	if (*current_pos == '\''){
-		// This may be a nickname or the start of a name
-		pos = current_pos+1;
-		while(*pos && *(pos+1) && !(*pos == '\'' && *(pos+1) == ' '))
-			++pos;
-		if (*pos && *(pos+1) && *pos == '\'' && *(pos+1) == ' ') {
-			strncpy(nickname, current_pos+1, pos-current_pos-1);
-			nickname[pos-current_pos-1] = '\0'; // doesn't get copied I guess
-			current_pos = pos+1;
+	return PyString_FromStringAndSize(PyString_AS_STRING(self->string) + self->spans[n][0],
+		self->spans[n][1] - self->spans[n][0]);
+}
+
+static PyObject *
+match_group(Match *self, PyObject *arg){
+	long n = PyInt_AsLong(arg);
+	if (n == -1 && PyErr_Occurred())
+		return NULL;
+	return _match_group(self, n);
+}
+
+static PyObject *
+match_groups(Match *self){
+	PyObject *groups = PyTuple_New(self->groups);
+	PyObject *group;
+	int i;
+	if (!groups)
+		return NULL;
+	for (i = 1; i <= self->groups; ++i){
+		group = _match_group(self, i);
+		if (!group){
+			Py_DECREF(groups);
+			return NULL;
 		}
+		PyTuple_SET_ITEM(groups, i-1, group);
 	}
-	if (*current_pos && *current_pos != ','){
-		// Parse last name
-		skip_whitespace(current_pos);
-		pos = current_pos;
-		while(*pos && *pos != ',' && *pos != '(')
-			++pos;
-		strncpy(lastname, current_pos, pos - current_pos);
-		lastname[pos-current_pos] = '\0'; // doesn't get copied I guess
-		current_pos = pos;
+	return groups;
+}
+
+static PyMethodDef MatchMethods[] = {
+	{"group", (PyCFunction)match_group, METH_O, "Returns the text of a group or None."},
+	{"groups", (PyCFunction)match_groups, METH_NOARGS, "Returns the text of all groups."},
+	{NULL, NULL, 0, NULL}
+};
+
+static PyTypeObject MatchType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"parse.Match",				/* tp_name */
+	sizeof(Match),				/* tp_basicsize */
+	0,							/* tp_itemsize */
+	(destructor)match_dealloc,	/* tp_dealloc */
+	0,							/* tp_print */
+	0,							/* tp_getattr */
+	0,							/* tp_setattr */
+	0,							/* tp_compare */
+	0,							/* tp_repr */
+	0,							/* tp_as_number */
+	0,							/* tp_as_sequence */
+	0,							/* tp_as_mapping */
+	0,							/* tp_hash */
+	0,							/* tp_call */
+	0,							/* tp_str */
+	0,							/* tp_getattro */
+	0,							/* tp_setattro */
+	0,							/* tp_as_buffer */
+	Py_TPFLAGS_DEFAULT,			/* tp_flags */
+	"Groups of a line parsed by the native parser.",	/* tp_doc */
+	0,							/* tp_traverse */
+	0,							/* tp_clear */
+	0,							/* tp_richcompare */
+	0,							/* tp_weaklistoffset */
+	0,							/* tp_iter */
+	0,							/* tp_iternext */
+	MatchMethods,				/* tp_methods */
+};
+
+#define set_group(M, G, START, END) {(M)->spans[G][0] = (START); (M)->spans[G][1] = (END);}
+
+/* end of the part of the line `.` can match (up to the first newline) */
+static Py_ssize_t
+_line_end(const char *s, Py_ssize_t len, Py_ssize_t pos){
+	const char *newline = memchr(s + pos, '\n', len - pos);
+	return newline ? newline - s : len;
+}
+
+/* first `)` at or after pos on the same line, or -1 */
+static Py_ssize_t
+_find_close(const char *s, Py_ssize_t len, Py_ssize_t pos){
+	while (pos < len && s[pos] != ')' && s[pos] != '\n')
+		++pos;
+	return (pos < len && s[pos] == ')') ? pos : -1;
+}
+
+#define year_start(S, LEN, POS) (((POS) + 4 <= (LEN) && strncmp((S) + (POS), "????", 4) == 0) \
+	|| ((POS) < (LEN) && is_digit((S)[POS])))
+
+/*
+ * The title, year, number, type code and episode shared by the title regexes
+ * starting at group g:
+ * 	"?([^"]*?)"?\s\(((\?{4}|\d+)/?(\w+)?).*?\)(\s*\((T?VG?)\))?
+ * 	(\s*\{([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\})?
+ * followed by (\s*(\{{2}SUSPENDED\}{2}))? if suspended is set.
+ */
+static Py_ssize_t
+_parse_title(const char *s, Py_ssize_t len, Py_ssize_t pos, Match *m, int g, int suspended){
+	Py_ssize_t start, end, open, p, q, r, f, a, b;
+	int backtracks;
+	// the title is the shortest run of non quotes followed by a year in parentheses.
+	// If there is none the regex can't match either, unless it can try the title
+	// without the opening quote or start it in the whitespace before pos (which
+	// callers only allow to contain whitespace, digits and the like)
+	start = (pos < len && s[pos] == '\"') ? pos+1 : pos;
+	backtracks = start != pos || s[pos] == '(';
+	for (end = start; ; ++end){
+		if (end >= len)
+			return backtracks ? DECLINED : NO_MATCH;
+		if (s[end] == '\"'){
+			if (end+2 < len && is_space(s[end+1]) && s[end+2] == '(' && year_start(s, len, end+3)){
+				open = end+2;
+				break;
+			}
+			return backtracks ? DECLINED : NO_MATCH;
+		}
+		if (is_space(s[end]) && end+1 < len && s[end+1] == '(' && year_start(s, len, end+2)){
+			open = end+1;
+			break;
+		}
+	}
+	set_group(m, g, start, end);
+	// year and number
+	p = open+1;
+	if (p + 4 <= len && strncmp(s + p, "????", 4) == 0){
+		q = p+4;
+	} else {
+		q = p;
+		while (q < len && is_digit(s[q]))
+			++q;
 	}
-	if (*current_pos && *current_pos == ','){
-		// Parse first name
-		++current_pos;
-		skip_whitespace(current_pos);
-		pos = current_pos;
-		while(*pos && *pos != '(')
-			++pos;
-		strncpy(firstname, current_pos, pos - current_pos);
-		firstname[pos-current_pos] = '\0'; // doesn't get copied I guess
-		current_pos = pos;
+	set_group(m, g+2, p, q);
+	if (q < len && s[q] == '/')
+		++q;
+	if (q < len && is_word(s[q])){
+		r = q;
+		while (r < len && is_word(s[r]))
+			++r;
+		set_group(m, g+3, q, r);
+		q = r;
 	}
-	if (*current_pos && *current_pos == '('){
-		// Parse actor number
-		++current_pos;
-		pos = current_pos;
-		while(*pos && *pos != ')')
-			++pos;
-		strncpy(actornumber, current_pos, pos - current_pos);
-		actornumber[pos-current_pos] = '\0'; // doesn't get copied I guess
-		current_pos = pos;
+	set_group(m, g+1, p, q);
+	// anything up to the closing parenthesis
+	r = _find_close(s, len, q);
+	if (r == -1)
+		return (backtracks || memchr(s + q, ')', len - q)) ? DECLINED : NO_MATCH;
+	p = r+1;
+	// type code
+	q = p;
+	skip_space(s, len, q);
+	if (q < len && s[q] == '('){
+		r = q+1;
+		if (s[r] == 'T')
+			++r;
+		if (s[r] == 'V'){
+			++r;
+			if (s[r] == 'G')
+				++r;
+			if (s[r] == ')'){
+				set_group(m, g+5, q+1, r);
+				set_group(m, g+4, p, r+1);
+				p = r+1;
+			}
+		}
 	}
-	if(!*nickname && !*firstname && !*actornumber){
-		// If we only read in one name then set it to firstname instead of lastname
-		strcpy(firstname, lastname);
-		*lastname = '\0';
+	// episode title with the season and episode number or the broadcast date
+	q = p;
+	skip_space(s, len, q);
+	if (q < len && s[q] == '{'){
+		for (f = q+1; f < len && s[f] != '{'; ++f){
+			a = f;
+			skip_space(s, len, a);
+			if (s[a] == '(' && s[a+1] == '#' && is_digit(s[a+2])){
+				b = a+2;
+				while (b < len && is_digit(s[b]))
+					++b;
+				if (s[b] == '.' && is_digit(s[b+1])){
+					r = b+1;
+					while (r < len && is_digit(s[r]))
+						++r;
+					if (s[r] == ')' && s[r+1] == '}'){
+						set_group(m, g+9, a+2, b);
+						set_group(m, g+10, b+1, r);
+						set_group(m, g+8, f, r+1);
+						set_group(m, g+7, q+1, f);
+						set_group(m, g+6, p, r+2);
+						p = r+2;
+						break;
+					}
+				}
+			}
+			if (s[f] == '('){
+				r = f+1;
+				while (r < len && (is_digit(s[r]) || s[r] == '-'))
+					++r;
+				if (s[r] == ')' && s[r+1] == '}'){
+					set_group(m, g+8, f, r+1);
+					set_group(m, g+7, q+1, f);
+					set_group(m, g+6, p, r+2);
+					p = r+2;
+					break;
+				}
+			}
+			if (s[f] == '}'){
+				set_group(m, g+7, q+1, f);
+				set_group(m, g+6, p, f+1);
+				p = f+1;
+				break;
+			}
+		}
 	}
-	return 1;
+	if (suspended){
+		q = p;
+		skip_space(s, len, q);
+		if (q + 13 <= len && strncmp(s + q, "{{SUSPENDED}}", 13) == 0){
+			set_group(m, g+12, q, q+13);
+			set_group(m, g+11, p, q+13);
+			p = q+13;
+		}
+	}
+	return p;
 }
 
-int 
-_parse_acted_in(
-	const char* input,
-   	char* title, 
-	char* year, 
-	char *number,
-	char* code, 
-	char* extra_info, 
-	char* episode_title,
-	char* episode_series, 
-	char* episode_number, 
-	char* character_name, 
-	char* billing_position){
+/*
+ * ('.+')?\s*(([^,']*),)?\s*([^\(]+)(\((\w+)\))? starting at group g
+ */
+static Py_ssize_t
+_parse_name(const char *s, Py_ssize_t len, Py_ssize_t pos, Match *m, int g){
+	Py_ssize_t p = pos, q, r;
+	if (memchr(s + pos, '\n', len - pos))
+		return DECLINED;
+	// nickname, up to the last quote
+	if (p < len && s[p] == '\''){
+		for (q = len-1; q >= p+2 && s[q] != '\''; --q)
+			;
+		if (q >= p+2){
+			set_group(m, g, p, q+1);
+			p = q+1;
+		}
+	}
+	skip_space(s, len, p);
+	// last name
+	q = p;
+	while (q < len && s[q] != ',' && s[q] != '\'')
+		++q;
+	if (q < len && s[q] == ','){
+		set_group(m, g+2, p, q);
+		set_group(m, g+1, p, q+1);
+		p = q+1;
+	}
+	skip_space(s, len, p);
+	// first name
+	q = p;
+	while (q < len && s[q] != '(')
+		++q;
+	if (q == p)
+		return DECLINED;
+	set_group(m, g+3, p, q);
+	p = q;
+	// number
+	if (p < len && s[p] == '(' && is_word(s[p+1])){
+		r = p+1;
+		while (r < len && is_word(s[r]))
+			++r;
+		if (s[r] == ')'){
+			set_group(m, g+5, p+1, r);
+			set_group(m, g+4, p, r+1);
+			p = r+1;
+		}
+	}
+	return p;
+}
 
-	const char *current_pos = input;
-	const char *pos; // temp
-	*title = '\0';
-	*year = '\0';
-	*number = '\0';
-	*code = '\0';
-	*extra_info = '\0';
-	*episode_title = '\0';
-	*episode_series = '\0';
-	*episode_number = '\0';
-	*character_name = '\0';
-	*billing_position = '\0';
-	if (!*current_pos){
-		// error : can not process 0 length string
-		return 0;
+static Py_ssize_t
+_parse_acted_in(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p, q, r;
+	p = _parse_title(s, len, 0, m, 1, 1);
+	if (p < 0)
+		return p;
+	// part information
+	q = p;
+	skip_space(s, len, q);
+	if (q < len && s[q] == '('){
+		r = q+1;
+		while (r < len && (is_word(s[r]) || s[r] == ' ' || s[r] == ',' || s[r] == '.' || s[r] == '-'))
+			++r;
+		if (s[r] == ')'){
+			set_group(m, 15, q+1, r);
+			set_group(m, 14, p, r+1);
+			p = r+1;
+		}
 	}
-	if (*current_pos == '\"'){
-		// TV series style title
-		pos = current_pos+1;
-		while(*pos && *(pos+1) && !(*pos == '\"' && *(pos+1) == ' '))
-			++pos;
-		strncpy(title, current_pos+1, pos-current_pos-1);
-		title[pos-current_pos-1] = '\0';
-		current_pos = pos+1;
-	} else {
-		pos = current_pos;
-		// We have to differentiate between parenthesized title text and the year, the year
-		// should consist of digits or question marks
-		while(*pos && *(pos+1) && *(pos+2) && *(pos+3) && *(pos+4) && *(pos+5) &&
-			!(*pos == '(' && year_d(pos+1) && year_d(pos+2)
-			&& year_d(pos+3) && year_d(pos+4) && (*(pos+5) == ')' || *(pos+5) == '/')))
-			++pos;
-		strncpy(title, current_pos, pos-current_pos);
-		title[pos-current_pos] = '\0';
-		current_pos = pos-1;
+	// character name, up to the last bracket
+	q = p;
+	skip_space(s, len, q);
+	if (q < len && s[q] == '['){
+		for (r = _line_end(s, len, q) - 1; r > q && s[r] != ']'; --r)
+			;
+		if (r > q){
+			set_group(m, 17, q+1, r);
+			set_group(m, 16, p, r+1);
+			p = r+1;
+		}
 	}
-	skip_whitespace(current_pos); // in case quoted
-	strncpy(year, current_pos+1, 4);
-	year[4] = '\0';
-	current_pos += 5;
-	if(*current_pos == '/'){
-		++current_pos;
-		pos = current_pos;
-		while(*pos && *pos != ')')
-			++pos;
-		strncpy(number, current_pos, pos-current_pos);
-		number[pos-current_pos] = '\0';
-	} else {
-		++current_pos; // skip teh trailing )
+	// billing position
+	q = p;
+	skip_space(s, len, q);
+	if (q < len && s[q] == '<' && is_digit(s[q+1])){
+		r = q+1;
+		while (r < len && is_digit(s[r]))
+			++r;
+		if (s[r] == '>'){
+			set_group(m, 19, q+1, r);
+			set_group(m, 18, p, r+1);
+			p = r+1;
+		}
 	}
-	skip_whitespace(current_pos);
-	if (*current_pos && *current_pos == '('){
-		if((*(current_pos+1) == 'V') || (*(current_pos+1) == 'T' && *(current_pos+2) == 'V') ||
-				(*(current_pos+1) == 'V' && *(current_pos+2) == 'G')){
-			// Parse out special code
-			++current_pos;
-			pos = current_pos;
-			while(*pos && *pos != ')' && *pos != '/')
-				++pos;
-			strncpy(code, current_pos, pos-current_pos);
-			code[pos-current_pos] = '\0';
-			current_pos = pos+1;
-			skip_whitespace(current_pos);
+	return p;
+}
+
+static Py_ssize_t
+_parse_movies(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p, q, r;
+	p = _parse_title(s, len, 0, m, 1, 1);
+	if (p < 0)
+		return p;
+	// the publish year (range) is required
+	q = p;
+	skip_space(s, len, q);
+	if (q + 4 <= len && strncmp(s + q, "????", 4) == 0){
+		set_group(m, 16, q, q+4);
+		r = q+4;
+	} else if (q + 4 <= len && is_digit(s[q]) && is_digit(s[q+1]) && is_digit(s[q+2]) && is_digit(s[q+3])){
+		set_group(m, 17, q, q+4);
+		r = q+4;
+		if (r + 5 <= len && s[r] == '-' && is_digit(s[r+1]) && is_digit(s[r+2]) && is_digit(s[r+3]) && is_digit(s[r+4])){
+			set_group(m, 18, r, r+5);
+			r += 5;
 		}
+	} else {
+		return DECLINED;
 	}
-	if (*current_pos && *current_pos == '{'){
-		// Parse out episode information
-		pos = current_pos+1;
-		while(*pos && *pos != '(' && *pos != '}')
-			++pos;
-		strncpy(episode_title, current_pos+1, pos-current_pos-1);
-		episode_title[pos-current_pos-1] = '\0';
-		if (*pos == '(' && *(pos+1) == '#'){
-			current_pos = pos+2; // skip over '(' and '#'
-			pos = current_pos;
-			while(*pos && *pos != '.')
-				++pos;
-			strncpy(episode_series, current_pos, pos-current_pos);
-			episode_series[pos-current_pos] = '\0';
-			current_pos = pos+1;
-			pos = current_pos;
-			while(*pos && *pos != ')')
-				++pos;
-			strncpy(episode_number, current_pos, pos-current_pos);
-			episode_number[pos-current_pos] = '\0';
-			current_pos = pos+2;
-		} else if (*pos == '('){
-			// We could just seperate this out perhaps into a episode date later
-			++pos;
-			while(*pos && *pos != ')')
-				++pos;
-			strncpy(episode_title, current_pos+2, pos-current_pos-2);
-			episode_title[pos-current_pos-2] = '\0';
-			current_pos = pos;
+	set_group(m, 15, q, r);
+	set_group(m, 14, p, r);
+	return r;
+}
+
+static Py_ssize_t
+_parse_title_rating(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p = 0, q;
+	skip_space(s, len, p);
+	q = p;
+	while (q < len && (is_digit(s[q]) || s[q] == '.' || s[q] == '*'))
+		++q;
+	set_group(m, 1, p, q);
+	p = q;
+	skip_space(s, len, p);
+	q = p;
+	while (q < len && is_digit(s[q]))
+		++q;
+	set_group(m, 2, p, q);
+	p = q;
+	skip_space(s, len, p);
+	q = p;
+	while (q < len && (is_digit(s[q]) || s[q] == '.'))
+		++q;
+	set_group(m, 3, p, q);
+	p = q;
+	skip_space(s, len, p);
+	return _parse_title(s, len, p, m, 4, 0);
+}
+
+static Py_ssize_t
+_parse_title_business(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p = 3;
+	if (len < 4 || strncmp(s, "MV:", 3) != 0 || !is_space(s[3]))
+		return NO_MATCH;
+	skip_space(s, len, p);
+	return _parse_title(s, len, p, m, 1, 0);
+}
+
+static Py_ssize_t
+_parse_location(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t title_end, p, q, r;
+	const char *dash;
+	title_end = _parse_title(s, len, 0, m, 1, 1);
+	if (title_end < 0)
+		return title_end;
+	q = title_end;
+	skip_space(s, len, q);
+	// location name, up to the first dash on the line (the spaces around it in
+	// the regex are ignored since it is verbose)
+	r = q;
+	dash = memchr(s + q, '-', _line_end(s, len, q) - q);
+	if (dash){
+		set_group(m, 17, q, dash - s);
+		set_group(m, 16, q, dash - s + 1);
+		r = dash - s + 1;
+	}
+	// location
+	p = r;
+	while (p < len && s[p] != '(' && s[p] != ')')
+		++p;
+	set_group(m, 18, r, p);
+	// description
+	if (p < len && s[p] == '('){
+		r = _find_close(s, len, p+1);
+		if (r != -1){
+			set_group(m, 20, p+1, r);
+			set_group(m, 19, p, r+1);
+			p = r+1;
 		}
-		skip_whitespace(current_pos);
 	}
-	if (*current_pos && *current_pos == '('){
-		// Parse out extra information
-		++current_pos;
-		pos = current_pos;
-		while(*pos && *pos != ')')
-			++pos;
-		strncpy(extra_info, current_pos, pos-current_pos);
-		extra_info[pos-current_pos] = '\0';
-		current_pos = pos+1;
-		skip_whitespace(current_pos);
+	set_group(m, 15, q, p);
+	set_group(m, 14, title_end, p);
+	return p;
+}
+
+static Py_ssize_t
+_parse_data_business(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p = 3, q;
+	if (len < 3 || !(strncmp(s, "BT:", 3) == 0 || strncmp(s, "GR:", 3) == 0 || strncmp(s, "OW:", 3) == 0))
+		return NO_MATCH;
+	set_group(m, 1, 0, 2);
+	// currency
+	if (!(p + 4 <= len && is_space(s[p]) && is_upper(s[p+1]) && is_upper(s[p+2]) && is_upper(s[p+3])))
+		return DECLINED;
+	set_group(m, 3, p+1, p+4);
+	set_group(m, 2, p, p+4);
+	p += 4;
+	// amount
+	if (!(p < len && is_space(s[p])))
+		return DECLINED;
+	q = p+1;
+	while (q < len && (is_digit(s[q]) || s[q] == ','))
+		++q;
+	set_group(m, 5, p+1, q);
+	set_group(m, 4, p, q);
+	p = q;
+	// region
+	if (p+1 < len && is_space(s[p]) && s[p+1] == '('){
+		q = p+2;
+		while (q < len && (is_word(s[q]) || is_space(s[q]) || s[q] == '-'))
+			++q;
+		if (s[q] == ')'){
+			set_group(m, 8, p+2, q);
+			set_group(m, 7, p+1, q+1);
+			set_group(m, 6, p, q+1);
+			p = q+1;
+		}
 	}
-	if (*current_pos && *current_pos == '['){
-		// Parse out character information
-		pos = ++current_pos;
-		while(*pos && *pos != ']')
-			++pos;
-		strncpy(character_name, current_pos, pos-current_pos);
-		character_name[pos-current_pos] = '\0';
-		current_pos = pos+1;
-		skip_whitespace(current_pos);
+	// date
+	if (p+1 < len && is_space(s[p]) && s[p+1] == '('){
+		q = p+2;
+		while (q < len && (is_word(s[q]) || is_space(s[q])))
+			++q;
+		if (s[q] == ')'){
+			set_group(m, 11, p+2, q);
+			set_group(m, 10, p+1, q+1);
+			set_group(m, 9, p, q+1);
+			p = q+1;
+		}
 	}
-	if (*current_pos && *current_pos == '<'){
-		// Parse out billing position
-		pos = ++current_pos;
-		while(*pos && *pos != '>')
-			++pos;
-		strncpy(billing_position, current_pos, pos-current_pos);
-		billing_position[pos-current_pos] = '\0';
-		current_pos = pos+1;
+	// number of screens
+	if (p+1 < len && is_space(s[p]) && s[p+1] == '('){
+		q = p+2;
+		while (q < len && (is_word(s[q]) || is_space(s[q]) || s[q] == ','))
+			++q;
+		if (s[q] == ')' && q-7 >= p+2 && strncmp(s + q-7, "screens", 7) == 0){
+			set_group(m, 14, p+2, q-7);
+			set_group(m, 13, p+1, q+1);
+			set_group(m, 12, p, q+1);
+			p = q+1;
+		}
 	}
-	return 1;
+	return p;
 }
 
-static PyObject *
-parse_actor(PyObject *self, PyObject *args){
-	const char* input;
-	char nickname[MAX_NICKNAME_LEN];
-	char lastname[MAX_LASTNAME_LEN];
-	char firstname[MAX_FIRSTNAME_LEN];
-	char actornumber[MAX_ACTORNUMBER_LEN]; // This is a roman numeral
-	
-	if(!PyArg_ParseTuple(args, "s", &input))
-		return Py_None;
-	if(_parse_actor(input, nickname, lastname, firstname, actornumber))
-		return Py_BuildValue("(s, s, s, s)", 
-			nickname, lastname, firstname, actornumber);
-	else
-		return Py_None;
+static Py_ssize_t
+_parse_bio_name(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p = 3;
+	if (len < 4 || strncmp(s, "NM:", 3) != 0 || !is_space(s[3]))
+		return NO_MATCH;
+	skip_space(s, len, p);
+	return _parse_name(s, len, p, m, 1);
 }
 
-static PyObject *
-parse_acted_in(PyObject *self, PyObject *args){
-	const char* input;
-	char title[MAX_TITLE_LEN];
-	char year[MAX_YEAR_LEN];
-	char number[MAX_NUMBER_LEN];
-	char code[MAX_CODE_LEN];
-	char extra_info[MAX_EXTRA_INFO_LEN];
-	char episode_title[MAX_EPISODE_TITLE_LEN];
-	char episode_series[MAX_EPISODE_SERIES_LEN];
-	char episode_number[MAX_EPISODE_NUMBER_LEN];
-	char character_name[MAX_CHARACTER_NAME_LEN];
-	char billing_position[MAX_BILLING_POSITION_LEN];
-	
-	if(!PyArg_ParseTuple(args, "s", &input))
-		return Py_None;
-	if(_parse_acted_in(input, title, year, number, code, extra_info, episode_title, episode_series,
-		episode_number, character_name, billing_position))
-		return Py_BuildValue("(s, s, s, s, s, s, s, s, s, s)", 
-			title, year, number, code, extra_info, episode_title, episode_series, episode_number, 
-			character_name, billing_position);
-	else
-		return Py_None;
+static Py_ssize_t
+_parse_bio_data(const char *s, Py_ssize_t len, Match *m){
+	Py_ssize_t p, q, r;
+	int day, month;
+	if (len < 3 || !(strncmp(s, "DB:", 3) == 0 || strncmp(s, "DD:", 3) == 0))
+		return NO_MATCH;
+	set_group(m, 1, 0, 2);
+	// the day and month are optional, the year is required and followed by a comma
+	for (day = 1; day >= 0; --day){
+		for (month = 1; month >= 0; --month){
+			p = 3;
+			m->spans[4][0] = m->spans[5][0] = m->spans[6][0] = -1;
+			if (day){
+				if (!(p+1 < len && is_space(s[p]) && is_digit(s[p+1])))
+					continue;
+				q = (p+2 < len && is_digit(s[p+2])) ? p+3 : p+2;
+				set_group(m, 4, p, q);
+				p = q;
+			}
+			if (month){
+				if (!(p+1 < len && is_space(s[p]) && is_word(s[p+1])))
+					continue;
+				q = p+1;
+				while (q < len && is_word(s[q]))
+					++q;
+				set_group(m, 6, p+1, q);
+				set_group(m, 5, p, q);
+				p = q;
+			}
+			if (p+5 < len && is_space(s[p]) && is_digit(s[p+1]) && is_digit(s[p+2]) && is_digit(s[p+3])
+					&& is_digit(s[p+4]) && s[p+5] == ',')
+				goto year;
+		}
+	}
+	return DECLINED;
+year:
+	set_group(m, 8, p+1, p+5);
+	set_group(m, 7, p, p+5);
+	set_group(m, 3, 3, p+5);
+	set_group(m, 2, 3, p+5);
+	// location
+	p += 6;
+	q = p;
+	while (q < len && s[q] != '(' && s[q] != ')')
+		++q;
+	if (q > p)
+		set_group(m, 9, p, q);
+	p = q;
+	// cause of death
+	if (p < len && s[p] == '('){
+		r = _find_close(s, len, p+1);
+		if (r != -1){
+			set_group(m, 11, p+1, r);
+			set_group(m, 10, p, r+1);
+			p = r+1;
+		}
+	}
+	return p;
+}
+
+static Py_ssize_t
+_parse_name_line(const char *s, Py_ssize_t len, Match *m){
+	return _parse_name(s, len, 0, m, 1);
 }
 
 /*
-int t_getline(char *line, size_t maxsize){
-	int c, i = 0;
-	while((c = getchar()) != EOF && c != '\n' && ++i < maxsize){
-		*(line++) = c;
+ * runs a scanner on the string argument, falling back to the optional second
+ * argument when the scanner declines the line
+ */
+static PyObject *
+_run(PyObject *args, Py_ssize_t (*scanner)(const char *, Py_ssize_t, Match *), int groups){
+	PyObject *string, *fallback = NULL;
+	Match *m;
+	Py_ssize_t end;
+	int i;
+	if (!PyArg_ParseTuple(args, "S|O", &string, &fallback))
+		return NULL;
+	m = PyObject_New(Match, &MatchType);
+	if (!m)
+		return NULL;
+	Py_INCREF(string);
+	m->string = string;
+	m->groups = groups;
+	for (i = 0; i <= groups; ++i)
+		m->spans[i][0] = m->spans[i][1] = -1;
+	end = scanner(PyString_AS_STRING(string), PyString_GET_SIZE(string), m);
+	if (end >= 0){
+		set_group(m, 0, 0, end);
+		return (PyObject *)m;
+	}
+	Py_DECREF(m);
+	if (end == NO_MATCH){
+		Py_RETURN_NONE;
 	}
-	*line = '\0';
-	return i;
+	if (fallback)
+		return PyObject_CallFunctionObjArgs(fallback, string, NULL);
+	Py_RETURN_FALSE;
 }
-*/
+
+#define PARSE_FUNCTION(NAME, SCANNER, GROUPS) \
+	static PyObject * \
+	parse_##NAME(PyObject *self, PyObject *args){ \
+		return _run(args, SCANNER, GROUPS); \
+	}
+
+PARSE_FUNCTION(name, _parse_name_line, 6)
+PARSE_FUNCTION(acted_in, _parse_acted_in, 19)
+PARSE_FUNCTION(movies, _parse_movies, 18)
+PARSE_FUNCTION(title_rating, _parse_title_rating, 14)
+PARSE_FUNCTION(title_business, _parse_title_business, 11)
+PARSE_FUNCTION(data_business, _parse_data_business, 14)
+PARSE_FUNCTION(location, _parse_location, 20)
+PARSE_FUNCTION(bio_name, _parse_bio_name, 6)
+PARSE_FUNCTION(bio_data, _parse_bio_data, 11)
 
 static PyMethodDef ParseMethods[] = {
-	{"actor", parse_actor, METH_VARARGS, "Parses out actor information from a string."},
+	{"name", parse_name, METH_VARARGS, "Parses out the parts of a name."},
 	{"acted_in", parse_acted_in, METH_VARARGS, "Parses out acted in information from a string."},
+	{"movies", parse_movies, METH_VARARGS, "Parses out a line of the movies list."},
+	{"title_rating", parse_title_rating, METH_VARARGS, "Parses out a line of the ratings list."},
+	{"title_business", parse_title_business, METH_VARARGS, "Parses out the title line of the business list."},
+	{"data_business", parse_data_business, METH_VARARGS, "Parses out a data line of the business list."},
+	{"location", parse_location, METH_VARARGS, "Parses out a line of the locations list."},
+	{"bio_name", parse_bio_name, METH_VARARGS, "Parses out the name line of the biographies list."},
+	{"bio_data", parse_bio_data, METH_VARARGS, "Parses out a birth/death line of the biographies list."},
 	{NULL, NULL, 0, NULL}
 };
 
 PyMODINIT_FUNC
 initparse(void){
-	(void) Py_InitModule("parse", ParseMethods);
+	PyObject *module;
+	if (PyType_Ready(&MatchType) < 0)
+		return;
+	module = Py_InitModule("parse", ParseMethods);
+	if (!module)
+		return;
+	Py_INCREF(&MatchType);
+	PyModule_AddObject(module, "Match", (PyObject *)&MatchType);
 }
-
-/*
-int main(void){
-	int c;
-	char line[LINE_SIZE];
-	char nickname[MAX_NICKNAME_LEN];
-	char lastname[MAX_LASTNAME_LEN];
-	char firstname[MAX_FIRSTNAME_LEN];
-	char actornumber[MAX_ACTORNUMBER_LEN]; // This is a roman numeral
-	while(t_getline(line, sizeof(line))){
-		parse_as(line, nickname, lastname, firstname, actornumber);
-		printf("input: %s\noutput:\n\tnickname: \t%s\n\tlastname: \t%s\n\tfirstname: \t%s\n\tactornumber: \t%s\n",
-		   line, nickname, lastname, firstname, actornumber);
-	}
-	return 0;
-}
-*/
-
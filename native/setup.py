@@ -0,0 +1,5 @@
+# Builds the native parser, run `python setup.py build_ext --inplace` in this folder
+from distutils.core import setup, Extension
+
+setup(name = "parse",
+	ext_modules = [Extension("parse", ["parse.c"])])
@@ -1,8 +1,11 @@
 import parse
-print parse.actor("'test a best' $haha, shorty payce (II)")
-print parse.acted_in("\"106 & Park Top 10 Live\" (2000) {Busta Rhymes in Da Building (#1.2)}  [Himself - Judge #3] <5>")
-print parse.acted_in("Nykytaiteen museo (1986/I)  [Himself]  <25>")
-print parse.acted_in("Nykytaiteen (1986/VX)  [Himself]  <25>")
-print parse.acted_in("Get It Where You Fit in 1 (2003) (V)  [Himself]  <1>")
-print parse.acted_in("Porndogs: The Adventures of Sadie (2009)  (voiceasdf)  [Bosco]  <3>")
-print parse.acted_in("\"Eastenders\" (1985) {(2004-03-25)} [Mr. Roche] <27>")
+print parse.name("'test a best' $haha, shorty payce (II)").groups()
+print parse.acted_in("\"106 & Park Top 10 Live\" (2000) {Busta Rhymes in Da Building (#1.2)}  [Himself - Judge #3] <5>").groups()
+print parse.acted_in("Nykytaiteen museo (1986/I)  [Himself]  <25>").groups()
+print parse.acted_in("Nykytaiteen (1986/VX)  [Himself]  <25>").groups()
+print parse.acted_in("Get It Where You Fit in 1 (2003) (V)  [Himself]  <1>").groups()
+print parse.acted_in("Porndogs: The Adventures of Sadie (2009)  (voiceasdf)  [Bosco]  <3>").groups()
+print parse.acted_in("\"Eastenders\" (1985) {(2004-03-25)} [Mr. Roche] <27>").groups()
+print parse.title_rating("      0000000125  1234   6.5  Title (1999)").groups()
+print parse.data_business("OW: USD 1,234 (USA) (5 May 2001) (1,200 screens)").groups()
+print parse.bio_data("DB: 15 March 1950, London, England, UK").groups()
@@ -0,0 +1,808 @@
+# Parsing of the IMDB *.list files, independent of any database
+# The parse_*_chunk functions do the actual work on chunks of lines, the list
+# generators at the bottom wrap them into streams of records for other uses
+# (exports, benchmarks, ...), tosql.py writes the chunks to the database.
+
+import re
+import mmap
+import signal
+import subprocess
+import collections
+from distutils.spawn import find_executable
+from numerals import rntoi
+
+# Precompile the regexes
+class ParseRegexes:
+	# raw regex strings for reference e.g. regex buddy copy paste
+	raw_acted_in = """"?([^"]*?)"?\s\(((\?{4}|\d+)/?(\w+)?).*?\)(\s*\((T?VG?)\))?
+		(\s*\((\w*)\))?(\s*\{([^\(]*?)(\s*\(\#(\d+)\.(\d+)\))?\})?
+		(\s*\[(.*)\])?(\s*\<(\d+)\>)?"""
+	raw_name = """('.+')?\s*(([^,']*),)?\s*([^\(]+)(\((\w+)\))?"""
+	raw_movies = """"?([^"]*?)"?\s\(((\?{4}|\d+)/?(\w+)?).*?\)(\s*\((T?VG?)\))?
+		(\s*\{([^\(]*?)(\s*\(\#(\d+)\.(\d+)\))?\})?.*"""
+	raw_aka_name = """\s*\(aka ([^\)]+)\)"""
+	raw_aka_title_title = """\"?([^\"]*)\"?\s*\((\d{4}|\?{4})(/([\w]*))?\)\s*(\((T?VG?)\))?"""
+	raw_title_genre = """\"?([^\"]*)\"?\s*\((\d{4}|\?{4})(/([\w]*))?\)\s*(\((T?VG?)\))?\s*(\w+)"""
+	raw_aka_title_alias = """\(aka\s\"?([^\"]*)\"?\s\((\d{4}|\?{4})\)\s*\)\s*(\(([^\)]*)\))?\s*(\(([^\)]*)\))?"""
+	# compiled regex patterns for use
+	name = re.compile("""
+		('.+')?\s*				# nickname (optional, group 1)
+		(([^,']*),)?\s*			# last name (optional, group 3)
+		([^\(]+)				# first name (required, group 4)
+		(\((\w+)\))?			# actor number (optional, group 6)
+		""", re.VERBOSE)
+	acted_in = re.compile("""
+		"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
+		\(((\?{4}|\d+)/?(\w+)?).*?\)
+								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
+								# (optional, group 4) if multiple in same year
+		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
+		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
+								# episode information: episode title (optional, group 8), within that
+								# broadcast date (optional, group 9) or
+								# episode series (optional, group 10) and episode number 
+								# (optional, group 11) information. The episode series and number are
+								# optional within the optional group.
+		(\s*(\{{2}SUSPENDED\}{2}))?
+								# additional information if suspended (optional, group 13)
+		(\s*\(([\w ,.-]*)\))?	# information regarding part (optional, group 15), e.g. 'voice', 'likeness'
+		(\s*\[(.*)\])?			# character name (optional, group 17) (surrounded by '[' and ']')
+		(\s*\<(\d+)\>)?			# billing position (optional, group 19) (surrounded by '<' and '>')
+		""", re.VERBOSE)
+	movies = re.compile("""
+		"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
+		\(((\?{4}|\d+)/?(\w+)?).*?\)
+								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
+								# (optional, group 4) if multiple in same year
+		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
+		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
+								# episode information: episode title (optional, group 8), within that
+								# broadcast date (optional, group 9) or
+								# episode series (optional, group 10) and episode number 
+								# (optional, group 11) information. The episode series and number are
+								# optional within the optional group.
+		(\s*(\{{2}SUSPENDED\}{2}))?
+								# additional information if suspended (optional, group 13)
+		(\s*((\?{4})|(\d{4})(\-\d{4})?))
+								# publish year/year range (optional, group 15)
+		""", re.VERBOSE)
+	aka_name = re.compile("""
+		\s*\(aka ([^\)]+)\)		# alias name (required, group 1)
+		""", re.VERBOSE)
+	aka_title_alias = re.compile("""
+		\(aka\s\"?([^\"]*)\"?\s	# title (required, group 1)
+		\((\d{4}|\?{4})\)\s*\)\s*
+								# year (required, group 2)
+		(\(([^\)]*)\))?\s*		# location (required, group 4)
+		(\(([^\)]*)\))?			# reason (optional, group 6)
+		""", re.VERBOSE)
+	aka_title_title = re.compile("""
+		\"?([^\"]*)\"?\s*		# title (required, group 1)
+		\((\d{4}|\?{4})			# year (required, group 2)
+		(/([\w]*))?\)\s*		# number (optional, group 4)
+		(\((T?VG?)\))?			# code (optional, group 6)
+		""", re.VERBOSE)
+	title_genre = re.compile("""
+		\"?([^\"]*)\"?\s*		# title (required, group 1)
+		\((\d{4}|\?{4})			# year (required, group 2)
+		(/([\w]*))?\)\s*		# number (optional, group 4)
+		(\((T?VG?)\))?\s*		# code (optional, group 6)
+		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
+								# episode information: episode title (optional, group 8), within that
+								# broadcast date (optional, group 9) or
+								# episode series (optional, group 10) and episode number 
+								# (optional, group 11) information. The episode series and number are
+								# optional within the optional group.
+		(\s*(\{{2}SUSPENDED\}{2}))?
+								# additional information if suspended (optional, group 13)
+		(\s*([-.'$\w]+))			# genre (required, group 15)
+		""", re.VERBOSE)
+	title_rating = re.compile("""
+		\s*						# leading whitespace
+		([\d.*]*)\s*			# rating distribution  incl. *-mark for new movies (required, group 1)
+		(\d*)\s*				# number of votes cast (required, group 2)
+		([\d.]*)\s*				# average rating (required, group 3)
+		"?([^"]*?)"?\s			# title (required, group 4) surrounded by quotations if it's a tv show
+		\(((\?{4}|\d+)/?(\w+)?).*?\)
+								# the year (required, group 6), followed by `/ROMAN_NUMERAL` 
+								# (optional, group 7) if multiple in same year
+		(\s*\((T?VG?)\))?		# special code (optional, group 9), one of 'TV', 'V', 'VG'
+		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
+								# episode information: episode title (optional, group 11), within that
+								# broadcast date (optional, group 12) or
+								# episode series (optional, group 13) and episode number 
+								# (optional, group 14) information. The episode series and number are
+								# optional within the optional group.
+		""", re.VERBOSE)
+	title_business = re.compile("""
+		MV:\s+"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
+		\(((\?{4}|\d+)/?(\w+)?).*?\)
+								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
+								# (optional, group 4) if multiple in same year
+		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
+		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
+								# episode information: episode title (optional, group 8), within that
+								# broadcast date (optional, group 9) or
+								# episode series (optional, group 10) and episode number 
+								# (optional, group 11) information. The episode series and number are
+								# optional within the optional group.
+		""", re.VERBOSE)
+	data_business = re.compile("""
+		(BT|GR|OW):				# prefix denoting business data category (required, group 1)
+		(\s([A-Z]{3}))			# currency (required, group 3)
+		(\s([0-9,]*))			# amount (required, group 5)
+		(\s(\(([\w\s-]*)\)))?	# region (required for OW else optional, group 8)
+		(\s(\(([\w\s]*)\)))?	# date (required for OW else optional, group 11)
+		(\s(\(([\w\s,]*) screens\)))?
+								# number of screens (optional, group 14)
+		""", re.VERBOSE)
+	location = re.compile("""
+		"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
+		\(((\?{4}|\d+)/?(\w+)?).*?\)
+								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
+								# (optional, group 4) if multiple in same year
+		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
+		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
+								# episode information: episode title (optional, group 8), within that
+								# broadcast date (optional, group 9) or
+								# episode series (optional, group 10) and episode number 
+								# (optional, group 11) information. The episode series and number are
+								# optional within the optional group.
+		(\s*(\{{2}SUSPENDED\}{2}))?
+								# additional information if suspended (optional, group 13)
+		(\s*(((.*?) - )?		# location name (optional, group 17)
+		([^()]*)				# location (required, group 18)
+		(\((.*?)\))?))			# location or scene description (optional, group 20)
+		""", re.VERBOSE)
+	bio_name = re.compile("""
+		NM:\s+('.+')?\s*		# nickname (optional, group 1)
+		(([^,']*),)?\s*			# last name (optional, group 3)
+		([^\(]+)				# first name (required, group 4)
+		(\((\w+)\))?			# actor number (optional, group 6)
+		""", re.VERBOSE)
+	bio_data = re.compile("""
+		(DB|DD):				# prefix denoting bio data category (required, group 1)
+		(((\s[\d]{1,2})?(\s(\w+))?(\s([\d]{4}))))
+								# date as "dd MMMM yyyy" or "yyyy" (required, group 8)
+		,([^()]+)?				# location (optional, group 7)
+		(\((.*?)\))?			# cause of death (optional, group 9)
+		""", re.VERBOSE)
+	
+
+
+# Enum Classes
+# Naming conventions if `Table``Column`
+class ActorsGender:
+	MALE 	= "male"
+	FEMALE 	= "female"
+
+class MoviesType:
+	TV 	= "TV production"
+	V 	= "video production"
+	VG 	= "video game"
+	M 	= "movie/series"		# there's no code for this, this is default Movie
+	@staticmethod
+	def from_str(type_string):
+		"""converts a type string to a type enum"""
+		global type_enum
+		if type_string == "V":
+			return MoviesType.V
+		elif type_string == "VG":
+			return MoviesType.VG
+		elif type_string == "TV":
+			return MoviesType.TV
+		else:
+			return MoviesType.M
+
+#
+# Line matching
+# The parsers match lines with the functions in matchers. By default these are
+# the match functions of the compiled regexes, except for title_rating which
+# goes through title_matcher. use_native() switches them all to the native
+# extension (see native/parse.c). Either way the match objects have the same
+# groups as the regex's and the lines the fast paths aren't sure about are
+# handed to the regexes.
+#
+
+class GroupsMatch(tuple):
+	"""stands in for the match object of a regex, group(n) is the nth item"""
+	__slots__ = ()
+	group = tuple.__getitem__
+
+
+TITLE = '"?([^"]*?)"?\\s'	# the title part of the title regexes
+WHITESPACE = " \t\n\r\f\v"	# \s
+
+def title_matcher(regex):
+	"""match function for a regex with a title (see TITLE) that finds the end of
+	the title with str.find instead of the lazy quantifier. The regex is split
+	around the title, the part before it (e.g. the rating columns) is matched as
+	usual and the part after it is only tried at the candidate ends of the title:
+	whitespace followed by a parenthesis or the closing quote, in order. That's
+	the order the regex tries them in, so the first match is the regex's match.
+	If there is none the regex only has to be run if the title could start in
+	the part before (or on the opening quote), otherwise there is no match."""
+	head, tail = regex.pattern.split(TITLE, 1)
+	head = re.compile(head, regex.flags) if head.strip() else None
+	tail = re.compile(tail, regex.flags)
+	def match(string):
+		if head:
+			m = head.match(string)
+			if not m:
+				return None
+			pos = m.end()
+			head_groups = m.groups()
+		else:
+			pos = 0
+			head_groups = ()
+		start = pos + 1 if string[pos:pos+1] == '"' else pos
+		quote = string.find('"', start)
+		if quote == -1:
+			quote = len(string)
+		open = string.find("(", start + 1)
+		while open != -1 and open < quote:
+			if string[open-1] in WHITESPACE:
+				t = tail.match(string, open)
+				if t:
+					return GroupsMatch((string[:t.end()],) + head_groups + (string[start:open-1],) + t.groups())
+			open = string.find("(", open + 1)
+		for start, quote in ((start, quote), (pos, pos)):
+			if quote+1 < len(string) and string[quote] == '"' and string[quote+1] in WHITESPACE:
+				t = tail.match(string, quote + 2)
+				if t:
+					return GroupsMatch((string[:t.end()],) + head_groups + (string[start:quote],) + t.groups())
+		if string[pos:pos+1] == "(":
+			return regex.match(string)
+		return None
+	return match
+
+
+# title_matcher works for all the title regexes, but for well formed lines a
+# single call of the regex is faster than the scan in python. It only pays off
+# where the regex backtracks into a prefix, the rating columns get split every
+# possible way before the regex gives up on a title it can't match.
+matchers = dict((name, getattr(ParseRegexes, name).match) for name in ("name", "acted_in", "movies",
+	"title_business", "data_business", "location", "bio_name", "bio_data"))
+matchers["title_rating"] = title_matcher(ParseRegexes.title_rating)
+
+def native_matcher(native_match, fallback):
+	return lambda string: native_match(string, fallback)
+
+
+def use_native():
+	"""switches the matchers to the native extension, returns False (leaving
+	the regexes in place) if it hasn't been built"""
+	try:
+		parse = __import__("native.parse").parse
+	except ImportError:
+		return False
+	if not hasattr(parse, "Match"):
+		# built from an older version of parse.c
+		return False
+	for name in matchers:
+		matchers[name] = native_matcher(getattr(parse, name), getattr(ParseRegexes, name).match)
+	return True
+
+
+#
+# List file parsing
+# The parse_*_chunk functions turn a chunk of whole records of a list file into
+# a list of record tuples tagged with their type, they don't touch the database
+# so they can be run in worker processes. Problems are passed on as "error"
+# records (or "fatal" records if processing can't continue) along with the
+# index of the line within the chunk so that they are reported by the writer in
+# file order.
+#
+
+def parse_year(year_string):
+	"""converts the year of a title to an integer, ???? is stored as -1"""
+	if year_string.strip() == "????":
+		return -1
+	return int(year_string) # there always has to be a year
+
+
+def title_key(m, offset = 0):
+	"""the canonical key of a title: the title as it is written in the lists,
+	rebuilt from the title groups of a match with the whitespace normalized
+	and without the quotes around series names, so that every list produces
+	the same key for a production"""
+	key = " ".join(m.group(1+offset).split()) + " (" + m.group(2+offset) + ")"
+	code = m.group(6+offset)
+	if code in ("TV", "V", "VG"):
+		key += " (" + code + ")"
+	if m.group(7+offset):
+		episode = [" ".join(m.group(8+offset).split()) if m.group(8+offset) else "",
+			"".join(m.group(9+offset).split()) if m.group(9+offset) else ""]
+		key += " {" + " ".join([part for part in episode if part]) + "}"
+	return key
+
+
+def production_from_match(m, offset = 0):
+	"""builds the productions row from the title groups of a match, offset is
+	the number of groups before the title (e.g. the rating columns)"""
+	broadcast_date = m.group(9+offset).replace("(", "").replace(")","") if m.group(9+offset) else "          "
+	return {
+		"title_key": title_key(m, offset),
+		"title": m.group(1+offset).strip(),
+		"year": parse_year(m.group(3+offset)),
+		"number": (rntoi(m.group(4+offset)) + 1) if m.group(4+offset) else 1, # in roman numerals, needs to be converted
+		"productions_type": MoviesType.from_str(m.group(6+offset)),
+		"episode_title": m.group(8+offset).strip() if m.group(8+offset) else broadcast_date,
+		"season": int(m.group(10+offset)) if m.group(10+offset) else -1,
+		"episode_number": int(m.group(11+offset)) if m.group(11+offset) else -1}
+
+
+def person_from_match(m):
+	"""builds the (gender-less) people row from a name match, or the defaults
+	if the name could not be parsed"""
+	if not m:
+		return {"lastname": "", "firstname": "", "nickname": "", "number": 1}
+	return {
+		"lastname": m.group(3).strip() if m.group(3) else None,
+		"firstname": m.group(4).strip(), # only required field
+		"nickname": m.group(1).strip() if m.group(1) else None,
+		"number": (rntoi(m.group(6)) + 1) if m.group(6) else 1}
+
+
+def parse_people_chunk(lines):
+	"""actors/actresses: ("person", people row) followed by an
+	("acted_in", productions row, people_x_productions row) per title"""
+	records = []
+	new_actor = True
+	for line_number, line in enumerate(lines):
+		if line == "\n":
+			new_actor = True
+			continue
+		if new_actor:
+			new_actor = False
+			# use regex to parse out name parts
+			name = line.split('\t')[0]
+			m = matchers["name"](name)
+			if not m:
+				records.append(("error", line_number, "invalid name : " + name))
+			records.append(("person", person_from_match(m)))
+			to_process = line.split('\t')[-1].strip() # use the rest of the line if we read in actor data
+		else:
+			to_process = line.strip()
+		n = matchers["acted_in"](to_process)
+		if n:
+			try:
+				production = production_from_match(n)
+			except ValueError:
+				records.append(("fatal", line_number, "year not valid integer value: " + to_process))
+				return records
+			records.append(("acted_in", production, {
+				"character": n.group(17).strip() if n.group(17) else None,
+				"billing_position": int(n.group(19)) if n.group(19) else None,
+				"special_information": n.group(15).strip() if n.group(15) else None}))
+		else:
+			records.append(("error", line_number, "invalid info: " + to_process))
+	return records
+
+
+def parse_movies_chunk(lines):
+	"""movies: a ("production", productions row) per line"""
+	records = []
+	for line_number, line in enumerate(lines):
+		m = matchers["movies"](line)
+		if not m:
+			records.append(("error", line_number, "invalid movie : " + line))
+		else:
+			try:
+				records.append(("production", production_from_match(m)))
+			except ValueError:
+				records.append(("fatal", line_number, "year not valid integer value: " + line))
+				return records
+	return records
+
+
+def parse_ratings_chunk(lines):
+	"""ratings: a ("rating", productions row, productions_ratings row) per line"""
+	records = []
+	for line_number, line in enumerate(lines):
+		if line != "\n":
+			# use regex to parse out movie title parts
+			title = line.strip()
+			m = matchers["title_rating"](title)
+			if m:
+				records.append(("rating", production_from_match(m, 3), {
+					"distribution": m.group(1).strip() if m.group(1) else None,
+					"votes": m.group(2),
+					"rating": m.group(3)}))
+			else:
+				records.append(("error", line_number, "invalid title/rating: " + title))
+	return records
+
+
+def parse_business_chunk(lines):
+	"""business: a ("production", productions row or None) per movie followed
+	by a ("business", productions_business row) per business data line"""
+	records = []
+	new_movie = True
+	for line_number, line in enumerate(lines):
+		if line == "-------------------------------------------------------------------------------\n":
+			new_movie = True
+			continue
+		elif line == "\n":
+			continue
+		if new_movie:
+			new_movie = False
+			# use regex to parse out movie title parts
+			m = matchers["title_business"](line.strip())
+			records.append(("production", production_from_match(m) if m else None))
+			continue
+		# process line
+		n = matchers["data_business"](line.strip())
+		if n:
+			type = n.group(1).strip()
+			amount = int(re.sub(",", "", n.group(5)))
+			if type == "BT":
+				type = "budget"
+			elif type == "GR":
+				type = "box office gross"
+			elif type == "OW":
+				type = "opening weekend box office take"
+			records.append(("business", {
+				"business_type": type,
+				"currency": n.group(3).strip() if n.group(3) else "USD",
+				"amount": -1 if amount > 9223372036854775807 else amount,
+				"region": n.group(8).strip() if n.group(8) else None,
+				"date": n.group(11).strip() if n.group(11) else "31 December 2100",
+				"screens": int(re.sub(",", "", n.group(14))) if n.group(14) else -1}))
+	return records
+
+
+def parse_locations_chunk(lines):
+	"""locations: a ("location", productions row, productions_locations row)
+	per line"""
+	records = []
+	for line_number, line in enumerate(lines):
+		if line != "\n":
+			# use regex to parse out movie title parts
+			title = line.strip()
+			m = matchers["location"](title)
+			if m:
+				records.append(("location", production_from_match(m), {
+					"location_name": m.group(17).strip() if m.group(17) else None,
+					"location": m.group(18).strip() if m.group(18) else None,
+					"location_info": m.group(20).strip() if m.group(20) else None}, title))
+			else:
+				records.append(("error", line_number, "invalid title/location: " + title))
+	return records
+
+
+def parse_biographies_chunk(lines):
+	"""biographies: a ("person", people row) per biography followed by a
+	("bio", biographies row) per birth/death line"""
+	records = []
+	new_bio = True
+	for line_number, line in enumerate(lines):
+		if line == "-------------------------------------------------------------------------------\n":
+			new_bio = True
+			continue
+		elif line == "\n":
+			continue
+		if new_bio:
+			new_bio = False
+			# use regex to parse out name parts
+			name = line.strip()
+			m = matchers["bio_name"](name)
+			if not m:
+				records.append(("error", line_number, "invalid name : " + name))
+			records.append(("person", person_from_match(m)))
+			continue
+		# process line
+		n = matchers["bio_data"](line.strip())
+		if n:
+			type = n.group(1).strip()
+			if type == "DB":
+				type = "born"
+			elif type == "DD":
+				type = "died"
+			records.append(("bio", {
+				"biography_type": type,
+				"biography_date": n.group(8).strip(),
+				"biography_location": n.group(9).strip() if n.group(9) else None,
+				"cause_of_death": n.group(11).strip() if n.group(11) else None}))
+	return records
+
+
+#
+# List file layout
+# The header line the data starts after (and the number of lines to skip after
+# it), the footer line it ends before and the line separating the records if
+# they span multiple lines, along with the parser for the data.
+#
+
+ListFormat = collections.namedtuple("ListFormat", "header skip_lines footer separator parser")
+
+list_formats = {
+	"actors": ListFormat("----\t\t\t------\n", 0,
+		"-----------------------------------------------------------------------------\n", "\n", parse_people_chunk),
+	"actresses": ListFormat("----\t\t\t------\n", 0,
+		"-----------------------------------------------------------------------------\n", "\n", parse_people_chunk),
+	# skip over the blank line inbetween movie list and header
+	"movies": ListFormat("===========\n", 1,
+		"--------------------------------------------------------------------------------\n", None, parse_movies_chunk),
+	# read over the two seperator lines
+	"ratings": ListFormat("MOVIE RATINGS REPORT\n", 2,
+		"------------------------------------------------------------------------------\n", None, parse_ratings_chunk),
+	"business": ListFormat("BUSINESS LIST\n", 2,
+		None, "-------------------------------------------------------------------------------\n", parse_business_chunk),
+	"locations": ListFormat("LOCATIONS LIST\n", 2,
+		"-------------------------------------------------------------------------------\n", None, parse_locations_chunk),
+	"biographies": ListFormat("BIOGRAPHY LIST\n", 2,
+		None, "-------------------------------------------------------------------------------\n", parse_biographies_chunk),
+}
+
+
+
+#
+# List file reading
+#
+
+# the compressed list files that can be read: extension, the decompression
+# programs to use (in order of preference) and the python module to fall back
+# on if none of them is installed
+decompressors = [
+	(".gz", ["pigz", "gzip"], "gzip"),
+	(".bz2", ["lbzip2", "pbzip2", "bzip2"], "bz2"),
+	(".xz", ["xz"], "lzma")
+]
+
+class PipeFile:
+	"""the output of a decompression process, read like a file"""
+	def __init__(self, process):
+		self.process = process
+		self.file = process.stdout
+		self.readline = self.file.readline
+
+	def __iter__(self):
+		return iter(self.file)
+
+	def close(self):
+		self.file.close()
+		# stopping at the footer closes the pipe early, which ends the process
+		# with SIGPIPE (a negative return code, see restore_sigpipe)
+		if self.process.wait() > 0:
+			raise IOError("decompression of a list file failed (exit code %d)" % (self.process.returncode))
+
+
+def restore_sigpipe():
+	"""python ignores SIGPIPE and child processes inherit that, restoring the
+	default lets a decompression program whose output is closed early end
+	quietly instead of failing on the write"""
+	signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+
+def is_compressed(path):
+	return any([path.endswith(extension) for extension, programs, module in decompressors])
+
+
+def open_list(path):
+	"""opens a list file for reading. Compressed files are streamed through a
+	decompression program running alongside the parsing (so the decompressed
+	file is never written out) or, if none is installed, decompressed by python
+	as they are read."""
+	for extension, programs, module in decompressors:
+		if path.endswith(extension):
+			for program in programs:
+				executable = find_executable(program)
+				if executable:
+					return PipeFile(subprocess.Popen([executable, "-dc", path], stdout = subprocess.PIPE, bufsize = 1048576,
+						preexec_fn = restore_sigpipe))
+			if module == "lzma":
+				try:
+					lzma = __import__("lzma")
+				except ImportError:
+					lzma = __import__("backports.lzma", fromlist = ["lzma"])
+				return lzma.LZMAFile(path, "rb")
+			elif module == "bz2":
+				return __import__("bz2").BZ2File(path, "rb")
+			return __import__("gzip").GzipFile(path, "rb")
+	return open(path, "rb")
+
+
+def skip_header(f, header, skip_lines):
+	"""skips over the information at the beginning of an opened list file up to
+	and including the header line and the skip_lines lines after it, returns the
+	number of the last line read"""
+	line_number = 1
+	line = f.readline()
+	while(line and line != header):
+		line = f.readline()
+		line_number += 1
+	for i in xrange(skip_lines):
+		f.readline()
+		line_number += 1
+	return line_number
+
+
+def read_chunks(f, footer = None, separator = None, chunk_lines = 10000):
+	"""reads the data section of an opened list file (positioned after the
+	header) in chunks of roughly chunk_lines lines. Chunks end on
+	a separator line so records are never split, if no separator is given every
+	line is a record of its own. Reading stops at the footer line."""
+	lines = []
+	for line in f:
+		if line == footer:
+			# this is the last valid line before there is a bunch of junk
+			break
+		lines.append(line)
+		if len(lines) >= chunk_lines and (separator is None or line == separator):
+			yield lines
+			lines = []
+	if lines:
+		yield lines
+
+
+def find_data_range(mm, header, skip_lines, footer = None):
+	"""finds the data section of a memory mapped list file, returning the
+	(start, end) byte offsets and the number of the last line before it"""
+	if mm[:len(header)] == header:
+		start = len(header)
+	else:
+		start = mm.find("\n" + header)
+		start = len(mm) if start == -1 else start + 1 + len(header)
+	for i in xrange(skip_lines):
+		start = mm.find("\n", start)
+		start = len(mm) if start == -1 else start + 1
+	end = len(mm)
+	if footer:
+		# the footer is near the end of the file so look there first
+		found = mm.find("\n" + footer, max(start, len(mm) - 1048576, 1) - 1)
+		if found == -1:
+			found = mm.find("\n" + footer, max(start, 1) - 1)
+		if found != -1:
+			end = found + 1
+	return start, end, mm[:start].count("\n")
+
+
+def split_data_range(mm, start, end, separator = None, chunk_bytes = 4194304):
+	"""splits the byte range [start, end) of a memory mapped list file into
+	ranges of roughly chunk_bytes bytes, each range ending after
+	a separator line (or any line if no separator is given) so that they only
+	contain whole records"""
+	while start < end:
+		cut = start + chunk_bytes
+		if cut >= end:
+			cut = end
+		elif separator is None:
+			cut = mm.find("\n", cut - 1, end)
+			cut = end if cut == -1 else cut + 1
+		else:
+			cut = mm.find("\n" + separator, cut - 1, end)
+			cut = end if cut == -1 else cut + 1 + len(separator)
+		yield start, cut
+		start = cut
+
+
+def parse_lines(parser, lines):
+	"""runs parser on a chunk of lines, returning (records, number of lines)"""
+	return parser(lines), len(lines)
+
+
+def parse_range(parser, file_name, start, end):
+	"""runs parser on the lines in the byte range [start, end) of a list file,
+	returning (records, number of lines). The file is memory mapped so only the
+	range itself is read."""
+	f = open(file_name, "rb")
+	mm = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+	lines = mm[start:end].splitlines(True)
+	mm.close()
+	f.close()
+	return parser(lines), len(lines)
+
+
+#
+# Record streams
+# One generator per list type yielding the records of an opened list file,
+# reading it a chunk at a time so memory use doesn't grow with the file. Lines
+# that can't be parsed are passed to on_error(line number, message) if given
+# and skipped otherwise, ValueError is raised if processing can't continue.
+# The fields are named after the columns of the database tables, values the
+# parsers use as placeholders for missing data (-1, a blank date) are None.
+#
+
+Person = collections.namedtuple("Person", "lastname firstname nickname number gender")
+Production = collections.namedtuple("Production",
+	"title year number productions_type episode_title season episode_number title_key")
+Role = collections.namedtuple("Role", "person production character billing_position special_information")
+Rating = collections.namedtuple("Rating", "production distribution votes rating")
+Business = collections.namedtuple("Business", "production business_type currency amount region date screens")
+Location = collections.namedtuple("Location", "production location_name location location_info")
+Biography = collections.namedtuple("Biography",
+	"person biography_type biography_date biography_location cause_of_death")
+
+def unset(v):
+	"""the placeholders for missing values to None"""
+	return None if v == -1 or v == "          " else v
+
+
+def person_record(person, gender = None):
+	return Person(person["lastname"], person["firstname"], person["nickname"], person["number"], gender)
+
+
+def production_record(production):
+	return Production(**dict((k, unset(v)) for k, v in production.iteritems()))
+
+
+def parse_list(list_name, f, on_error = None, chunk_lines = 10000):
+	"""yields the (line number, tagged record) pairs of the parse_*_chunk
+	function for list_name from an opened list file, reporting problems to
+	on_error"""
+	format = list_formats[list_name]
+	line_number = skip_header(f, format.header, format.skip_lines)
+	for lines in read_chunks(f, format.footer, format.separator, chunk_lines):
+		for record in format.parser(lines):
+			if record[0] == "fatal":
+				raise ValueError("line %d: %s" % (line_number + 1 + record[1], record[2]))
+			elif record[0] == "error":
+				if on_error:
+					on_error(line_number + 1 + record[1], record[2])
+			else:
+				yield record
+		line_number += len(lines)
+
+
+def actors(f, on_error = None, gender = ActorsGender.MALE):
+	"""yields a Role per title of the actors (or actresses) list"""
+	person = None
+	for record in parse_list("actors", f, on_error):
+		if record[0] == "person":
+			person = person_record(record[1], gender)
+		else:
+			link = record[2]
+			yield Role(person, production_record(record[1]), link["character"],
+				link["billing_position"], link["special_information"])
+
+
+def actresses(f, on_error = None):
+	"""yields a Role per title of the actresses list"""
+	return actors(f, on_error, ActorsGender.FEMALE)
+
+
+def movies(f, on_error = None):
+	"""yields a Production per line of the movies list"""
+	for record in parse_list("movies", f, on_error):
+		yield production_record(record[1])
+
+
+def ratings(f, on_error = None):
+	"""yields a Rating per line of the ratings list"""
+	for record in parse_list("ratings", f, on_error):
+		rating = record[2]
+		yield Rating(production_record(record[1]), rating["distribution"], rating["votes"], rating["rating"])
+
+
+def business(f, on_error = None):
+	"""yields a Business per business data line of the business list, data of
+	titles that couldn't be parsed is skipped"""
+	production = None
+	for record in parse_list("business", f, on_error):
+		if record[0] == "production":
+			production = production_record(record[1]) if record[1] else None
+		elif production:
+			b = record[1]
+			yield Business(production, b["business_type"], b["currency"], unset(b["amount"]),
+				b["region"], b["date"], unset(b["screens"]))
+
+
+def locations(f, on_error = None):
+	"""yields a Location per line of the locations list"""
+	for record in parse_list("locations", f, on_error):
+		location = record[2]
+		yield Location(production_record(record[1]), location["location_name"],
+			location["location"], location["location_info"])
+
+
+def biographies(f, on_error = None):
+	"""yields a Biography per birth/death line of the biographies list"""
+	person = None
+	for record in parse_list("biographies", f, on_error):
+		if record[0] == "person":
+			person = person_record(record[1])
+		else:
+			b = record[1]
+			yield Biography(person, b["biography_type"], b["biography_date"],
+				b["biography_location"], b["cause_of_death"])
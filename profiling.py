@@ -0,0 +1,123 @@
+# Profiling hooks around the processing of each list file (see process_list in
+# tosql.py), selected with Options.profile:
+#	"cprofile"		profiles the whole file with cProfile
+#	"sample"		profiles one chunk every Options.profile_sample_lines lines with
+#					cProfile, which keeps the overhead low on the full lists
+#	"tracemalloc"	snapshots the allocations at the end of each file (needs the
+#					tracemalloc module, python 3.4+ or pytracemalloc)
+# The results go to Options.profile_dir: a <list>.prof file per list file (load
+# it with pstats or any tool reading cProfile dumps) or a <list>.tracemalloc
+# snapshot, and a <list>.txt report of the top Options.profile_top entries.
+# Only the main process is profiled, set parse_processes to 1 to include the
+# parsing.
+
+import os
+import pstats
+import cProfile
+from settings import Options
+
+def mk_profile(name, extension):
+	return "%s/%s.%s" % (Options.profile_dir, name, extension)
+
+
+class CProfileHook:
+	"""profiles every chunk of a file"""
+	def __init__(self, name):
+		self.name = name
+		self.profile = cProfile.Profile()
+
+	def chunk_start(self, line_number):
+		self.profile.enable()
+
+	def chunk_end(self, line_number):
+		self.profile.disable()
+
+	def finish(self):
+		self.profile.dump_stats(mk_profile(self.name, "prof"))
+		f = open(mk_profile(self.name, "txt"), "w")
+		stats = pstats.Stats(self.profile, stream = f)
+		stats.sort_stats("cumulative").print_stats(Options.profile_top)
+		stats.sort_stats("time").print_stats(Options.profile_top)
+		f.close()
+
+
+class SampleHook(CProfileHook):
+	"""profiles the chunk following every Options.profile_sample_lines lines"""
+	def __init__(self, name):
+		CProfileHook.__init__(self, name)
+		self.next_sample = 0
+		self.sampling = False
+
+	def chunk_start(self, line_number):
+		if line_number >= self.next_sample:
+			self.next_sample = (line_number//Options.profile_sample_lines + 1)*Options.profile_sample_lines
+			self.sampling = True
+			self.profile.enable()
+
+	def chunk_end(self, line_number):
+		if self.sampling:
+			self.sampling = False
+			self.profile.disable()
+
+
+class TracemallocHook:
+	"""reports the allocations made while processing a file that are still
+	alive at its end, compared to a snapshot taken at its start"""
+	def __init__(self, name):
+		self.name = name
+		self.tracemalloc = __import__("tracemalloc")
+		if not self.tracemalloc.is_tracing():
+			self.tracemalloc.start(Options.profile_frames)
+		self.start = self.tracemalloc.take_snapshot()
+
+	def chunk_start(self, line_number):
+		pass
+
+	def chunk_end(self, line_number):
+		pass
+
+	def finish(self):
+		snapshot = self.tracemalloc.take_snapshot()
+		snapshot.dump(mk_profile(self.name, "tracemalloc"))
+		current, peak = self.tracemalloc.get_traced_memory()
+		f = open(mk_profile(self.name, "txt"), "w")
+		f.write("traced memory: %d bytes, peak %d bytes\n\n" % (current, peak))
+		f.write("top %d allocations by line:\n" % (Options.profile_top))
+		for statistic in snapshot.statistics("lineno")[:Options.profile_top]:
+			f.write("%s\n" % (statistic))
+		f.write("\ntop %d allocations since the start of the file:\n" % (Options.profile_top))
+		for statistic in snapshot.compare_to(self.start, "lineno")[:Options.profile_top]:
+			f.write("%s\n" % (statistic))
+		f.close()
+
+
+hooks = {
+	"cprofile": CProfileHook,
+	"sample": SampleHook,
+	"tracemalloc": TracemallocHook
+}
+
+def available():
+	"""checks Options.profile, returns False (after printing why) if the
+	selected profiler can't be used"""
+	if Options.profile not in hooks:
+		print "profiling [warning]: unknown profiler %s, use one of %s." % (Options.profile, ", ".join(sorted(hooks)))
+		return False
+	if Options.profile == "tracemalloc":
+		try:
+			__import__("tracemalloc")
+		except ImportError:
+			print "profiling [warning]: the tracemalloc module isn't available."
+			return False
+	if not os.path.isdir(Options.profile_dir):
+		os.makedirs(Options.profile_dir)
+	return True
+
+
+def start_file(name):
+	"""returns the hook profiling the list file name, with chunk_start and
+	chunk_end called around each chunk and finish at the end of the file, or
+	None if profiling is off"""
+	if not Options.profile:
+		return None
+	return hooks[Options.profile](name)
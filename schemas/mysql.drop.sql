@@ -1,11 +1,7 @@
-DROP TABLE IF EXISTS aka_names;
-DROP TABLE IF EXISTS actors;
-DROP TABLE IF EXISTS aka_titles;
-DROP TABLE IF EXISTS acted_in;
-DROP TABLE IF EXISTS movies;
-DROP TABLE IF EXISTS series;
-DROP TABLE IF EXISTS movies_genres;
-DROP TABLE IF EXISTS genres;
-DROP TABLE IF EXISTS keywords;
-DROP TABLE IF EXISTS movies_keywords;
-
+DROP TABLE IF EXISTS `people`;
+DROP TABLE IF EXISTS `people_x_productions`;
+DROP TABLE IF EXISTS `productions`;
+DROP TABLE IF EXISTS `productions_ratings`;
+DROP TABLE IF EXISTS `productions_business`;
+DROP TABLE IF EXISTS `productions_locations`;
+DROP TABLE IF EXISTS `biographies`;
@@ -1,23 +1,40 @@
--- note this indexing will take a VERY long time (several hours)
--- acted_in
-ALTER TABLE `acted_in` ADD INDEX `ACTED_IN_IDSERIES_INDEX` (`idseries`);
-ALTER TABLE `acted_in` ADD INDEX `ACTED_IN_IDMOVIES_INDEX` (`idmovies`);
-ALTER TABLE `acted_in` ADD INDEX `ACTED_IN_IDACTORS_INDEX` (`idactors`);
+-- the indices of a table are added with a single ALTER TABLE so it is only
+-- rebuilt once, text columns are indexed on a prefix
 
--- actors
-ALTER TABLE `actors` ADD INDEX `ACTORS_LASTNAME_INDEX16` (`lname`(16));
-ALTER TABLE `actors` ADD INDEX `ACTORS_FIRSTNAME_INDEX16` (`fname`(16));
+-- people_x_productions
+ALTER TABLE `people_x_productions` ADD INDEX `PEOPLE_X_PRODUCTIONS_IDPRODUCTIONS_INDEX` (`idproductions`),
+	ADD INDEX `PEOPLE_X_PRODUCTIONS_IDPEOPLE_INDEX` (`idpeople`);
 
--- aka_names
-ALTER TABLE `aka_names` ADD INDEX `AKA_NAMES_IDACTORS_INDEX` (`idactors`);
+-- people
+ALTER TABLE `people` ADD INDEX `PEOPLE_LASTNAME_INDEX16` (`lastname`(16)),
+	ADD INDEX `PEOPLE_FIRSTNAME_INDEX16` (`firstname`(16)),
+	ADD INDEX `PEOPLE_NICKNAME_INDEX16` (`nickname`(16)),
+	ADD INDEX `PEOPLE_GENDER_INDEX` (`gender`);
 
--- aka_titles
-ALTER TABLE `aka_titles` ADD INDEX `AKA_TITLES_IDMOVIES_INDEX` (`idmovies`);
+-- productions
+ALTER TABLE `productions` ADD INDEX `PRODUCTIONS_TITLE_INDEX16` (`title`(16)),
+	ADD INDEX `PRODUCTIONS_YEAR_INDEX` (`year`),
+	ADD INDEX `PRODUCTIONS_NUMBER_INDEX` (`number`),
+	ADD INDEX `PRODUCTIONS_TYPE_INDEX` (`productions_type`),
+	ADD INDEX `PRODUCTIONS_EPISODE_TITLE_INDEX16` (`episode_title`(16)),
+	ADD INDEX `PRODUCTIONS_SEASON_INDEX` (`season`),
+	ADD INDEX `PRODUCTIONS_EPISODE_NUMBER_INDEX` (`episode_number`);
 
--- movies
-ALTER TABLE `movies` ADD INDEX `MOVIES_TITLE_INDEX16` (`title`(16));
+-- productions ratings
+ALTER TABLE `productions_ratings` ADD INDEX `PRODUCTIONS_RATINGS_IDPRODUCTIONS_INDEX` (`idproductions`);
 
--- series
-ALTER TABLE `series` ADD INDEX `SERIES_IDMOVIES_INDEX` (`idmovies`);
-ALTER TABLE `series` ADD INDEX `SERIES_NAME_INDEX16` (`name`(16));
+-- productions business
+ALTER TABLE `productions_business` ADD INDEX `PRODUCTIONS_BUSINESS_IDPRODUCTIONS_INDEX` (`idproductions`),
+	ADD INDEX `PRODUCTIONS_BUSINESS_BUSINESS_TYPE_INDEX` (`business_type`),
+	ADD INDEX `PRODUCTIONS_BUSINESS_CURRENCY_INDEX` (`currency`),
+	ADD INDEX `PRODUCTIONS_BUSINESS_REGION_INDEX16` (`region`(16));
 
+-- productions locations
+ALTER TABLE `productions_locations` ADD INDEX `PRODUCTIONS_LOCATIONS_IDPRODUCTIONS_INDEX` (`idproductions`),
+	ADD INDEX `PRODUCTIONS_LOCATIONS_LOCATION_INDEX32` (`location`(32));
+
+-- biographies
+ALTER TABLE `biographies` ADD INDEX `BIOGRAPHIES_IDPEOPLE_INDEX` (`idpeople`),
+	ADD INDEX `BIOGRAPHIES_BIOGRAPHY_TYPE_INDEX` (`biography_type`),
+	ADD INDEX `BIOGRAPHIES_BIOGRAPHY_LOCATION_INDEX32` (`biography_location`(32)),
+	ADD INDEX `BIOGRAPHIES_CAUSE_OF_DEATH_INDEX32` (`cause_of_death`(32));
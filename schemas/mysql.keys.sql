@@ -0,0 +1,15 @@
+-- keys for the use_dict schema, created after the tables are loaded when the
+-- indices are deferred. The tables with AUTO_INCREMENT ids keep their primary
+-- keys in the table definitions. title_key is indexed by its first 255
+-- characters (765 bytes in utf8, within InnoDB's 767 byte limit for COMPACT
+-- rows), it is kept unique by the dictionaries / the lookup before each insert.
+
+-- people
+ALTER TABLE `people` ADD PRIMARY KEY (`idpeople`);
+
+-- productions
+ALTER TABLE `productions` ADD PRIMARY KEY (`idproductions`),
+	ADD KEY `PRODUCTIONS_TITLE_KEY_INDEX` (`title_key`(255));
+
+-- biographies
+ALTER TABLE `biographies` ADD PRIMARY KEY (`idbiographies`);
@@ -8,143 +8,116 @@ SET time_zone = "+00:00";
 -- --------------------------------------------------------
 
 --
--- Table structure for table `acted_in`
+-- Table structure for table `people`
 --
 
-CREATE TABLE IF NOT EXISTS `acted_in` (
-  `idacted_in` int(11) NOT NULL AUTO_INCREMENT,
-  `idmovies` int(11) NOT NULL,
-  `idseries` int(11) DEFAULT NULL,
-  `idactors` int(11) NOT NULL,
-  `character` varchar(1023) NOT NULL,
-  `billing_position` int(11) DEFAULT NULL,
-  PRIMARY KEY (`idacted_in`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1 AUTO_INCREMENT=1 ;
-
--- --------------------------------------------------------
-
---
--- Table structure for table `actors`
---
-
-CREATE TABLE IF NOT EXISTS `actors` (
-  `idactors` int(11) NOT NULL AUTO_INCREMENT,
-  `lname` varchar(1023) NOT NULL,
-  `fname` varchar(1023) NOT NULL,
-  `mname` varchar(1023) DEFAULT NULL,
-  `gender` int(11) NOT NULL,
+CREATE TABLE IF NOT EXISTS `people` (
+  `idpeople` int(11) NOT NULL AUTO_INCREMENT,
+  `lastname` text DEFAULT NULL,
+  `firstname` text DEFAULT NULL,
+  `nickname` text DEFAULT NULL,
+  `gender` varchar(16) DEFAULT NULL,
   `number` int(11) DEFAULT NULL,
-  PRIMARY KEY (`idactors`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1;
-
--- --------------------------------------------------------
-
---
--- Table structure for table `aka_names`
---
-
-CREATE TABLE IF NOT EXISTS `aka_names` (
-  `idaka_names` int(11) NOT NULL AUTO_INCREMENT,
-  `idactors` int(11) NOT NULL,
-  `name` varchar(1023) NOT NULL,
-  PRIMARY KEY (`idaka_names`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1 AUTO_INCREMENT=1 ;
+  PRIMARY KEY (`idpeople`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 -- --------------------------------------------------------
 
 --
--- Table structure for table `aka_titles`
+-- Table structure for table `people_x_productions`
 --
 
-CREATE TABLE IF NOT EXISTS `aka_titles` (
-  `idaka_titles` int(11) NOT NULL AUTO_INCREMENT,
-  `idmovies` int(11) NOT NULL,
-  `title` varchar(1023) NOT NULL,
-  `location` varchar(127) DEFAULT NULL,
-  `year` year(4) DEFAULT NULL,
-  PRIMARY KEY (`idaka_titles`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1 AUTO_INCREMENT=1 ;
-
--- --------------------------------------------------------
-
---
--- Table structure for table `genres`
---
-
-CREATE TABLE IF NOT EXISTS `genres` (
-  `idgenres` int(11) NOT NULL AUTO_INCREMENT,
-  `genre` varchar(127) NOT NULL,
-  PRIMARY KEY (`idgenres`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+CREATE TABLE IF NOT EXISTS `people_x_productions` (
+  `idpeople_x_productions` int(11) NOT NULL AUTO_INCREMENT,
+  `idproductions` int(11) NOT NULL,
+  `idpeople` int(11) NOT NULL,
+  `character` text DEFAULT NULL,
+  `billing_position` int(11) DEFAULT NULL,
+  `special_information` text DEFAULT NULL,
+  PRIMARY KEY (`idpeople_x_productions`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 -- --------------------------------------------------------
 
 --
--- Table structure for table `keywords`
+-- Table structure for table `productions`
+-- (title_key has a prefix index, see mysql.keys.sql)
 --
 
-CREATE TABLE IF NOT EXISTS `keywords` (
-  `idkeywords` int(11) NOT NULL AUTO_INCREMENT,
-  `keyword` varchar(127) NOT NULL,
-  PRIMARY KEY (`idkeywords`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+CREATE TABLE IF NOT EXISTS `productions` (
+  `idproductions` int(11) NOT NULL AUTO_INCREMENT,
+  `title` text DEFAULT NULL,
+  `year` int(11) DEFAULT NULL,
+  `number` int(11) DEFAULT NULL,
+  `productions_type` varchar(127) DEFAULT NULL,
+  `episode_title` text DEFAULT NULL,
+  `season` int(11) DEFAULT NULL,
+  `episode_number` int(11) DEFAULT NULL,
+  `title_key` varchar(1023) NOT NULL,
+  PRIMARY KEY (`idproductions`),
+  KEY `PRODUCTIONS_TITLE_KEY_INDEX` (`title_key`(255))
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 -- --------------------------------------------------------
 
 --
--- Table structure for table `movies`
+-- Table structure for table `productions_ratings`
 --
 
-CREATE TABLE IF NOT EXISTS `movies` (
-  `idmovies` int(11) NOT NULL AUTO_INCREMENT,
-  `title` varchar(1023) NOT NULL,
-  `year` year(4) NOT NULL,
-  `number` int(11) DEFAULT NULL,
-  `type` int(11) DEFAULT NULL,
-  `location` varchar(127) DEFAULT NULL,
-  `language` varchar(127) DEFAULT NULL,
-  PRIMARY KEY (`idmovies`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+CREATE TABLE IF NOT EXISTS `productions_ratings` (
+  `idproductions_ratings` int(11) NOT NULL AUTO_INCREMENT,
+  `idproductions` int(11) NOT NULL,
+  `distribution` varchar(16) DEFAULT NULL,
+  `votes` int(11) DEFAULT NULL,
+  `rating` double DEFAULT NULL,
+  PRIMARY KEY (`idproductions_ratings`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 -- --------------------------------------------------------
 
 --
--- Table structure for table `movies_genres`
+-- Table structure for table `productions_business`
 --
 
-CREATE TABLE IF NOT EXISTS `movies_genres` (
-  `idmovies_genres` int(11) NOT NULL AUTO_INCREMENT,
-  `idmovies` int(11) NOT NULL,
-  `idgenres` int(11) NOT NULL,
-  `idseries` int(11) DEFAULT NULL,
-  PRIMARY KEY (`idmovies_genres`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1 AUTO_INCREMENT=1 ;
+CREATE TABLE IF NOT EXISTS `productions_business` (
+  `idproductions_business` int(11) NOT NULL AUTO_INCREMENT,
+  `idproductions` int(11) NOT NULL,
+  `business_type` varchar(127) DEFAULT NULL,
+  `amount` bigint(20) DEFAULT NULL,
+  `currency` varchar(127) DEFAULT NULL,
+  `region` text DEFAULT NULL,
+  `date` text DEFAULT NULL,
+  `screens` int(11) DEFAULT NULL,
+  PRIMARY KEY (`idproductions_business`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 -- --------------------------------------------------------
 
 --
--- Table structure for table `movies_keywords`
+-- Table structure for table `productions_locations`
 --
 
-CREATE TABLE IF NOT EXISTS `movies_keywords` (
-  `idmovies_keywords` int(11) NOT NULL AUTO_INCREMENT,
-  `idmovies` int(11) NOT NULL,
-  `idkeywords` int(11) NOT NULL,
-  `idseries` int(11) DEFAULT NULL,
-  PRIMARY KEY (`idmovies_keywords`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1 AUTO_INCREMENT=1 ;
+CREATE TABLE IF NOT EXISTS `productions_locations` (
+  `idproductions_locations` int(11) NOT NULL AUTO_INCREMENT,
+  `idproductions` int(11) NOT NULL,
+  `location_name` text DEFAULT NULL,
+  `location` text DEFAULT NULL,
+  `location_info` text DEFAULT NULL,
+  PRIMARY KEY (`idproductions_locations`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 -- --------------------------------------------------------
 
 --
--- Table structure for table `series`
+-- Table structure for table `biographies`
 --
 
-CREATE TABLE IF NOT EXISTS `series` (
-  `idseries` int(11) NOT NULL AUTO_INCREMENT,
-  `idmovies` int(11) NOT NULL,
-  `name` varchar(1023) DEFAULT NULL,
-  `season` int(11) DEFAULT NULL,
-  `number` int(11) DEFAULT NULL,
-  PRIMARY KEY (`idseries`)
-) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+CREATE TABLE IF NOT EXISTS `biographies` (
+  `idbiographies` int(11) NOT NULL AUTO_INCREMENT,
+  `idpeople` int(11) DEFAULT NULL,
+  `biography_type` varchar(127) DEFAULT NULL,
+  `biography_date` text DEFAULT NULL,
+  `biography_location` text DEFAULT NULL,
+  `cause_of_death` text DEFAULT NULL,
+  PRIMARY KEY (`idbiographies`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
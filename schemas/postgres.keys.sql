@@ -0,0 +1,50 @@
+-- primary keys for the use_dict schema, created after the tables are loaded when
+-- bulk loading so the keys do not have to be maintained on every insert
+
+--
+-- Name: people_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY people
+    ADD CONSTRAINT people_pkey PRIMARY KEY (idpeople);
+
+--
+-- Name: people_x_productions_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY people_x_productions
+    ADD CONSTRAINT people_x_productions_pkey PRIMARY KEY (idpeople_x_productions);
+
+--
+-- Name: productions_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY productions
+    ADD CONSTRAINT productions_pkey PRIMARY KEY (idproductions);
+
+--
+-- Name: productions_title_key_key; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY productions
+    ADD CONSTRAINT productions_title_key_key UNIQUE (title_key);
+
+--
+-- Name: productions_ratings_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY productions_ratings
+    ADD CONSTRAINT productions_ratings_pkey PRIMARY KEY (idproductions_ratings);
+
+--
+-- Name: productions_business_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY productions_business
+    ADD CONSTRAINT productions_business_pkey PRIMARY KEY (idproductions_business);
+
+--
+-- Name: productions_locations_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY productions_locations
+    ADD CONSTRAINT productions_locations_pkey PRIMARY KEY (idproductions_locations);
+
+--
+-- Name: biographies_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
+--
+ALTER TABLE ONLY biographies
+    ADD CONSTRAINT biographies_pkey PRIMARY KEY (idbiographies);
@@ -1,141 +1,152 @@
--- enrich people table with birthdays and deceased dates
--- 
-
--- 
--- add columns
--- 
-ALTER TABLE people ADD COLUMN born text;
-ALTER TABLE people ADD COLUMN died text;
-
--- 
--- populate born
--- 
-UPDATE people p 
-SET born = b.biography_date 
-FROM biographies b 
-WHERE p.idpeople = b.idpeople AND biography_type = 'born';
+-- enrichment of the loaded tables, run with the postprocess option (or by hand)
+--
+-- The script is split into steps, each started by a "-- step: name" line
+-- optionally followed by "after" and the steps it depends on. The statements
+-- of a step run in order on one connection, steps whose dependencies are done
+-- run in parallel on separate connections. Steps running at the same time
+-- must not alter the same table.
+--
 
--- 
--- populate died
--- 
-UPDATE people p 
-SET died = b.biography_date 
-FROM biographies b 
-WHERE p.idpeople = b.idpeople AND biography_type = 'died';
 
 
 
+-- step: people_dates
+-- enrich people table with birthdays and deceased dates
+--
 
--- enrich people_x_productions table with age at time of production
--- 
-
--- 
--- add column
--- 
-ALTER TABLE people_x_productions ADD COLUMN age_at_production integer;
+--
+-- add columns
+--
+ALTER TABLE people ADD COLUMN born text;
+ALTER TABLE people ADD COLUMN died text;
 
--- 
--- populate age_at_production
--- 
-UPDATE people_x_productions x1 
-SET age_at_production = (
-	SELECT (
-		CASE 
-		WHEN (pr.year::integer - pe.born::integer) < 0 THEN NULL 
-		WHEN (pr.year::integer - pe.born::integer) > 120 THEN NULL 
-		ELSE (pr.year::integer - pe.born::integer) 
-		END) AS age_at_production 
-	FROM people_x_productions x2 
-	LEFT JOIN people pe ON x2.idpeople = pe.idpeople 
-	LEFT JOIN productions pr ON x2.idproductions =  pr.idproductions
-	WHERE x1.idpeople_x_productions = x2.idpeople_x_productions
-);
+--
+-- populate born & died in one pass over people
+--
+UPDATE people p
+SET born = b.born, died = b.died
+FROM (
+	SELECT idpeople,
+		MAX(CASE WHEN biography_type = 'born' THEN biography_date END) born,
+		MAX(CASE WHEN biography_type = 'died' THEN biography_date END) died
+	FROM biographies
+	WHERE biography_type IN ('born', 'died')
+	GROUP BY idpeople
+) b
+WHERE p.idpeople = b.idpeople;
 
 
 
 
+-- step: productions_enrichment
 -- enrich productions table with ratings and business data
--- 
+--
 
--- 
+--
 -- add columns
--- 
+--
 ALTER TABLE productions ADD COLUMN rating double precision;
 ALTER TABLE productions ADD COLUMN votes integer;
 ALTER TABLE productions ADD COLUMN budget bigint;
 ALTER TABLE productions ADD COLUMN box_office_gross bigint;
 ALTER TABLE productions ADD COLUMN opening_weekend bigint;
 
--- 
--- populate rating & votes
--- 
-UPDATE productions p 
-SET rating = r.rating, votes = r.votes 
-FROM productions_ratings r 
-WHERE p.idproductions = r.idproductions;
-
--- 
--- populate budget
--- 
-WITH budget AS (
-	SELECT idproductions, MAX(amount) budget 
-	FROM productions_business 
-	WHERE business_type = 'budget' AND 
-		currency = 'USD' AND 
-		amount IS NOT NULL AND 
-		amount > 0 AND 
+--
+-- populate rating & votes, budget, box office gross & opening weekend box
+-- office take (the latest of each) in one pass over productions
+--
+WITH ratings AS (
+	SELECT DISTINCT ON (idproductions) idproductions, rating, votes
+	FROM productions_ratings
+	ORDER BY idproductions
+), budget AS (
+	SELECT idproductions, MAX(amount) budget
+	FROM productions_business
+	WHERE business_type = 'budget' AND
+		currency = 'USD' AND
+		amount IS NOT NULL AND
+		amount > 0 AND
 		amount < 350000000
 	GROUP BY idproductions
-) 
+), gross AS (
+	SELECT DISTINCT ON (idproductions) idproductions, amount
+	FROM productions_business
+	WHERE business_type = 'box office gross' AND
+		currency = 'USD' AND
+		LOWER(region) = 'worldwide' AND
+		amount IS NOT NULL AND
+		amount > 0 AND
+		amount <= 2800000000
+	ORDER BY idproductions, date DESC
+), opening AS (
+	SELECT DISTINCT ON (idproductions) idproductions, amount
+	FROM productions_business
+	WHERE business_type = 'opening weekend box office take' AND
+		currency = 'USD' AND
+		LOWER(region) = 'usa' AND
+		amount IS NOT NULL AND
+		amount > 0 AND
+		amount <= 250000000
+	ORDER BY idproductions, date DESC
+), enrichment AS (
+	SELECT ids.idproductions, ratings.rating, ratings.votes, budget.budget,
+		gross.amount box_office_gross, opening.amount opening_weekend
+	FROM (
+		SELECT idproductions FROM ratings
+		UNION SELECT idproductions FROM budget
+		UNION SELECT idproductions FROM gross
+		UNION SELECT idproductions FROM opening
+	) ids
+	LEFT JOIN ratings ON ratings.idproductions = ids.idproductions
+	LEFT JOIN budget ON budget.idproductions = ids.idproductions
+	LEFT JOIN gross ON gross.idproductions = ids.idproductions
+	LEFT JOIN opening ON opening.idproductions = ids.idproductions
+)
 UPDATE productions p
-SET budget = budget.budget 
-FROM budget 
-WHERE p.idproductions = budget.idproductions;
+SET rating = e.rating, votes = e.votes, budget = e.budget,
+	box_office_gross = e.box_office_gross, opening_weekend = e.opening_weekend
+FROM enrichment e
+WHERE p.idproductions = e.idproductions;
 
--- 
--- populate box office gross & opening weekend box office take
--- 
-UPDATE productions p
-SET box_office_gross = (
-	SELECT amount  
-	FROM productions_business b 
-	WHERE b.business_type = 'box office gross' AND 
-		b.currency = 'USD' AND 
-		LOWER(b.region) = 'worldwide' AND 
-		amount IS NOT NULL AND 
-		amount > 0 AND 
-		amount <= 2800000000 AND 
-		b.idproductions = p.idproductions 
-	ORDER BY b.date DESC
-	LIMIT 1
-), opening_weekend = (
-	SELECT amount  
-	FROM productions_business b 
-	WHERE b.business_type = 'opening weekend box office take' AND 
-		b.currency = 'USD' AND 
-		LOWER(b.region) = 'usa' AND 
-		amount IS NOT NULL AND 
-		amount > 0 AND 
-		amount <= 250000000 AND 
-		b.idproductions = p.idproductions 
-	ORDER BY b.date DESC
-	LIMIT 1
-);
+
+
+
+-- step: age_at_production after people_dates
+-- enrich people_x_productions table with age at time of production
+--
+
+--
+-- add column
+--
+ALTER TABLE people_x_productions ADD COLUMN age_at_production integer;
+
+--
+-- populate age_at_production with a join, ages outside of 0-120 stay NULL
+--
+UPDATE people_x_productions x
+SET age_at_production = pr.year::integer - pe.born::integer
+FROM people pe, productions pr
+WHERE x.idpeople = pe.idpeople AND
+	x.idproductions = pr.idproductions AND
+	pe.born IS NOT NULL AND
+	pr.year IS NOT NULL AND
+	pr.year::integer - pe.born::integer BETWEEN 0 AND 120;
 
 
 
 
+-- step: productions_cleanup after productions_enrichment age_at_production
 -- clean up productions table
--- 
+--
 
--- 
+--
 -- filter for production type
--- 
-DELETE 
-FROM productions 
+--
+DELETE
+FROM productions
 WHERE productions_type != 'movie/series';
 
--- 
+--
 -- remove column
--- 
+--
 ALTER TABLE productions DROP COLUMN productions_type CASCADE;
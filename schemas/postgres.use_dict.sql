@@ -46,12 +46,6 @@ ALTER SEQUENCE people_idpeople_seq OWNED BY people.idpeople;
 --
 ALTER TABLE people ALTER COLUMN idpeople SET DEFAULT nextval('people_idpeople_seq'::regclass);
 
---
--- Name: people_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY people
-    ADD CONSTRAINT people_pkey PRIMARY KEY (idpeople);
-
 
 
 
@@ -87,12 +81,6 @@ ALTER SEQUENCE people_x_productions_idpeople_x_productions_seq OWNED BY people_x
 --
 ALTER TABLE people_x_productions ALTER COLUMN idpeople_x_productions SET DEFAULT nextval('people_x_productions_idpeople_x_productions_seq'::regclass);
 
---
--- Name: people_x_productions_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY people_x_productions
-    ADD CONSTRAINT people_x_productions_pkey PRIMARY KEY (idpeople_x_productions);
-
 	
 
 
@@ -107,7 +95,8 @@ CREATE TABLE productions (
     productions_type text, 
 	episode_title text,
     season integer,
-    episode_number integer
+    episode_number integer,
+    title_key text NOT NULL
 );
 
 --
@@ -130,12 +119,6 @@ ALTER SEQUENCE productions_idproductions_seq OWNED BY productions.idproductions;
 --
 ALTER TABLE productions ALTER COLUMN idproductions SET DEFAULT nextval('productions_idproductions_seq'::regclass);
 
---
--- Name: productions_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY productions
-    ADD CONSTRAINT productions_pkey PRIMARY KEY (idproductions);
-
 	
 
 
@@ -170,12 +153,6 @@ ALTER SEQUENCE productions_ratings_idproductions_ratings_seq OWNED BY production
 --
 ALTER TABLE productions_ratings ALTER COLUMN idproductions_ratings SET DEFAULT nextval('productions_ratings_idproductions_ratings_seq'::regclass);
 
---
--- Name: productions_ratings_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY productions_ratings
-    ADD CONSTRAINT productions_ratings_pkey PRIMARY KEY (idproductions_ratings);
-
 
 
 
@@ -213,12 +190,6 @@ ALTER SEQUENCE productions_business_idproductions_business_seq OWNED BY producti
 --
 ALTER TABLE productions_business ALTER COLUMN idproductions_business SET DEFAULT nextval('productions_business_idproductions_business_seq'::regclass);
 
---
--- Name: productions_business_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY productions_business
-    ADD CONSTRAINT productions_business_pkey PRIMARY KEY (idproductions_business);
-
 	
 
 
@@ -253,12 +224,6 @@ ALTER SEQUENCE productions_locations_idproductions_locations_seq OWNED BY produc
 --
 ALTER TABLE productions_locations ALTER COLUMN idproductions_locations SET DEFAULT nextval('productions_locations_idproductions_locations_seq'::regclass);
 
---
--- Name: productions_locations_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY productions_locations
-    ADD CONSTRAINT productions_locations_pkey PRIMARY KEY (idproductions_locations);
-
 	
 
 
@@ -294,12 +259,6 @@ ALTER SEQUENCE biographies_idbiographies_seq OWNED BY biographies.idbiographies;
 --
 ALTER TABLE biographies ALTER COLUMN idbiographies SET DEFAULT nextval('biographies_idbiographies_seq'::regclass);
 
---
--- Name: biographies_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres; Tablespace: 
---
-ALTER TABLE ONLY biographies
-    ADD CONSTRAINT biographies_pkey PRIMARY KEY (idbiographies);
-
 
 
 
@@ -1,20 +1,37 @@
--- acted_in
-CREATE INDEX IF NOT EXISTS "ACTED_IN_IDSERIES_INDEX" ON acted_in (idseries);
-CREATE INDEX IF NOT EXISTS "ACTED_IN_IDMOVIES_INDEX" ON acted_in (idmovies);
-CREATE INDEX IF NOT EXISTS "ACTED_IN_IDACTORS_INDEX" ON acted_in (idactors);
+-- people_x_productions
+CREATE INDEX IF NOT EXISTS "PEOPLE_X_PRODUCTIONS_IDPRODUCTIONS_INDEX" ON people_x_productions (idproductions);
+CREATE INDEX IF NOT EXISTS "PEOPLE_X_PRODUCTIONS_IDPEOPLE_INDEX" ON people_x_productions (idpeople);
 
--- actors
--- not sure how to do partial text searching
+-- people
+CREATE INDEX IF NOT EXISTS "PEOPLE_LASTNAME_INDEX" ON people (lastname);
+CREATE INDEX IF NOT EXISTS "PEOPLE_FIRSTNAME_INDEX" ON people (firstname);
+CREATE INDEX IF NOT EXISTS "PEOPLE_NICKNAME_INDEX" ON people (nickname);
+CREATE INDEX IF NOT EXISTS "PEOPLE_GENDER_INDEX" ON people (gender);
 
--- aka_names
-CREATE INDEX IF NOT EXISTS "AKA_NAMES_IDACTORS_INDEX" on aka_names (idactors);
+-- productions
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_TITLE_INDEX" ON productions (title);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_YEAR_INDEX" ON productions (year);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_NUMBER_INDEX" ON productions (number);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_TYPE_INDEX" ON productions (productions_type);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_EPISODE_TITLE_INDEX" ON productions (episode_title);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_SEASON_INDEX" ON productions (season);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_EPISODE_NUMBER_INDEX" ON productions (episode_number);
 
--- aka_titles
-CREATE INDEX IF NOT EXISTS "AKA_TITLES_IDMOVIES_INDEX" on aka_titles (idmovies);
+-- productions ratings
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_RATINGS_IDPRODUCTIONS_INDEX" ON productions_ratings (idproductions);
 
--- movies
--- same comment with actors about partial searching
+-- productions business
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_BUSINESS_IDPRODUCTIONS_INDEX" ON productions_business (idproductions);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_BUSINESS_BUSINESS_TYPE_INDEX" ON productions_business (business_type);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_BUSINESS_CURRENCY_INDEX" ON productions_business (currency);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_BUSINESS_REGION_INDEX" ON productions_business (region);
 
--- series
-CREATE INDEX IF NOT EXISTS "SERIES_IDMOVIES_INDEX" on series (idmovies);
+-- productions locations
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_LOCATIONS_IDPRODUCTIONS_INDEX" ON productions_locations (idproductions);
+CREATE INDEX IF NOT EXISTS "PRODUCTIONS_LOCATIONS_LOCATION_INDEX" ON productions_locations (location);
 
+-- biographies
+CREATE INDEX IF NOT EXISTS "BIOGRAPHIES_IDPEOPLE_INDEX" ON biographies (idpeople);
+CREATE INDEX IF NOT EXISTS "BIOGRAPHIES_BIOGRAPHY_TYPE_INDEX" ON biographies (biography_type);
+CREATE INDEX IF NOT EXISTS "BIOGRAPHIES_BIOGRAPHY_LOCATION_INDEX" ON biographies (biography_location);
+CREATE INDEX IF NOT EXISTS "BIOGRAPHIES_CAUSE_OF_DEATH_INDEX" ON biographies (cause_of_death);
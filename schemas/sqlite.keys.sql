@@ -0,0 +1,4 @@
+-- keys for the use_dict schema, created after the tables are loaded when the
+-- indices are deferred. The primary keys of sqlite tables are the rowids so
+-- only the unique keys are here.
+CREATE UNIQUE INDEX IF NOT EXISTS "PRODUCTIONS_TITLE_KEY_INDEX" ON productions (title_key);
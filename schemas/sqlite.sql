@@ -1,64 +1,58 @@
-create table actors (
-	idactors integer primary key autoincrement,
-	lname text,
-	fname text, 
-	mname text, 
-	number integer,
-	gender integer);
-
-create table movies (
-	idmovies integer primary key autoincrement,
-	title text,
-	year integer, 
-	type integer, 
-	number integer,
-	location text,
-	language text);
-
-create table series (
-	idseries integer primary key autoincrement,
-	idmovies integer,
-	name text,
-	season integer,
+create table people (
+	idpeople integer primary key autoincrement,
+	lastname text,
+	firstname text,
+	nickname text,
+	gender text,
 	number integer);
 
-create table aka_names (
-	idaka_names integer primary key autoincrement,
-	idactors integer,
-	name text);
+create table people_x_productions (
+	idpeople_x_productions integer primary key autoincrement,
+	idproductions integer not null,
+	idpeople integer not null,
+	character text,
+	billing_position integer,
+	special_information text);
 
-create table aka_titles (
-	idaka_titles integer primary key autoincrement,
-	idmovies integer,
+create table productions (
+	idproductions integer primary key autoincrement,
 	title text,
+	year integer,
+	number integer,
+	productions_type text,
+	episode_title text,
+	season integer,
+	episode_number integer,
+	title_key text not null unique);
+
+create table productions_ratings (
+	idproductions_ratings integer primary key autoincrement,
+	idproductions integer not null,
+	distribution text,
+	votes integer,
+	rating real);
+
+create table productions_business (
+	idproductions_business integer primary key autoincrement,
+	idproductions integer not null,
+	business_type text,
+	amount integer,
+	currency text,
+	region text,
+	date text,
+	screens integer);
+
+create table productions_locations (
+	idproductions_locations integer primary key autoincrement,
+	idproductions integer not null,
+	location_name text,
 	location text,
-	year integer);
-
-create table acted_in (
-	idacted_in integer primary key autoincrement,
-	idmovies integer,
-	idseries integer,
-	idactors integer,
-	character text,
-	billing_position integer);
-
-create table genres (
-	idgenres integer primary key autoincrement,
-	genre text);
-
-create table movies_genres (
-	idmovies_genres integer primary key autoincrement,
-	idmovies integer,
-	idseries integer,
-	idgenres integer);
-
-create table keywords (
-	idkeywords integer primary key autoincrement,
-	keyword text);
-
-create table movies_keywords (
-	idmovies_keywords integer primary key autoincrement,
-	idmovies integer,
-	idseries integer,
-	idkeywords integer);
-
+	location_info text);
+
+create table biographies (
+	idbiographies integer primary key autoincrement,
+	idpeople integer,
+	biography_type text,
+	biography_date text,
+	biography_location text,
+	cause_of_death text);
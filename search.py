@@ -0,0 +1,264 @@
+# Standalone search indices for autocomplete and partial matches on the titles
+# of the productions and the names of the people, built from the dictionaries
+# at the end of a load (see build_search_indices in tosql.py) and queried
+# without the database:
+#
+#	index = search.SearchIndex("search/productions.search")
+#	index.prefix("star wa")		# entries with a word starting with "star wa"
+#	index.contains("ar war")	# entries containing "ar war"
+#
+# Texts are normalized to lower case words of letters and digits separated by
+# single spaces. Both queries return (text, id) pairs.
+#
+# File layout (little endian):
+#	header		magic, format version and the number of entries, prefixes,
+#				trigrams and postings
+#	entries		one (string offset, normalized length, text length, id) record
+#				per entry, sorted by normalized text
+#	prefixes	one (entry, word start) record per word of each entry, sorted by
+#				the normalized text from the start of the word on
+#	trigrams	one (trigram, postings offset, postings count) record per
+#				trigram of the normalized texts, sorted by trigram
+#	postings	the entries containing each trigram, in entry order
+#	strings		the normalized text followed by the text of each entry
+# Lookups binary search the records in place, so nothing has to be
+# deserialized. The entries and prefixes are sorted on disk with sorted runs
+# of RUN_LINES lines that are merged at the end, only the postings are kept in
+# memory while building.
+
+import re
+import sys
+import mmap
+import array
+import heapq
+import struct
+import tempfile
+import collections
+
+MAGIC 		= "IMDBSRCH"
+VERSION 	= 1
+HEADER 		= struct.Struct("<8sIQQQQ")	# magic, version, entries, prefixes, trigrams, postings
+ENTRY 		= struct.Struct("<QIII")	# string offset, normalized length, text length, id
+PREFIX 		= struct.Struct("<II")		# entry, word start
+TRIGRAM 	= struct.Struct("<3sxQI")	# trigram, postings offset, postings count
+POSTING 	= struct.Struct("<I")		# entry
+RUN_LINES 	= 1000000
+
+non_word = re.compile(r"[^a-z0-9\x80-\xff]+")
+
+def normalize(text):
+	"""lower case words of letters and digits separated by single spaces"""
+	return non_word.sub(" ", text.lower()).strip()
+
+
+def word_starts(normalized):
+	"""the offsets of the words of a normalized text"""
+	return [0] + [i + 1 for i, c in enumerate(normalized) if c == " "]
+
+
+def trigrams(normalized):
+	"""the distinct trigrams of a normalized text"""
+	return set([normalized[i:i+3] for i in xrange(len(normalized) - 2)])
+
+
+class ExternalSort:
+	"""sorts lines (without newlines) in runs of RUN_LINES lines written to
+	temporary files, merging the runs when iterated"""
+	def __init__(self):
+		self.lines = []
+		self.runs = []
+
+	def add(self, line):
+		self.lines.append(line)
+		if len(self.lines) >= RUN_LINES:
+			self.flush()
+
+	def flush(self):
+		if not self.lines:
+			return
+		self.lines.sort()
+		run = tempfile.TemporaryFile()
+		for line in self.lines:
+			run.write(line + "\n")
+		run.seek(0)
+		self.runs.append(run)
+		self.lines = []
+
+	def __iter__(self):
+		self.flush()
+		for line in heapq.merge(*self.runs):
+			yield line[:-1]
+		for run in self.runs:
+			run.close()
+		self.runs = []
+
+
+def write_index(path, items):
+	"""writes the search index of the (text, id) items to path, texts that
+	normalize to nothing are left out"""
+	entries = ExternalSort()
+	for text, id in items:
+		normalized = normalize(text)
+		if normalized:
+			entries.add("%s\0%s\0%d" % (normalized, text.replace("\n", " "), id))
+	entry_records = tempfile.TemporaryFile()
+	strings = tempfile.TemporaryFile()
+	prefixes = ExternalSort()
+	postings = collections.defaultdict(lambda: array.array("I"))
+	count = 0
+	offset = 0
+	for line in entries:
+		normalized, text, id = line.split("\0")
+		entry_records.write(ENTRY.pack(offset, len(normalized), len(text), int(id)))
+		strings.write(normalized)
+		strings.write(text)
+		offset += len(normalized) + len(text)
+		for start in word_starts(normalized):
+			prefixes.add("%s\0%d\0%d" % (normalized[start:], count, start))
+		for trigram in trigrams(normalized):
+			postings[trigram].append(count)
+		count += 1
+	prefix_records = tempfile.TemporaryFile()
+	prefix_count = 0
+	for line in prefixes:
+		suffix, entry, start = line.split("\0")
+		prefix_records.write(PREFIX.pack(int(entry), int(start)))
+		prefix_count += 1
+	f = open(path, "wb")
+	f.write(HEADER.pack(MAGIC, VERSION, count, prefix_count, len(postings), sum([len(p) for p in postings.itervalues()])))
+	for block in (entry_records, prefix_records):
+		block.seek(0)
+		copy_block(block, f)
+		block.close()
+	posting_offset = 0
+	for trigram in sorted(postings):
+		f.write(TRIGRAM.pack(trigram, posting_offset, len(postings[trigram])))
+		posting_offset += len(postings[trigram])
+	for trigram in sorted(postings):
+		postings[trigram].tofile(f)
+	strings.seek(0)
+	copy_block(strings, f)
+	strings.close()
+	f.close()
+	return count
+
+
+def copy_block(source, destination):
+	block = source.read(1048576)
+	while block:
+		destination.write(block)
+		block = source.read(1048576)
+
+
+class SearchIndex:
+	"""read only view of a search index file"""
+	def __init__(self, path):
+		self.file = open(path, "rb")
+		self.mm = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+		magic, version, self.count, self.prefix_count, self.trigram_count, self.posting_count = HEADER.unpack_from(self.mm, 0)
+		if magic != MAGIC or version != VERSION:
+			self.close()
+			raise ValueError("%s: unsupported search index format" % (path))
+		self.entries_offset = HEADER.size
+		self.prefixes_offset = self.entries_offset + self.count*ENTRY.size
+		self.trigrams_offset = self.prefixes_offset + self.prefix_count*PREFIX.size
+		self.postings_offset = self.trigrams_offset + self.trigram_count*TRIGRAM.size
+		self.strings_offset = self.postings_offset + self.posting_count*POSTING.size
+
+	def close(self):
+		self.mm.close()
+		self.file.close()
+
+	def __len__(self):
+		return self.count
+
+	def normalized(self, entry):
+		offset, length, text_length, id = ENTRY.unpack_from(self.mm, self.entries_offset + entry*ENTRY.size)
+		start = self.strings_offset + offset
+		return self.mm[start:start+length]
+
+	def entry(self, entry):
+		"""the (text, id) of an entry"""
+		offset, length, text_length, id = ENTRY.unpack_from(self.mm, self.entries_offset + entry*ENTRY.size)
+		start = self.strings_offset + offset + length
+		return self.mm[start:start+text_length], id
+
+	def _prefix(self, i, length):
+		"""the first length characters of the text of prefix record i"""
+		entry, start = PREFIX.unpack_from(self.mm, self.prefixes_offset + i*PREFIX.size)
+		return self.normalized(entry)[start:start+length], entry
+
+	def prefix(self, query, limit = 10):
+		"""the entries with a word starting with query (and the words after it
+		following on), in the order of the matched text"""
+		query = normalize(query)
+		if not query:
+			return []
+		lo = 0
+		hi = self.prefix_count
+		while lo < hi:
+			mid = (lo + hi)//2
+			if self._prefix(mid, len(query))[0] < query:
+				lo = mid + 1
+			else:
+				hi = mid
+		results = []
+		seen = set()
+		while lo < self.prefix_count and len(results) < limit:
+			text, entry = self._prefix(lo, len(query))
+			if text != query:
+				break
+			if entry not in seen:
+				seen.add(entry)
+				results.append(self.entry(entry))
+			lo += 1
+		return results
+
+	def _trigram(self, trigram):
+		"""the (postings offset, count) of trigram"""
+		lo = 0
+		hi = self.trigram_count
+		while lo < hi:
+			mid = (lo + hi)//2
+			mid_trigram, offset, count = TRIGRAM.unpack_from(self.mm, self.trigrams_offset + mid*TRIGRAM.size)
+			if mid_trigram < trigram:
+				lo = mid + 1
+			elif mid_trigram > trigram:
+				hi = mid
+			else:
+				return offset, count
+		return 0, 0
+
+	def postings(self, trigram):
+		"""the entries containing trigram"""
+		offset, count = self._trigram(trigram)
+		start = self.postings_offset + offset*POSTING.size
+		return array.array("I", self.mm[start:start+count*POSTING.size])
+
+	def contains(self, query, limit = 10):
+		"""the entries containing query anywhere, in entry order. Queries of
+		less than three characters are looked up as prefixes."""
+		query = normalize(query)
+		if len(query) < 3:
+			return self.prefix(query, limit)
+		# the entries of the rarest trigram are checked in order, which stops
+		# as soon as there are enough results instead of intersecting all lists
+		rarest = min(trigrams(query), key = lambda trigram: self._trigram(trigram)[1])
+		results = []
+		for entry in self.postings(rarest):
+			if query in self.normalized(entry):
+				results.append(self.entry(entry))
+				if len(results) >= limit:
+					break
+		return results
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 3:
+		print "usage: python search.py <index file> <query> [prefix|contains]"
+		sys.exit(1)
+	index = SearchIndex(sys.argv[1])
+	search = index.contains if sys.argv[3:4] == ["contains"] else index.prefix
+	for text, id in search(sys.argv[2], 20):
+		print "%d\t%s" % (id, text)
+	index.close()
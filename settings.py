@@ -2,12 +2,13 @@ class DatabaseTypes:
 	SQLITE		= 0
 	MYSQL 		= 1
 	POSTGRES	= 2
+	ARROW		= 3		# parquet/arrow files (see export.py), needs pyarrow
 
 # script configuration
 # database options
 class Database:
 	type 		= DatabaseTypes.POSTGRES# database type, one of DatabaseTypes
-	database 	= "imdb_data"			# database name
+	database 	= "imdb_data"			# database name (file name for sqlite, directory for arrow)
 	encoding 	= "utf-8"				# used to pre-encode the queries to drop any invalid characters
 										# for the database type
 	host 		= "127.0.0.1"			# database host
@@ -24,12 +25,69 @@ class Options:
 	progress_count 		= 10000			# show progress every _n_ lines
 	commit_count 		= 10000			# commit every _n_ lines, -1 means only on completion
 										# database will commit on completion of each file regardless
+	insert_batch_size	= 5000			# buffer up to _n_ rows per table before writing them with
+										# executemany, buffers are also written on every commit
+	commit_batches		= 0				# commit after every _n_ insert batches (checked after each parsed
+										# chunk) instead of every commit_count lines, 0 disables it
+	write_queue			= 0				# (requires use_dict) write the insert batches from a background
+										# thread, queueing up to _n_ of them, 0 writes in the main thread
+	dedup_rows			= False			# drop rows of the fact/link tables that are identical to one
+										# already in the same insert batch
 	show_time 			= True			# show the total time taken to complete
+	stats_file			= None			# write counters and timings for each list file to this file, as
+										# CSV if it ends with .csv and as JSON otherwise
+	stats_interval		= 0				# print the rows/sec and an ETA every _n_ seconds, 0 disables it
+	profile				= None			# profile the processing of each list file, one of "cprofile",
+										# "sample" (every profile_sample_lines lines) or "tracemalloc"
+	profile_dir			= "profiles"	# directory to write the profiles and reports to
+	profile_top			= 30			# number of entries in the profile reports
+	profile_sample_lines= 100000		# profile one chunk every _n_ lines when sampling
+	profile_frames		= 1				# stack frames recorded per allocation by tracemalloc
+	parse_processes		= 1				# number of worker processes parsing the list files, 1 parses
+										# in the main process. Ids are always assigned by the main process
+	parse_chunk_lines	= 10000			# lines (rounded up to whole records) handed to a parser at a time
+	parse_chunk_bytes	= 4194304		# bytes (rounded up to whole records) of a list file each worker
+										# reads at a time when parse_processes > 1
 	use_native			= False			# use native parsing operations instead of regex
 	use_dict			= True			# use a dictionary to generate and cache db id's in program
+	use_copy			= False			# postgres only (requires use_dict), spool the rows of each table to a
+										# temporary file loaded with one COPY FROM STDIN per list file and
+										# create the primary keys and indices afterwards
+	mysql_load_data		= False			# mysql only (requires use_dict), spool the rows of each table to a
+										# temporary tab separated file loaded with one LOAD DATA LOCAL INFILE
+										# per list file, without unique and foreign key checks, creating the
+										# keys and indices afterwards
+	defer_indexes		= False			# (requires use_dict) load into tables without keys, then create the
+										# keys and the indices of the index schema after the load (no need
+										# to run index.py)
+	index_connections	= 4				# postgres only, build the deferred keys/indices over _n_ connections
+	sqlite_bulk			= False			# sqlite only, load with the bulk load profile: no journal or
+										# syncing, a large cache, one transaction per list file and
+										# ANALYZE at the end (best with defer_indexes)
+	sqlite_vacuum		= False			# sqlite only, VACUUM the database at the end of a bulk load
+	postprocess			= False			# enrich the tables after the load with the postprocess schema
+										# (postgres only), see schemas/postgres.postprocess.sql
+	postprocess_connections = 3			# run the independent postprocess steps over _n_ connections
+	checkpoint			= False			# (requires use_dict) record the position in the list file and the
+										# ids assigned at every commit in the cache dir, so that a failed
+										# import can be resumed
+	resume				= False			# continue the import from the last checkpoint (keeps the database)
+	rejects_file		= None			# write the titles/names the ratings, business, locations and
+										# biographies lists refer to that can't be found to this file
 	use_cache			= False			# cache the dictionaries to the disk, must be enabled if you 
 										# you want to convert only some files and you want to use dict
+	snapshot			= False			# save a snapshot of each processed list file to the cache dir so
+										# a later import can be incremental
+	incremental			= False			# only apply the changes since the last snapshot to the existing
+										# database, requires use_dict, use_cache and a previous import
+										# with snapshots (new snapshots are saved along the way)
+	search_index		= False			# (requires use_dict) build the prefix/trigram search indices of the
+										# productions and people (see search.py) after the load
+	search_dir			= "search"		# directory to write the search indices to
 	schema_dir			= "schemas"		# directory to load the db schemas from
 	cache_dir			= "cache"		# directory to load the dictionary caches from if applicable
 	proc_all			= True			# overrides the individual process directives
+	export_format		= "parquet"		# arrow only, "parquet" or "arrow" (arrow IPC files)
+	export_row_group_rows = 500000		# arrow only, rows per row group/record batch
+	export_compression	= "snappy"		# arrow only, parquet compression codec
 
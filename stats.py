@@ -0,0 +1,138 @@
+# Import statistics
+# Counters and timings for each list file processed (a phase), written to
+# Options.stats_file and optionally reported live every Options.stats_interval
+# seconds. Counting happens in the main process: parse matches and misses are
+# counted from the records the parsers return, so they are right whether the
+# parsing runs in worker processes or not. The background writer thread counts
+# too, so the counters are only updated holding the lock.
+#
+# Counters:
+#	lines			data lines read
+#	records			records parsed, i.e. lines/line groups the regexes matched
+#	parse_misses	lines the regexes didn't match
+#	dict_hits		ids found in the in program dictionaries
+#	dict_misses		ids not in the dictionaries (assigned or looked up in the db)
+#	statements		sql statements executed (an executemany counts once)
+#	rows_inserted	rows written to the database
+#	commits			number of commits
+#	duplicates		fact/link table rows dropped by dedup_rows
+# Timings (seconds):
+#	seconds			total time of the phase
+#	parse_seconds	time spent waiting for parsed chunks
+#	write_seconds	time spent in the write_* functions (id resolution and inserts)
+#	sql_seconds		time spent executing sql while writing and committing
+#	commit_seconds	time spent committing, commit_max_seconds is the longest commit
+
+import os
+import csv
+import json
+import time
+import threading
+import collections
+from settings import Options
+
+phases = []
+counters = collections.Counter()
+lock = threading.Lock()
+phase = {"name": None, "start": 0.0, "size": 0, "reported": 0.0}
+
+def start_phase(name, size = 0):
+	"""starts counting for a new phase, size is the number of bytes to process
+	(used for the ETA of the live report)"""
+	with lock:
+		counters.clear()
+	phase["name"] = name
+	phase["start"] = phase["reported"] = time.time()
+	phase["size"] = size
+
+
+def count(key, n = 1):
+	with lock:
+		counters[key] += n
+
+
+def add_time(key, seconds):
+	with lock:
+		counters[key] += seconds
+
+
+def timed_commit(commit):
+	"""times a commit, keeping track of the longest one"""
+	start = time.time()
+	commit()
+	seconds = time.time() - start
+	with lock:
+		counters["commits"] += 1
+		counters["commit_seconds"] += seconds
+		counters["sql_seconds"] += seconds
+		counters["commit_max_seconds"] = max(counters["commit_max_seconds"], seconds)
+
+
+def format_duration(seconds):
+	seconds = int(seconds)
+	return "%d:%02d:%02d" % (seconds//3600, seconds//60%60, seconds%60)
+
+
+def progress(position):
+	"""prints the live report if Options.stats_interval seconds have passed
+	since the last one, position is the number of bytes processed so far"""
+	if not Options.stats_interval:
+		return
+	now = time.time()
+	if now - phase["reported"] < Options.stats_interval:
+		return
+	phase["reported"] = now
+	elapsed = now - phase["start"]
+	report = "stats [status]: %s: %d lines, %.0f lines/sec, %.0f rows/sec" % (phase["name"],
+		counters["lines"], counters["lines"]/elapsed, counters["rows_inserted"]/elapsed)
+	if phase["size"] and position:
+		report += ", %.0f%%, eta %s" % (100.0*position/phase["size"],
+			format_duration(elapsed*(phase["size"] - position)/position))
+	print report
+
+
+def end_phase():
+	"""finishes the current phase and writes all phases so far to
+	Options.stats_file"""
+	result = collections.OrderedDict([("phase", phase["name"]), ("seconds", time.time() - phase["start"])])
+	with lock:
+		for key in sorted(counters):
+			result[key] = counters[key]
+	phases.append(result)
+	if Options.stats_file:
+		write_stats(Options.stats_file)
+	return result
+
+
+def totals():
+	"""the counters added up over all phases"""
+	total = collections.OrderedDict([("phase", "total")])
+	for result in phases:
+		for key, value in result.iteritems():
+			if key == "phase":
+				continue
+			elif key == "commit_max_seconds":
+				total[key] = max(total.get(key, 0), value)
+			else:
+				total[key] = total.get(key, 0) + value
+	return total
+
+
+def write_stats(path):
+	"""writes the phases and their totals to path, as CSV (one row per phase)
+	if it ends with .csv and as JSON otherwise"""
+	rows = phases + [totals()]
+	f = open(path + ".new", "wb")
+	if path.endswith(".csv"):
+		keys = []
+		for row in rows:
+			keys += [key for key in row if key not in keys]
+		writer = csv.DictWriter(f, keys, restval = 0)
+		writer.writeheader()
+		writer.writerows(rows)
+	else:
+		json.dump({"phases": phases, "total": rows[-1]}, f, indent = 1)
+	f.close()
+	if os.path.exists(path):
+		os.remove(path)
+	os.rename(path + ".new", path)
@@ -0,0 +1,83 @@
+# Checks reading compressed list files through the decompression programs,
+# run with python test_compressed.py (or pytest)
+
+import os
+import shutil
+import tempfile
+import subprocess
+from distutils.spawn import find_executable
+import parsers
+
+def write_list(path, trailer_lines):
+	"""writes a small actors list followed by trailer_lines lines of junk after
+	the footer, as the real lists have"""
+	format = parsers.list_formats["actors"]
+	f = open(path, "wb")
+	f.write("THE ACTORS LIST\n===============\n\nName\t\t\tTitles \n" + format.header)
+	for i in xrange(100):
+		f.write("Doe%d, John\tMovie %d (2000)  [Himself]  <1>\n\t\t\tShow %d (2001)\n\n" % (i, i, i))
+	f.write(format.footer)
+	for i in xrange(trailer_lines):
+		f.write("SUBMITTING UPDATES %08d, everything after the footer is skipped\n" % (i))
+	f.close()
+
+
+def read_records(path):
+	format = parsers.list_formats["actors"]
+	f = parsers.open_list(path)
+	parsers.skip_header(f, format.header, format.skip_lines)
+	records = []
+	for lines in parsers.read_chunks(f, format.footer, format.separator):
+		records.extend(format.parser(lines))
+	f.close()
+	return records
+
+
+def test_large_trailer():
+	"""stopping at the footer of a compressed list with megabytes of data after
+	it closes the pipe while the decompression program is still writing, which
+	must not be taken for a failed decompression"""
+	work_dir = tempfile.mkdtemp()
+	try:
+		path = os.path.join(work_dir, "actors.list")
+		write_list(path, 200000)
+		expected = read_records(path)
+		assert len(expected) == 300
+		for extension, programs, module in parsers.decompressors:
+			program = ([find_executable(program) for program in programs if find_executable(program)] or [None])[0]
+			if not program:
+				continue
+			compressed = open(path + extension, "wb")
+			subprocess.check_call([program, "-c", path], stdout = compressed)
+			compressed.close()
+			assert read_records(path + extension) == expected, extension
+	finally:
+		shutil.rmtree(work_dir)
+
+
+def test_corrupt_file():
+	"""a decompression program failing on its input is still reported"""
+	work_dir = tempfile.mkdtemp()
+	try:
+		path = os.path.join(work_dir, "actors.list")
+		write_list(path, 0)
+		if not find_executable("gzip"):
+			return
+		compressed = open(path + ".gz", "wb")
+		subprocess.check_call(["gzip", "-c", path], stdout = compressed)
+		compressed.close()
+		data = open(path + ".gz", "rb").read()
+		open(path + ".gz", "wb").write(data[:len(data)//2])
+		try:
+			read_records(path + ".gz")
+		except IOError:
+			return
+		assert False, "a truncated file was read without an error"
+	finally:
+		shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+	test_large_trailer()
+	test_corrupt_file()
+	print "test_compressed [status]: ok."
@@ -2,13 +2,26 @@
 # Ameer Ayoub <ameer.ayoub@gmail.com>
 # @todo make the whole thing database agnostic so we can switch
 
-import re
 from types import StringType
 import os
-from numerals import rntoi
 import time
-import cPickle as pickle
+import idcache
+import stats
+import profiling
+import search
+import struct
+import hashlib
+import tempfile
+import json
+import cStringIO
+import collections
+import multiprocessing
+import threading
+import Queue
+import mmap
 from settings import Database, Options, DatabaseTypes
+from parsers import ActorsGender, list_formats, use_native, skip_header, read_chunks, find_data_range, \
+	split_data_range, parse_lines, parse_range, decompressors, is_compressed, open_list
 
 def get_schema_prefix(type_d):
 	if type_d == DatabaseTypes.SQLITE:
@@ -22,196 +35,36 @@ def get_schema_prefix(type_d):
 
 dicts = {}
 counts = {}
+insert_buffers = {}
+appended = {}
+# the rows spooled per table for the COPY/LOAD DATA bulk loads (see spool_rows)
+spools = {}
+dict_sources = {}
+# the keys that couldn't be resolved per table, and those reported to the
+# rejects file per (list, table) (see resolve)
+rejected = {}
+rejects = {"file": None}
+# the background writer (see start_writer) and the number of insert batches
+# written since the last commit
+pipeline = {"queue": None, "thread": None, "errors": [], "batches": 0}
+# the dictionary entries assigned since the last checkpoint and the checkpoint
+# being resumed from (see write_checkpoint)
+checkpoint = {"assigned": {}, "resume": None}
+# the list files in the order they are processed
+list_order = ["actresses", "actors", "movies", "ratings", "business", "locations", "biographies"]
 
 def mk(file_name):
-	"""utility function that turns a list name into a openable file name/path"""
-	return Options.list_dir+'/'+file_name+Options.file_extension
+	"""utility function that turns a list name into a openable file name/path,
+	a compressed list file (e.g. actors.list.gz) is used if the list file
+	itself isn't there"""
+	path = Options.list_dir+'/'+file_name+Options.file_extension
+	if not os.path.exists(path):
+		for extension, programs, module in decompressors:
+			if os.path.exists(path + extension):
+				return path + extension
+	return path
 
 	
-# Precompile the regexes
-class ParseRegexes:
-	# raw regex strings for reference e.g. regex buddy copy paste
-	raw_acted_in = """"?([^"]*?)"?\s\(((\?{4}|\d+)/?(\w+)?).*?\)(\s*\((T?VG?)\))?
-		(\s*\((\w*)\))?(\s*\{([^\(]*?)(\s*\(\#(\d+)\.(\d+)\))?\})?
-		(\s*\[(.*)\])?(\s*\<(\d+)\>)?"""
-	raw_name = """('.+')?\s*(([^,']*),)?\s*([^\(]+)(\((\w+)\))?"""
-	raw_movies = """"?([^"]*?)"?\s\(((\?{4}|\d+)/?(\w+)?).*?\)(\s*\((T?VG?)\))?
-		(\s*\{([^\(]*?)(\s*\(\#(\d+)\.(\d+)\))?\})?.*"""
-	raw_aka_name = """\s*\(aka ([^\)]+)\)"""
-	raw_aka_title_title = """\"?([^\"]*)\"?\s*\((\d{4}|\?{4})(/([\w]*))?\)\s*(\((T?VG?)\))?"""
-	raw_title_genre = """\"?([^\"]*)\"?\s*\((\d{4}|\?{4})(/([\w]*))?\)\s*(\((T?VG?)\))?\s*(\w+)"""
-	raw_aka_title_alias = """\(aka\s\"?([^\"]*)\"?\s\((\d{4}|\?{4})\)\s*\)\s*(\(([^\)]*)\))?\s*(\(([^\)]*)\))?"""
-	# compiled regex patterns for use
-	name = re.compile("""
-		('.+')?\s*				# nickname (optional, group 1)
-		(([^,']*),)?\s*			# last name (optional, group 3)
-		([^\(]+)				# first name (required, group 4)
-		(\((\w+)\))?			# actor number (optional, group 6)
-		""", re.VERBOSE)
-	acted_in = re.compile("""
-		"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
-		\(((\?{4}|\d+)/?(\w+)?).*?\)
-								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
-								# (optional, group 4) if multiple in same year
-		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
-		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
-								# episode information: episode title (optional, group 8), within that
-								# broadcast date (optional, group 9) or
-								# episode series (optional, group 10) and episode number 
-								# (optional, group 11) information. The episode series and number are
-								# optional within the optional group.
-		(\s*(\{{2}SUSPENDED\}{2}))?
-								# additional information if suspended (optional, group 13)
-		(\s*\(([\w ,.-]*)\))?	# information regarding part (optional, group 15), e.g. 'voice', 'likeness'
-		(\s*\[(.*)\])?			# character name (optional, group 17) (surrounded by '[' and ']')
-		(\s*\<(\d+)\>)?			# billing position (optional, group 19) (surrounded by '<' and '>')
-		""", re.VERBOSE)
-	movies = re.compile("""
-		"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
-		\(((\?{4}|\d+)/?(\w+)?).*?\)
-								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
-								# (optional, group 4) if multiple in same year
-		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
-		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
-								# episode information: episode title (optional, group 8), within that
-								# broadcast date (optional, group 9) or
-								# episode series (optional, group 10) and episode number 
-								# (optional, group 11) information. The episode series and number are
-								# optional within the optional group.
-		(\s*(\{{2}SUSPENDED\}{2}))?
-								# additional information if suspended (optional, group 13)
-		(\s*((\?{4})|(\d{4})(\-\d{4})?))
-								# publish year/year range (optional, group 15)
-		""", re.VERBOSE)
-	aka_name = re.compile("""
-		\s*\(aka ([^\)]+)\)		# alias name (required, group 1)
-		""", re.VERBOSE)
-	aka_title_alias = re.compile("""
-		\(aka\s\"?([^\"]*)\"?\s	# title (required, group 1)
-		\((\d{4}|\?{4})\)\s*\)\s*
-								# year (required, group 2)
-		(\(([^\)]*)\))?\s*		# location (required, group 4)
-		(\(([^\)]*)\))?			# reason (optional, group 6)
-		""", re.VERBOSE)
-	aka_title_title = re.compile("""
-		\"?([^\"]*)\"?\s*		# title (required, group 1)
-		\((\d{4}|\?{4})			# year (required, group 2)
-		(/([\w]*))?\)\s*		# number (optional, group 4)
-		(\((T?VG?)\))?			# code (optional, group 6)
-		""", re.VERBOSE)
-	title_genre = re.compile("""
-		\"?([^\"]*)\"?\s*		# title (required, group 1)
-		\((\d{4}|\?{4})			# year (required, group 2)
-		(/([\w]*))?\)\s*		# number (optional, group 4)
-		(\((T?VG?)\))?\s*		# code (optional, group 6)
-		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
-								# episode information: episode title (optional, group 8), within that
-								# broadcast date (optional, group 9) or
-								# episode series (optional, group 10) and episode number 
-								# (optional, group 11) information. The episode series and number are
-								# optional within the optional group.
-		(\s*(\{{2}SUSPENDED\}{2}))?
-								# additional information if suspended (optional, group 13)
-		(\s*([-.'$\w]+))			# genre (required, group 15)
-		""", re.VERBOSE)
-	title_rating = re.compile("""
-		\s*						# leading whitespace
-		([\d.*]*)\s*			# rating distribution  incl. *-mark for new movies (required, group 1)
-		(\d*)\s*				# number of votes cast (required, group 2)
-		([\d.]*)\s*				# average rating (required, group 3)
-		"?([^"]*?)"?\s			# title (required, group 4) surrounded by quotations if it's a tv show
-		\(((\?{4}|\d+)/?(\w+)?).*?\)
-								# the year (required, group 6), followed by `/ROMAN_NUMERAL` 
-								# (optional, group 7) if multiple in same year
-		(\s*\((T?VG?)\))?		# special code (optional, group 9), one of 'TV', 'V', 'VG'
-		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
-								# episode information: episode title (optional, group 11), within that
-								# broadcast date (optional, group 12) or
-								# episode series (optional, group 13) and episode number 
-								# (optional, group 14) information. The episode series and number are
-								# optional within the optional group.
-		""", re.VERBOSE)
-	title_business = re.compile("""
-		MV:\s+"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
-		\(((\?{4}|\d+)/?(\w+)?).*?\)
-								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
-								# (optional, group 4) if multiple in same year
-		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
-		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
-								# episode information: episode title (optional, group 8), within that
-								# broadcast date (optional, group 9) or
-								# episode series (optional, group 10) and episode number 
-								# (optional, group 11) information. The episode series and number are
-								# optional within the optional group.
-		""", re.VERBOSE)
-	data_business = re.compile("""
-		(BT|GR|OW):				# prefix denoting business data category (required, group 1)
-		(\s([A-Z]{3}))			# currency (required, group 3)
-		(\s([0-9,]*))			# amount (required, group 5)
-		(\s(\(([\w\s-]*)\)))?	# region (required for OW else optional, group 8)
-		(\s(\(([\w\s]*)\)))?	# date (required for OW else optional, group 11)
-		(\s(\(([\w\s,]*) screens\)))?
-								# number of screens (optional, group 14)
-		""", re.VERBOSE)
-	location = re.compile("""
-		"?([^"]*?)"?\s			# title (required, group 1) surrounded by quotations if it's a tv show
-		\(((\?{4}|\d+)/?(\w+)?).*?\)
-								# the year (required, group 3), followed by `/ROMAN_NUMERAL` 
-								# (optional, group 4) if multiple in same year
-		(\s*\((T?VG?)\))?		# special code (optional, group 6), one of 'TV', 'V', 'VG'
-		(\s*\{{1}([^{]*?)(\s*\(\#(\d+)\.(\d+)\)|\([\d-]*\))?\}{1})?
-								# episode information: episode title (optional, group 8), within that
-								# broadcast date (optional, group 9) or
-								# episode series (optional, group 10) and episode number 
-								# (optional, group 11) information. The episode series and number are
-								# optional within the optional group.
-		(\s*(\{{2}SUSPENDED\}{2}))?
-								# additional information if suspended (optional, group 13)
-		(\s*(((.*?) - )?		# location name (optional, group 17)
-		([^()]*)				# location (required, group 18)
-		(\((.*?)\))?))			# location or scene description (optional, group 20)
-		""", re.VERBOSE)
-	bio_name = re.compile("""
-		NM:\s+('.+')?\s*		# nickname (optional, group 1)
-		(([^,']*),)?\s*			# last name (optional, group 3)
-		([^\(]+)				# first name (required, group 4)
-		(\((\w+)\))?			# actor number (optional, group 6)
-		""", re.VERBOSE)
-	bio_data = re.compile("""
-		(DB|DD):				# prefix denoting bio data category (required, group 1)
-		(((\s[\d]{1,2})?(\s(\w+))?(\s([\d]{4}))))
-								# date as "dd MMMM yyyy" or "yyyy" (required, group 8)
-		,([^()]+)?				# location (optional, group 7)
-		(\((.*?)\))?			# cause of death (optional, group 9)
-		""", re.VERBOSE)
-	
-
-
-# Enum Classes
-# Naming conventions if `Table``Column`
-class ActorsGender:
-	MALE 	= "male"
-	FEMALE 	= "female"
-
-class MoviesType:
-	TV 	= "TV production"
-	V 	= "video production"
-	VG 	= "video game"
-	M 	= "movie/series"		# there's no code for this, this is default Movie
-	@staticmethod
-	def from_str(type_string):
-		"""converts a type string to a type enum"""
-		global type_enum
-		if type_string == "V":
-			return MoviesType.V
-		elif type_string == "VG":
-			return MoviesType.VG
-		elif type_string == "TV":
-			return MoviesType.TV
-		else:
-			return MoviesType.M
-
-
 def mk_schema(name, use_dict = False):
 	if use_dict:
 		return "%s/%s.use_dict.sql" % (Options.schema_dir, name)
@@ -227,9 +80,20 @@ def mk_drop(name):
 	return "%s/%s.drop.sql" % (Options.schema_dir, name)
 
 
-def executescript(c, of, debug = False):
-	"""Executes a SQL script by processing out comments and executing each sql
-	command individually."""
+def mk_keys(name):
+	return "%s/%s.keys.sql" % (Options.schema_dir, name)
+
+
+def mk_index(name):
+	return "%s/%s.index.sql" % (Options.schema_dir, name)
+
+
+def mk_postprocess(name):
+	return "%s/%s.postprocess.sql" % (Options.schema_dir, name)
+
+
+def read_script(of):
+	"""reads the sql commands of a script, without the comments"""
 	query_list = []
 	query_list_candidates = of.readlines()
 	for line in query_list_candidates:
@@ -240,11 +104,21 @@ def executescript(c, of, debug = False):
 			if line.strip() != "":
 				query_list.append(line.strip())
 	query_list = " ".join(query_list).split(';')
-	for query in query_list:
-		if query.strip():
-			if debug:
-				print "executescript [status] : executing query:\n\t%s\n" % (query.strip())
-			c.execute(query.strip())
+	return [query.strip() for query in query_list if query.strip()]
+
+
+def executescript(c, of, debug = False, timed = False):
+	"""Executes a SQL script by processing out comments and executing each sql
+	command individually. If timed is set the time taken by each command is
+	reported."""
+	for query in read_script(of):
+		if debug:
+			print "executescript [status] : executing query:\n\t%s\n" % (query)
+		if timed:
+			query_start = time.time()
+		c.execute(query)
+		if timed:
+			print "executescript [status] : %.2f seconds : %s" % (time.time() - query_start, query)
 
 
 def create_tables(c, drop_all = False):
@@ -274,12 +148,205 @@ def create_tables(c, drop_all = False):
 		dbf = open(mk_schema("sqlite", Options.use_dict))
 		query_list = dbf.read()
 		c.executescript(query_list)
+		if Options.use_dict and not Options.defer_indexes:
+			c.executescript(open(mk_keys("sqlite")).read())
 	elif Database.type == DatabaseTypes.MYSQL:
 		dbf = open(mk_schema("mysql", Options.use_dict))
 		executescript(c, dbf)
+		if Options.use_dict and not Options.defer_indexes:
+			executescript(c, open(mk_keys("mysql")))
 	elif Database.type == DatabaseTypes.POSTGRES:
 		dbf = open(mk_schema("postgres", Options.use_dict))
 		executescript(c, dbf)
+		if Options.use_dict and not Options.defer_indexes:
+			# when deferred the keys are created by create_keys after the load
+			executescript(c, open(mk_keys("postgres")))
+
+
+# settings for sqlite while it builds the deferred indices: sort in memory
+# with a large page cache and helper threads (sqlite 3.8.7+)
+sqlite_index_pragmas = [
+	"PRAGMA temp_store = MEMORY",
+	"PRAGMA cache_size = -524288",
+	"PRAGMA threads = 4"
+]
+
+# settings for the sqlite_bulk load profile: no rollback journal or syncing
+# (a failed load is started over anyway), a large page cache and memory mapped
+# reads. They only apply to the loading connection, nothing is stored in the
+# database file.
+sqlite_bulk_pragmas = [
+	"PRAGMA journal_mode = OFF",
+	"PRAGMA synchronous = OFF",
+	"PRAGMA locking_mode = EXCLUSIVE",
+	"PRAGMA temp_store = MEMORY",
+	"PRAGMA cache_size = -1048576",
+	"PRAGMA mmap_size = 4294967296"
+]
+
+# session settings of the mysql_load_data connection: no unique or foreign key
+# checks while loading, they are turned back on before the keys are created
+mysql_load_settings = [
+	"SET unique_checks = 0",
+	"SET foreign_key_checks = 0"
+]
+
+mysql_index_settings = [
+	"SET unique_checks = 1",
+	"SET foreign_key_checks = 1"
+]
+
+def run_timed(c, query, caller = "create_keys"):
+	"""executes a query, reporting the time it took"""
+	start = time.time()
+	c.execute(query)
+	seconds = time.time() - start
+	stats.count("statements")
+	print "%s [status]: %.2f seconds : %s" % (caller, seconds, query)
+
+
+def run_parallel(queries, connections):
+	"""executes the queries over up to connections new database connections at
+	once, each query committed on its own"""
+	pending = Queue.Queue()
+	for query in queries:
+		pending.put(query)
+	errors = []
+	def work():
+		conn, c = connect_db(Database)
+		try:
+			while not errors:
+				try:
+					query = pending.get_nowait()
+				except Queue.Empty:
+					break
+				run_timed(c, query)
+				conn.commit()
+		except Exception, e:
+			errors.append(e)
+		finally:
+			c.close()
+			conn.close()
+	threads = [threading.Thread(target = work) for i in xrange(min(connections, len(queries)))]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	if errors:
+		raise errors[0]
+
+
+def create_keys(conn, c):
+	"""Creates the primary keys and indices deferred by the load (see
+	Options.defer_indexes), reporting the time taken by each. Postgres builds
+	them in parallel over Options.index_connections connections, the keys
+	before the indices."""
+	prefix = get_schema_prefix(Database.type)
+	stats.start_phase("keys and indices")
+	commit(conn, c)
+	keys = read_script(open(mk_keys(prefix))) if os.path.exists(mk_keys(prefix)) else []
+	indices = read_script(open(mk_index(prefix)))
+	if Database.type == DatabaseTypes.POSTGRES and Options.index_connections > 1:
+		print "create_keys [status]: creating primary keys."
+		run_parallel(keys, Options.index_connections)
+		print "create_keys [status]: creating indices."
+		run_parallel(indices, Options.index_connections)
+	else:
+		if Database.type == DatabaseTypes.SQLITE:
+			for pragma in sqlite_index_pragmas:
+				c.execute(pragma)
+		elif Options.mysql_load_data:
+			for setting in mysql_index_settings:
+				c.execute(setting)
+		print "create_keys [status]: creating primary keys."
+		for query in keys:
+			run_timed(c, query)
+		print "create_keys [status]: creating indices."
+		for query in indices:
+			run_timed(c, query)
+		commit(conn, c)
+	stats.end_phase()
+
+
+def finish_sqlite(conn, c):
+	"""updates the query planner statistics of a sqlite database after the
+	load and, with Options.sqlite_vacuum, compacts it"""
+	stats.start_phase("analyze")
+	commit(conn, c)
+	run_timed(c, "ANALYZE", "finish_sqlite")
+	commit(conn, c)
+	if Options.sqlite_vacuum:
+		run_timed(c, "VACUUM", "finish_sqlite")
+	stats.end_phase()
+
+
+def read_steps(of):
+	"""reads a script split into steps by "-- step: name [after name ...]"
+	lines, returning (name, dependencies, queries) per step"""
+	steps = []
+	lines = []
+	for line in of.readlines() + ["-- step: end of script\n"]:
+		if line.startswith("-- step:"):
+			if steps:
+				steps[-1] += (read_script(cStringIO.StringIO("".join(lines))),)
+			words = line[len("-- step:"):].split()
+			steps.append((words[0], words[2:] if words[1:2] == ["after"] else []))
+			lines = []
+		else:
+			lines.append(line)
+	return steps[:-1]
+
+
+def run_steps(steps, connections, caller):
+	"""runs the (name, dependencies, queries) steps on up to connections new
+	database connections at once, each step as soon as the steps it depends on
+	are done. The queries of a step run in order and are committed on their
+	own."""
+	done = dict([(name, threading.Event()) for name, dependencies, queries in steps])
+	slots = threading.Semaphore(connections)
+	errors = []
+	def work(name, dependencies, queries):
+		try:
+			for dependency in dependencies:
+				done[dependency].wait()
+			if errors:
+				return
+			slots.acquire()
+			try:
+				step_start = time.time()
+				conn, c = connect_db(Database)
+				try:
+					for query in queries:
+						run_timed(c, query, caller)
+						conn.commit()
+				finally:
+					c.close()
+					conn.close()
+				print "%s [status]: %.2f seconds : step %s done." % (caller, time.time() - step_start, name)
+			finally:
+				slots.release()
+		except Exception, e:
+			errors.append(e)
+		finally:
+			done[name].set()
+	threads = [threading.Thread(target = work, args = step) for step in steps]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	if errors:
+		raise errors[0]
+
+
+def postprocess(conn, c):
+	"""Runs the enrichment steps of the postprocess script after the load, in
+	parallel over Options.postprocess_connections connections"""
+	stats.start_phase("postprocess")
+	commit(conn, c)
+	steps = read_steps(open(mk_postprocess(get_schema_prefix(Database.type))))
+	run_steps(steps, Options.postprocess_connections, "postprocess")
+	stats.end_phase()
+
 
 def quote_escape(string):
 	if string:
@@ -293,6 +360,9 @@ def build_select_query(name, param_dict):
 		print "build_select_query: error param dictionary is empty!"
 		return None
 	select_query = "SELECT id" + name + " FROM " + name + " WHERE "
+	if name in key_fields:
+		# only the identifying columns are needed
+		param_dict = dict([(k, param_dict[k]) for k in key_fields[name]])
 	for k,v in param_dict.items():
 		if v:
 			if isinstance(v, StringType):
@@ -309,59 +379,322 @@ def build_select_query(name, param_dict):
 	return select_query
 
 
-def build_insert_query(name, param_dict, quote_keys = False):
+def get_placeholder(type_d):
+	"""returns the DB-API parameter marker used by the driver for type_d"""
+	if type_d == DatabaseTypes.SQLITE:
+		return "?"
+	else:
+		return "%s"
+
+
+def build_insert_template(name, keys, quote_keys = False):
+	"""builds a parameterized insert statement for the given (ordered) column
+	names, suitable for both execute and executemany"""
 	global Database
-	if not param_dict:
-		print "build_insert_query: [error] param dictionary is empty!"
+	if not keys:
+		print "build_insert_template: [error] key list is empty!"
 		return None
-	insert_query_front = "INSERT INTO " + name + " ("
-	insert_query_end = ") VALUES ("
-	for k,v in param_dict.items():
-		if v:
-			if str(v) != "          " and str(v) != "-1":
-				if quote_keys:
-					insert_query_front += "`" + k + "`, "
-				else:
-					insert_query_front += k + ", "
-				if isinstance(v, StringType):
-					# surround with quotes if string
-					insert_query_end += "\'" + quote_escape(v) + "\', "
-				else:
-					insert_query_end +=  str(v)  + ", "
-	# remove the trailing comma/spaces with [:-2]
-	insert_query = insert_query_front[:-2] + insert_query_end[:-2] + ")"
-	if Database.encoding:
-		# preconvert to db encoding to avoid db errors, especially from postgres / utf-8
-		insert_query = insert_query.decode(Database.encoding, errors='ignore')
+	if quote_keys:
+		columns = ["`" + k + "`" for k in keys]
+	else:
+		columns = list(keys)
+	placeholders = [get_placeholder(Database.type)] * len(keys)
+	insert_query = "INSERT INTO " + name + " (" + ", ".join(columns) + ") VALUES (" + ", ".join(placeholders) + ")"
 	if Options.query_debug:
 		print insert_query
 	return insert_query
 
+
+def insert_param(v):
+	"""converts a value to the parameter bound for it, empty values and the
+	"          "/-1 placeholders become NULL"""
+	global Database
+	if v and str(v) != "          " and str(v) != "-1":
+		if Database.encoding and isinstance(v, StringType):
+			# preconvert to db encoding to avoid db errors, especially from postgres / utf-8
+			return v.decode(Database.encoding, 'ignore')
+		return v
+	return None
+
+
+def buffer_insert(connection_cursor, name, param_dict):
+	"""queues a row for insertion into name, the rows of each table are written
+	with executemany once Options.insert_batch_size of them are queued or when
+	flush_inserts is called (i.e. on each commit)"""
+	global insert_buffers
+	keys = tuple(sorted(param_dict.keys()))
+	if name in insert_buffers and insert_buffers[name][0] != keys:
+		flush_inserts(connection_cursor, name)
+	if name not in insert_buffers:
+		insert_buffers[name] = (keys, [])
+	rows = insert_buffers[name][1]
+	rows.append(tuple([insert_param(param_dict[k]) for k in keys]))
+	if len(rows) >= Options.insert_batch_size:
+		flush_inserts(connection_cursor, name)
+
+
+def copy_escape(v):
+	"""formats a parameter value as a field of postgres' COPY text format"""
+	global Database
+	if v is None:
+		return "\\N"
+	if isinstance(v, unicode):
+		v = v.encode(Database.encoding or "utf-8")
+	else:
+		v = str(v)
+	return v.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def spool_rows(connection_cursor, name, keys, rows):
+	"""appends rows to the spool file of name in COPY's text format (which
+	LOAD DATA reads by default too), the spool is loaded in one statement by
+	load_spools (i.e. on each commit)"""
+	global spools
+	if name in spools and spools[name][0] != keys:
+		load_spool(connection_cursor, name)
+	if name not in spools:
+		spools[name] = [keys, tempfile.NamedTemporaryFile(prefix = name + ".", suffix = ".tsv", delete = False), 0]
+	spool = spools[name]
+	for row in rows:
+		spool[1].write("\t".join([copy_escape(v) for v in row]))
+		spool[1].write("\n")
+	spool[2] += len(rows)
+
+
+def load_spool(connection_cursor, name):
+	"""loads the rows spooled for name and removes its spool file"""
+	global spools
+	keys, f, count = spools.pop(name)
+	start = time.time()
+	try:
+		if Options.use_copy:
+			f.seek(0)
+			copy_rows(connection_cursor, name, keys, f)
+		else:
+			f.close()
+			load_data_rows(connection_cursor, name, keys, f.name)
+	finally:
+		f.close()
+		os.remove(f.name)
+	stats.add_time("sql_seconds", time.time() - start)
+	stats.count("statements")
+	stats.count("rows_inserted", count)
+
+
+def load_spools(connection_cursor):
+	"""loads the rows spooled for all tables"""
+	for name in spools.keys():
+		load_spool(connection_cursor, name)
+
+
+def copy_rows(connection_cursor, name, keys, f):
+	"""streams the rows of the file f into name with COPY FROM STDIN (psycopg2's
+	copy_expert)"""
+	copy_query = "COPY " + name + " (" + ", ".join(["\"" + k + "\"" for k in keys]) + ") FROM STDIN"
+	if Options.query_debug:
+		print copy_query
+	connection_cursor.copy_expert(copy_query, f)
+
+
+def load_data_rows(connection_cursor, name, keys, path):
+	"""loads the rows of the tab separated file path into name with MySQL's
+	LOAD DATA LOCAL INFILE"""
+	global Database
+	load_query = "LOAD DATA LOCAL INFILE '" + quote_escape(path) + "' INTO TABLE `" + name + \
+		"` CHARACTER SET " + (Database.encoding or "utf-8").replace("-", "").lower() + \
+		" (" + ", ".join(["`" + k + "`" for k in keys]) + ")"
+	if Options.query_debug:
+		print load_query
+	connection_cursor.execute(load_query)
+
+
+def write_batch(connection_cursor, name, keys, rows):
+	"""writes rows (tuples of the values of the keys columns) into name"""
+	global Database
+	if Options.use_copy or Options.mysql_load_data:
+		spool_rows(connection_cursor, name, keys, rows)
+		return
+	start = time.time()
+	if Database.type == DatabaseTypes.ARROW:
+		connection_cursor.write_rows(name, keys, rows)
+	else:
+		connection_cursor.executemany(build_insert_template(name, keys, quote_keys = Database.type == DatabaseTypes.MYSQL), rows)
+	stats.add_time("sql_seconds", time.time() - start)
+	stats.count("statements")
+	stats.count("rows_inserted", len(rows))
+
+
+def flush_inserts(connection_cursor, name = None):
+	"""writes out the buffered rows of the named table, or all tables if no
+	name is given (handing them to the background writer if it is running)"""
+	global insert_buffers, pipeline
+	if name:
+		names = [name] if name in insert_buffers else []
+	else:
+		names = insert_buffers.keys()
+	for n in names:
+		keys, rows = insert_buffers.pop(n)
+		appended.pop(n, None)
+		if not rows:
+			continue
+		pipeline["batches"] += 1
+		if pipeline["queue"]:
+			queue_write(write_batch, connection_cursor, n, keys, rows)
+		else:
+			write_batch(connection_cursor, n, keys, rows)
+
+
+def commit(conn, connection_cursor, wait = True):
+	"""flushes all buffered inserts, loads the rows spooled for the bulk loads
+	and commits the current transaction. With the background writer running
+	the commit is queued after the inserts and, unless wait is off, waited
+	for."""
+	flush_inserts(connection_cursor)
+	pipeline["batches"] = 0
+	if pipeline["queue"]:
+		if Options.use_copy or Options.mysql_load_data:
+			queue_write(load_spools, connection_cursor)
+		queue_write(stats.timed_commit, conn.commit)
+		if wait:
+			drain_writer()
+	else:
+		if Options.use_copy or Options.mysql_load_data:
+			load_spools(connection_cursor)
+		stats.timed_commit(conn.commit)
+
+
+#
+# Background writer
+# With Options.write_queue the insert batches, the statements that have to run
+# in order with them (the deletes of incremental imports) and the commits are
+# executed by a thread of their own, so the database works while the next
+# chunks are parsed and buffered. The queue holds at most Options.write_queue
+# items, the parsing waits while it is full. The main thread must not use the
+# cursor itself while the writer runs, which is why it requires use_dict.
+#
+
+def writer_loop():
+	"""runs the (function, arguments) items of the queue until it gets None,
+	after an error the remaining items are skipped"""
+	queue = pipeline["queue"]
+	while True:
+		item = queue.get()
+		try:
+			if item is None:
+				break
+			if not pipeline["errors"]:
+				item[0](*item[1])
+		except Exception, e:
+			pipeline["errors"].append(e)
+		finally:
+			queue.task_done()
+
+
+def check_writer():
+	"""raises the error the background writer stopped on, if any"""
+	if pipeline["errors"]:
+		raise pipeline["errors"][0]
+
+
+def start_writer():
+	"""starts the background writer thread"""
+	pipeline["queue"] = Queue.Queue(Options.write_queue)
+	del pipeline["errors"][:]
+	pipeline["thread"] = threading.Thread(target = writer_loop)
+	pipeline["thread"].daemon = True
+	pipeline["thread"].start()
+
+
+def queue_write(function, *args):
+	"""queues function(*args) for the background writer, waiting while the
+	queue is full"""
+	check_writer()
+	pipeline["queue"].put((function, args))
+
+
+def drain_writer():
+	"""waits until the background writer has run everything queued so far"""
+	pipeline["queue"].join()
+	check_writer()
+
+
+def stop_writer():
+	"""waits for the queued writes and stops the background writer"""
+	if not pipeline["queue"]:
+		return
+	try:
+		drain_writer()
+	finally:
+		pipeline["queue"].put(None)
+		pipeline["thread"].join()
+		pipeline["queue"] = pipeline["thread"] = None
+
+
+def execute(connection_cursor, query, params = ()):
+	"""executes a statement that doesn't return rows, in order with the
+	inserts already handed to the background writer"""
+	stats.count("statements")
+	if pipeline["queue"]:
+		queue_write(connection_cursor.execute, query, params)
+	else:
+		connection_cursor.execute(query, params)
+
 	
 def unpack_dict(param_dict):
 	return tuple(sorted(param_dict.items()))
+
+
+# columns identifying the rows of the tables with large dictionaries, in the
+# order their values are packed into the dictionary keys
+key_fields = {
+	"people": ("lastname", "firstname", "nickname", "gender", "number"),
+	# the canonical title (see parsers.title_key), which is unique
+	"productions": ("title_key",)
+}
+
+
+def pack_key(name, param_dict):
+	"""returns the dictionary key of a row. For the tables in key_fields this is
+	a single tab separated string of the identifying values (None packed as
+	\\N), which takes a fraction of the memory of the unpack_dict tuples of
+	(column, value) pairs. Other tables fall back to unpack_dict."""
+	if name in key_fields:
+		return "\t".join(["\\N" if param_dict[k] is None else str(param_dict[k]) for k in key_fields[name]])
+	return unpack_dict(param_dict)
+
+
+def select_row(connection_cursor, name, select_query):
+	"""writes out the buffered rows of name and runs select_query, returning
+	the first row"""
+	flush_inserts(connection_cursor, name)
+	start = time.time()
+	connection_cursor.execute(select_query)
+	row = connection_cursor.fetchone()
+	stats.add_time("sql_seconds", time.time() - start)
+	stats.count("statements")
+	return row
 	
 
 def select_or_insert(connection_cursor, name, param_dict, skip_lookup = False, supress_output = False):
 	"""selects or inserts a row into the database, returning the appropriate id field
 	note this makes the assumption the id name is id`table_name` which is the case for the schema
-	defined above"""
+	defined above. Rows whose id does not have to be read back from the database
+	are buffered and written in batches, see buffer_insert."""
 	global dicts, counts
 	row = None
-	unpacked = unpack_dict(param_dict)
-	select_query = build_select_query(name, param_dict)
+	unpacked = pack_key(name, param_dict) if Options.use_dict and name in dicts else None
 	if not skip_lookup:
 		if Options.use_dict:
 			if name in dicts:
 				if unpacked in dicts[name]:
+					stats.count("dict_hits")
 					return dicts[name][unpacked]
+				stats.count("dict_misses")
 			else:
 				# run query anyway because not in dicts
-				connection_cursor.execute(select_query)
-				row = connection_cursor.fetchone()
+				row = select_row(connection_cursor, name, build_select_query(name, param_dict))
 		else:
-			connection_cursor.execute(select_query)
-			row = connection_cursor.fetchone()
+			row = select_row(connection_cursor, name, build_select_query(name, param_dict))
 	if row:
 		return row[0]
 	else:
@@ -370,75 +703,190 @@ def select_or_insert(connection_cursor, name, param_dict, skip_lookup = False, s
 		if Options.use_dict:
 			if name in dicts:
 				dicts[name][unpacked] = counts[name]
+				if Options.checkpoint:
+					checkpoint["assigned"].setdefault(name, []).append((unpacked, counts[name]))
 				param_dict["id"+name] = counts[name]
 				rv = counts[name]
 				counts[name] += 1
-		connection_cursor.execute(build_insert_query(name, param_dict))
-		if Options.use_dict and not supress_output:
-			if name in dicts:
-				return rv
-		if not supress_output:
-			connection_cursor.execute(select_query)
-			row = connection_cursor.fetchone()
-			if row:
-				return row[0]
-			else:
-				print "select_or_insert: [error] could not insert : ", param_dict
+				buffer_insert(connection_cursor, name, param_dict)
+				if not supress_output:
+					return rv
 				return None
+		if supress_output:
+			buffer_insert(connection_cursor, name, param_dict)
+			return None
+		# the id is generated by the database so it has to be read back
+		flush_inserts(connection_cursor, name)
+		keys = tuple(sorted(param_dict.keys()))
+		start = time.time()
+		connection_cursor.execute(build_insert_template(name, keys, quote_keys = Database.type == DatabaseTypes.MYSQL), tuple([insert_param(param_dict[k]) for k in keys]))
+		stats.add_time("sql_seconds", time.time() - start)
+		stats.count("statements")
+		stats.count("rows_inserted")
+		row = select_row(connection_cursor, name, build_select_query(name, param_dict))
+		if row:
+			return row[0]
 		else:
+			print "select_or_insert: [error] could not insert : ", param_dict
 			return None
 
 
+def append_row(connection_cursor, name, param_dict):
+	"""appends a row to a fact or link table (people_x_productions, the
+	productions_* tables and biographies), these are never looked up so the
+	row is just buffered, without building a select or a dictionary key.
+	With use_dict the ids of tables in counts are assigned in program. With
+	Options.dedup_rows rows identical to one already in the current insert
+	batch of the table are dropped."""
+	global counts, appended
+	if Options.dedup_rows:
+		row = unpack_dict(param_dict)
+		batch = appended.setdefault(name, set())
+		if row in batch:
+			stats.count("duplicates")
+			return
+		batch.add(row)
+	if Options.use_dict and name in counts:
+		param_dict["id"+name] = counts[name]
+		counts[name] += 1
+	buffer_insert(connection_cursor, name, param_dict)
+
+
 def select(connection_cursor, name, param_dict, dict_only = False):
 	"""selects a row from the database, returning the appropriate id field
 	note this makes the assumption the id name is id`table_name` which is the 
 	case for the schema defined above"""
 	global dicts
-	unpacked = unpack_dict(param_dict)
+	unpacked = pack_key(name, param_dict)
 	if Options.use_dict:
 		if name in dicts:
 			if unpacked in dicts[name]:
+				stats.count("dict_hits")
 				return dicts[name][unpacked]
-			elif dict_only:
+			stats.count("dict_misses")
+			if dict_only:
 				return None
-	select_query = build_select_query(name, param_dict)
-	connection_cursor.execute(select_query)
-	row = connection_cursor.fetchone()
+	row = select_row(connection_cursor, name, build_select_query(name, param_dict))
 	if row:
 		return row[0]
 	else:
 		return None
 
+
+
+def resolve(connection_cursor, name, param_dict, state, report = True):
+	"""looks up the id of a row a dependent list (ratings, business, locations,
+	biographies) refers to, returning None if it doesn't exist. With use_dict
+	the dictionary of name is authoritative and the database is never queried.
+	Keys that couldn't be resolved are remembered so they are only looked up
+	once, and reported to the rejects file (unless report is off) once per
+	list."""
+	global dicts, rejected
+	key = pack_key(name, param_dict)
+	misses = rejected.setdefault(name, set())
+	if key in misses:
+		stats.count("dict_misses")
+		id = None
+	elif Options.use_dict and name in dicts:
+		id = dicts[name].get(key)
+		stats.count("dict_hits" if id is not None else "dict_misses")
+	else:
+		id = select(connection_cursor, name, param_dict)
+	if id is None:
+		misses.add(key)
+		reported = rejected.setdefault((state["list"], name), set())
+		if report and key not in reported:
+			reported.add(key)
+			reject(state, name, param_dict)
+	return id
+
+
+def reject(state, name, param_dict):
+	"""writes a row that couldn't be resolved to Options.rejects_file as the
+	list name, the table and the values identifying the row, tab separated"""
+	stats.count("rejects")
+	if not Options.rejects_file:
+		return
+	if not rejects["file"]:
+		rejects["file"] = open(Options.rejects_file, "a" if Options.resume else "w")
+	fields = [k for k in key_fields.get(name, sorted(param_dict)) if k != "gender"]
+	values = ["\\N" if param_dict[k] is None else str(param_dict[k]) for k in fields]
+	rejects["file"].write("\t".join([state["list"], name] + values) + "\n")
+
 		
 def save_dict(name):
-	global dicts, counts
-	pfd_path = mk_cache("%s.dict"%(name))
-	pfc_path = mk_cache("%s.count"%(name))
-	pfd = pickle.Pickler(open(pfd_path, "wb"))
-	pfd.fast = True
-	pfd.dump(dicts[name])	
-	pfc = pickle.Pickler(open(pfc_path, "wb"))
-	pfc.fast = True
-	pfc.dump(counts[name])
+	"""writes the dictionary of name to its cache file (see idcache.py), along
+	with the checksums of the list files it was read from"""
+	global dicts, counts, dict_sources
+	path = mk_cache("%s.ids"%(name))
+	d = dicts[name]
+	if isinstance(d, idcache.IdCache):
+		items = d.iteritems()
+	else:
+		items = ((key, d[key]) for key in sorted(d))
+	idcache.write_id_cache(path + ".new", items, len(d), counts[name], dict_sources.get(name, []))
+	if isinstance(d, idcache.IdCache):
+		d.close()
+	if os.path.exists(path):
+		os.remove(path)
+	os.rename(path + ".new", path)
+	if isinstance(d, idcache.IdCache):
+		dicts[name] = idcache.IdCache(path, verify = False)
 	
 
-def load_dict(name, force_load = False):
-	global dicts, counts
+def load_dict(name, force_load = False, verify = True):
+	"""memory maps the cached dictionary of name, the cache is not used if it
+	is from another format version or, unless verify is off, if any of the list
+	files it was read from changed since it was written"""
+	global dicts, counts, dict_sources
 	if len(dicts[name]) > 0 and not force_load:
 		return False
 	else:
-		pfd_path = mk_cache("%s.dict"%(name))
-		pfc_path = mk_cache("%s.count"%(name))
-		if os.path.exists(pfd_path) and os.path.exists(pfc_path):
-			pfd = pickle.Unpickler(open(pfd_path, "rb"))
-			dicts[name] = pfd.load()
-			pfc = pickle.Unpickler(open(pfc_path, "rb"))
-			counts[name] = pfc.load()
+		path = mk_cache("%s.ids"%(name))
+		if os.path.exists(path):
+			try:
+				cache = idcache.IdCache(path, verify)
+			except idcache.StaleCacheError, e:
+				print "load_dict [warning]: ignoring cache:", e
+				return False
+			dicts[name] = cache
+			counts[name] = cache.next_id
+			dict_sources[name] = [source for checksum, source in cache.sources]
 			return True
 		else:
 			return False
 
 
+def search_items(name):
+	"""the (text, id) items of the dictionary of name for its search index:
+	the title_key of productions and "firstname nickname lastname" of people
+	(with the number if it isn't 1)"""
+	global dicts
+	for key, id in dicts[name].iteritems():
+		if name == "people":
+			values = dict([(k, None if v == "\\N" else v) for k, v in zip(key_fields["people"], key.split("\t"))])
+			text = " ".join([v for v in (values["firstname"], values["nickname"], values["lastname"]) if v])
+			if values["number"] and values["number"] != "1":
+				text += " (%s)" % (values["number"])
+			yield text, id
+		else:
+			yield key, id
+
+
+def build_search_indices():
+	"""writes the search indices of the productions and people (see search.py)
+	to Options.search_dir, from the dictionaries"""
+	stats.start_phase("search indices")
+	if not os.path.isdir(Options.search_dir):
+		os.makedirs(Options.search_dir)
+	for name in ("productions", "people"):
+		start = time.time()
+		count = search.write_index("%s/%s.search" % (Options.search_dir, name), search_items(name))
+		stats.count("records", count)
+		print "__main__ [status]: %.2f seconds : search index of %d %s written." % (time.time() - start, count, name)
+	stats.end_phase()
+
+
 def connect_db(db, create_tables_enabled = False):
 	# Create tables enabled is there to provide a hard switch to stopping
 	# tables from being created, in the case of getting a connection to do
@@ -453,14 +901,25 @@ def connect_db(db, create_tables_enabled = False):
 		# db we would drop from all the tables
 		if db.clear_old_db and exists:
 			os.remove(db.database)
-		conn = sqlite3.connect(db.database)
+		# the background writer commits from its own thread
+		conn = sqlite3.connect(db.database, cached_statements = 1000, check_same_thread = not Options.write_queue)
 		c = conn.cursor()
+		if Options.sqlite_bulk:
+			for pragma in sqlite_bulk_pragmas:
+				c.execute(pragma)
 		if (db.clear_old_db or not exists) and create_tables_enabled:
 			create_tables(c)
 	elif db.type == DatabaseTypes.MYSQL:
 		MySQLdb = __import__("MySQLdb")
-		conn = MySQLdb.connect(host = db.host, db = db.database, user = db.user, passwd = db.password)
+		connect_args = {"local_infile": int(Options.mysql_load_data)}
+		if db.encoding:
+			# the utf8 tables are written in the encoding the values are decoded from
+			connect_args["charset"] = db.encoding.replace("-", "").lower()
+		conn = MySQLdb.connect(host = db.host, db = db.database, user = db.user, passwd = db.password, **connect_args)
 		c = conn.cursor()
+		if Options.mysql_load_data:
+			for setting in mysql_load_settings:
+				c.execute(setting)
 		if create_tables_enabled:		
 			create_tables(c, drop_all = db.clear_old_db)
 	elif db.type == DatabaseTypes.POSTGRES:
@@ -469,30 +928,622 @@ def connect_db(db, create_tables_enabled = False):
 		c = conn.cursor()
 		if create_tables_enabled:
 			create_tables(c, drop_all = db.clear_old_db)
+	elif db.type == DatabaseTypes.ARROW:
+		export = __import__("export")
+		conn = c = export.ArrowExport(db.database, mk_schema("sqlite", use_dict = True))
 	else:
 		print "__main__ [error]: unknown database type #%d." % (db.type)
 		quit()
 	return conn, c
 
 
+#
+# List file writing
+# The write_* functions take the records of a chunk and write them to the
+# database, all id assignment happens here (in the main process) so ids don't
+# depend on how the parsing was split up. Any state that carries over between
+# chunks (e.g. the current person) is kept in the state dictionary.
+#
+
+def write_report(record, state):
+	"""reports an error record, quits on fatal ones"""
+	if record[0] == "error" or record[0] == "fatal":
+		print("__main__ [error]: while processing %s [%d]: %s" % (state["file"], state["line"] + record[1], record[2]))
+	if record[0] == "fatal":
+		quit()
+
+
+def write_people(c, records, state):
+	for record in records:
+		if record[0] == "person":
+			person = record[1]
+			person["gender"] = state["gender"]
+			# incremental imports update people that are already in the database
+			state["person"] = select_or_insert(c, "people", person, skip_lookup = not Options.incremental)
+		elif record[0] == "acted_in":
+			state["production"] = select_or_insert(c, "productions", record[1])
+			# insert into the db the acted in information
+			acted_in = record[2]
+			acted_in["idproductions"] = state["production"]
+			acted_in["idpeople"] = state["person"]
+			append_row(c, "people_x_productions", acted_in)
+		else:
+			write_report(record, state)
+
+
+def write_movies(c, records, state):
+	for record in records:
+		if record[0] == "production":
+			state["production"] = select_or_insert(c, "productions", record[1], supress_output = True)
+		else:
+			write_report(record, state)
+
+
+def write_ratings(c, records, state):
+	for record in records:
+		if record[0] == "rating":
+			state["production"] = resolve(c, "productions", record[1], state)
+			if state["production"]:
+				rating = record[2]
+				rating["idproductions"] = state["production"]
+				append_row(c, "productions_ratings", rating)
+		else:
+			write_report(record, state)
+
+
+def write_business(c, records, state):
+	for record in records:
+		if record[0] == "production":
+			state["production"] = resolve(c, "productions", record[1], state) if record[1] else None
+		elif record[0] == "business":
+			if state["production"]:
+				business = record[1]
+				business["idproductions"] = state["production"]
+				append_row(c, "productions_business", business)
+		else:
+			write_report(record, state)
+
+
+def write_locations(c, records, state):
+	for record in records:
+		if record[0] == "location":
+			state["production"] = resolve(c, "productions", record[1], state)
+			if state["production"]:
+				location = record[2]
+				location["idproductions"] = state["production"]
+				append_row(c, "productions_locations", location)
+			elif not Options.rejects_file:
+				print("__main__ [error]: while processing %s: production/location lookup failed: %s" % (state["file"], record[3]))
+		else:
+			write_report(record, state)
+
+
+def write_biographies(c, records, state):
+	for record in records:
+		if record[0] == "person":
+			# search for actor/actress
+			# try male default
+			person = record[1]
+			person["gender"] = ActorsGender.MALE
+			state["person"] = resolve(c, "people", person, state, report = False)
+			if not state["person"]:
+				# try female
+				person["gender"] = ActorsGender.FEMALE
+				state["person"] = resolve(c, "people", person, state)
+		elif record[0] == "bio":
+			if state["person"]:
+				bio = record[1]
+				bio["idpeople"] = state["person"]
+				append_row(c, "biographies", bio)
+		else:
+			write_report(record, state)
+
+
+#
+# Incremental imports
+# The records of a list file are grouped by the person or production owning
+# them and a hash of each group is kept in a snapshot of the file (an id cache
+# mapping the owner's key to the hash of its first group, and the key followed
+# by a newline and the group's index to the hashes of any further groups of
+# the owner). An incremental import compares the groups of the new file
+# against the last snapshot and only writes the owners that are new or have
+# changed, after deleting the rows written for the old version of a changed
+# owner. Owners that no longer appear in the file have their rows deleted. Ids
+# stay stable since they come from the cached dictionaries of the previous
+# import.
+#
+
+# per list: the table owning the records, the statements deleting the rows of
+# an owner's records and the statements run in addition when the owner is
+# gone (%s being the owner's id)
+delta_deletes = {
+	"actors": ("people",
+		["DELETE FROM people_x_productions WHERE idpeople = %s"],
+		["DELETE FROM people WHERE idpeople = %s"]),
+	"actresses": ("people",
+		["DELETE FROM people_x_productions WHERE idpeople = %s"],
+		["DELETE FROM people WHERE idpeople = %s"]),
+	# productions are shared with the people lists so they are never deleted
+	"movies": ("productions",
+		[],
+		[]),
+	"ratings": ("productions",
+		["DELETE FROM productions_ratings WHERE idproductions = %s"],
+		[]),
+	"business": ("productions",
+		["DELETE FROM productions_business WHERE idproductions = %s"],
+		[]),
+	"locations": ("productions",
+		["DELETE FROM productions_locations WHERE idproductions = %s"],
+		[]),
+	"biographies": ("people",
+		["DELETE FROM biographies WHERE idpeople = %s"],
+		[])
+}
+
+# the record types starting a new group
+delta_group_starts = ("person", "production", "rating", "location")
+
+
+def mk_snapshot(list_name):
+	return mk_cache("%s.snapshot" % (list_name))
+
+
+def record_digest(records):
+	"""32 bit hash of the contents of a group of records"""
+	parts = []
+	for record in records:
+		parts.append(repr([sorted(part.items()) if isinstance(part, dict) else part for part in record]))
+	return struct.unpack("<I", hashlib.md5("\n".join(parts)).digest()[:4])[0]
+
+
+def delta_owner(state, record):
+	"""returns the (dictionary key, id) of the owner of a group started by
+	record, the id is None if the owner isn't known yet"""
+	owner_table = delta_deletes[state["list"]][0]
+	owner = dict(record[1]) if record[1] else {}
+	if owner_table == "people":
+		# people lists set the gender of their file, biographies have to try both
+		owner["gender"] = state.get("gender", ActorsGender.MALE)
+		key = pack_key(owner_table, owner)
+		if key not in dicts[owner_table] and "gender" not in state:
+			owner["gender"] = ActorsGender.FEMALE
+			if pack_key(owner_table, owner) in dicts[owner_table]:
+				key = pack_key(owner_table, owner)
+	elif owner:
+		key = pack_key(owner_table, owner)
+	else:
+		key = ""
+	return key, dicts[owner_table].get(key)
+
+
+def delta_delete(c, state, owner_id, gone = False):
+	"""deletes the rows written for the records of owner_id, and the owner
+	itself if gone"""
+	if owner_id is None:
+		return
+	owner_table, deletes, removes = delta_deletes[state["list"]]
+	for query in deletes + (removes if gone else []):
+		execute(c, query.replace("%s", get_placeholder(Database.type)), (owner_id,))
+
+
+def delta_group_key(key, index):
+	"""the snapshot key of the index-th group of the owner key"""
+	return key if index == 0 else "%s\n%d" % (key, index)
+
+
+def delta_rewrite(c, state, key, owner_id, writer):
+	"""deletes the rows of a changed owner and writes the groups of it that
+	were held back as unchanged"""
+	delta = state["delta"]
+	delta_delete(c, state, owner_id)
+	delta["changed"] += 1
+	delta["written"].add(key)
+	for group in delta["pending"].pop(key, []):
+		writer(c, group, state)
+
+
+def delta_write_group(c, state, writer):
+	"""writes the current group of records if its owner is new or has changed
+	since the last snapshot. The unchanged groups of owners with several groups
+	are held back until the owner is known to be unchanged as a whole, as a
+	change to any of them rewrites all of them."""
+	delta = state["delta"]
+	group = delta["group"]
+	if not group:
+		return
+	key = delta["key"]
+	index = delta["groups"].get(key, 0)
+	delta["groups"][key] = index + 1
+	digest = record_digest(group)
+	delta["new"][delta_group_key(key, index)] = digest
+	old = delta["old"]
+	old_digest = old.get(delta_group_key(key, index)) if old else None
+	if key in delta["written"]:
+		# new or changed owner, its rows are written again in full
+		writer(c, group, state)
+	elif old_digest is None:
+		if index == 0:
+			delta["inserted"] += 1
+		else:
+			# a group added to an unchanged owner only adds rows
+			delta["changed"] += 1
+			delta["pending"].pop(key, None)
+		delta["written"].add(key)
+		writer(c, group, state)
+	elif old_digest != digest:
+		delta_rewrite(c, state, key, delta["id"], writer)
+		writer(c, group, state)
+	elif key in delta["pending"] or old.get(delta_group_key(key, 1)) is not None:
+		delta["pending"].setdefault(key, []).append(group)
+	delta["group"] = []
+
+
+def delta_write(c, records, state, writer):
+	"""writer for incremental imports, groups the records by their owner and
+	passes the groups that changed on to writer"""
+	delta = state["delta"]
+	for record in records:
+		if record[0] == "error" or record[0] == "fatal":
+			writer(c, [record], state)
+			continue
+		if record[0] in delta_group_starts:
+			key, owner_id = delta_owner(state, record)
+			if key != delta["key"] or not delta["group"]:
+				delta_write_group(c, state, writer)
+				delta["key"], delta["id"] = key, owner_id
+		delta["group"].append(record)
+
+
+def delta_start(state):
+	"""sets up the incremental import state of a list, comparing against its
+	last snapshot if there is one"""
+	path = mk_snapshot(state["list"])
+	old = None
+	if Options.incremental and os.path.exists(path):
+		old = idcache.IdCache(path, verify = False)
+	state["delta"] = {"old": old, "new": {}, "group": [], "key": None, "id": None, "groups": {}, "written": set(), "pending": {},
+		"inserted": 0, "changed": 0, "deleted": 0}
+
+
+def delta_finish(c, state, writer):
+	"""writes the last group, deletes the rows of the owners that are gone and
+	saves the new snapshot of the list"""
+	global dicts
+	delta = state["delta"]
+	delta_write_group(c, state, writer)
+	owner_table = delta_deletes[state["list"]][0]
+	if delta["old"]:
+		for key in delta["pending"].keys():
+			# unchanged so far, but changed if the owner had more groups before
+			if delta["old"].get(delta_group_key(key, delta["groups"][key])) is not None:
+				delta_rewrite(c, state, key, dicts[owner_table].get(key), writer)
+		delta["pending"] = {}
+		flush_inserts(c)
+		for key, digest in delta["old"].iteritems():
+			if "\n" not in key and key not in delta["new"]:
+				delta_delete(c, state, dicts[owner_table].get(key), gone = True)
+				delta["deleted"] += 1
+				if delta_deletes[state["list"]][2] and key in dicts[owner_table]:
+					del dicts[owner_table][key]
+		delta["old"].close()
+		print "__main__ [status]: %s: %d inserted, %d changed, %d deleted." % (state["file"], delta["inserted"], delta["changed"], delta["deleted"])
+	new = delta["new"]
+	path = mk_snapshot(state["list"])
+	idcache.write_id_cache(path + ".new", ((key, new[key]) for key in sorted(new)), len(new), 0, [])
+	if os.path.exists(path):
+		os.remove(path)
+	os.rename(path + ".new", path)
+
+
+#
+# Checkpoints
+# With Options.checkpoint every commit while processing a list file is followed
+# by a checkpoint: the dictionary entries assigned since the last one are
+# appended to a journal and the list, the position after the last committed
+# chunk and the id counters are written to the checkpoint file (both in the
+# cache dir). Options.resume rebuilds the dictionaries from the journal, skips
+# the list files that were done and continues the current one from the
+# checkpoint's position (seeking to it, or skipping lines in compressed files).
+#
+
+def mk_checkpoint():
+	return mk_cache("checkpoint")
+
+
+def mk_journal():
+	return mk_cache("checkpoint.journal")
+
+
+def clear_checkpoint():
+	"""removes the checkpoint and the journal"""
+	if not os.path.isdir(Options.cache_dir):
+		os.makedirs(Options.cache_dir)
+	for path in (mk_checkpoint(), mk_journal()):
+		if os.path.exists(path):
+			os.remove(path)
+	checkpoint["assigned"] = {}
+
+
+def write_checkpoint(state, offset, line_number, done = False):
+	"""records a checkpoint after a commit, offset is the position in the list
+	file after the last committed chunk (None for compressed files) and
+	line_number the number of the last line of that chunk. With the background
+	writer it is written once the writer has run the commit."""
+	global counts
+	data = {"list": state["list"], "file": state["file"], "offset": offset, "line": line_number,
+		"done": done, "counts": dict(counts)}
+	assigned = checkpoint["assigned"]
+	checkpoint["assigned"] = {}
+	if pipeline["queue"]:
+		queue_write(save_checkpoint, data, assigned)
+	else:
+		save_checkpoint(data, assigned)
+
+
+def save_checkpoint(data, assigned):
+	"""appends the assigned (key, id) entries of each dictionary to the journal
+	and (atomically) replaces the checkpoint file"""
+	journal = open(mk_journal(), "ab")
+	for name, entries in assigned.iteritems():
+		for key, id in entries:
+			journal.write("%s\t%d\t%s\n" % (name, id, key))
+	journal.flush()
+	os.fsync(journal.fileno())
+	# entries after this are from a checkpoint that wasn't completed
+	data["journal"] = journal.tell()
+	journal.close()
+	path = mk_checkpoint()
+	f = open(path + ".new", "w")
+	json.dump(data, f)
+	f.flush()
+	os.fsync(f.fileno())
+	f.close()
+	if os.path.exists(path):
+		os.remove(path)
+	os.rename(path + ".new", path)
+
+
+def load_checkpoint():
+	"""restores the dictionaries and the id counters of the last checkpoint,
+	returns False if there is none"""
+	global dicts, counts
+	if not os.path.exists(mk_checkpoint()):
+		return False
+	data = json.load(open(mk_checkpoint()))
+	journal = open(mk_journal(), "rb")
+	for line in journal.read(data["journal"]).splitlines():
+		name, id, key = line.split("\t", 2)
+		dicts[name][key] = int(id)
+	journal.close()
+	# the journal is appended to from here on
+	open(mk_journal(), "r+b").truncate(data["journal"])
+	for name, count in data["counts"].iteritems():
+		counts[str(name)] = count
+	checkpoint["resume"] = data
+	print "__main__ [status]: resuming %s from line %d." % (data["list"], data["line"])
+	return True
+
+
+def resume_point(list_name):
+	"""returns where to start processing list_name when resuming: None from the
+	beginning, False not at all (it was done) or the (offset, line number) of
+	the checkpoint"""
+	data = checkpoint["resume"]
+	if not data or list_order.index(list_name) > list_order.index(data["list"]):
+		return None
+	if list_order.index(list_name) < list_order.index(data["list"]) or data["done"]:
+		return False
+	return data["offset"], data["line"]
+
+
+#
+# List file processing
+#
+
+def parse_chunks(pool, tasks):
+	"""runs the (function, arguments) parse tasks in order, yielding their
+	results. With a worker pool up to two tasks per worker are parsed ahead of
+	the writer, which keeps memory use bounded."""
+	if not pool:
+		for function, args in tasks:
+			yield function(*args)
+		return
+	pending = collections.deque()
+	for function, args in tasks:
+		pending.append(pool.apply_async(function, args))
+		if len(pending) >= 2 * Options.parse_processes:
+			yield pending.popleft().get()
+	while pending:
+		yield pending.popleft().get()
+
+
+def track_positions(start, tasks):
+	"""wraps the parse_lines tasks of a file read from start, returns the tasks
+	and a generator yielding the position in the file after each task, in the
+	order their results come back from parse_chunks"""
+	sizes = collections.deque()
+	def sized_tasks():
+		for function, args in tasks:
+			sizes.append(sum([len(line) for line in args[1]]))
+			yield function, args
+	def positions(position):
+		while True:
+			position += sizes.popleft()
+			yield position
+	return sized_tasks(), positions(start)
+
+
+def process_list(conn, c, pool, file_name, format, writer, state):
+	"""processes a list file laid out as described by format (see
+	parsers.list_formats): skips over the information at the beginning up to
+	and including the header line, then parses the chunks of data and writes
+	the parsed records with writer, committing every Options.commit_count lines
+	(only the changes since the last snapshot are written for incremental
+	imports) and writing a checkpoint after each commit if Options.checkpoint is
+	set. With a worker pool the workers read their chunks (byte ranges cut
+	on record boundaries) directly from the file, otherwise (or if the file is
+	compressed) the file is read line by line. The counters and timings of the
+	file are kept in stats, and the chunks are profiled if Options.profile is
+	set."""
+	state["file"] = file_name
+	resume = resume_point(state["list"])
+	if resume is False:
+		print "__main__ [status]: %s was done before the checkpoint, skipping it." % (file_name)
+		return
+	compressed = is_compressed(file_name)
+	# the position in a compressed file isn't known, so there is no ETA
+	stats.start_phase(state["list"], 0 if compressed else os.path.getsize(file_name))
+	profile = profiling.start_file(state["list"])
+	f = open_list(file_name)
+	# a checkpoint without an offset (of a compressed file) is resumed by line
+	if pool and not compressed and os.path.getsize(file_name) > 0 and not (resume and resume[0] is None):
+		mm = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+		start, end, line_number = find_data_range(mm, format.header, format.skip_lines, format.footer)
+		if resume:
+			start, line_number = resume
+		tasks = [(parse_range, (format.parser, file_name, range_start, range_end))
+			for range_start, range_end in split_data_range(mm, start, end, format.separator, Options.parse_chunk_bytes)]
+		mm.close()
+		# the position in the file after each parsed chunk, for the live report
+		positions = iter([args[3] for function, args in tasks])
+	else:
+		line_number = skip_header(f, format.header, format.skip_lines)
+		if resume and (compressed or resume[0] is None):
+			for i in xrange(resume[1] - line_number):
+				f.readline()
+			line_number = resume[1]
+		elif resume:
+			f.seek(resume[0])
+			line_number = resume[1]
+		tasks = ((parse_lines, (format.parser, lines))
+			for lines in read_chunks(f, format.footer, format.separator, Options.parse_chunk_lines))
+		positions = None
+		if not compressed:
+			tasks, positions = track_positions(f.tell(), tasks)
+	if Options.snapshot or Options.incremental:
+		delta_start(state)
+	chunks = parse_chunks(pool, tasks)
+	while True:
+		if profile:
+			profile.chunk_start(line_number)
+		parse_start = time.time()
+		try:
+			records, chunk_lines = next(chunks)
+		except StopIteration:
+			if profile:
+				profile.chunk_end(line_number)
+			break
+		write_start = time.time()
+		stats.add_time("parse_seconds", write_start - parse_start)
+		state["line"] = line_number + 1
+		if "delta" in state:
+			delta_write(c, records, state, writer)
+		else:
+			writer(c, records, state)
+		stats.add_time("write_seconds", time.time() - write_start)
+		if profile:
+			profile.chunk_end(line_number)
+		misses = sum(1 for record in records if record[0] == "error" or record[0] == "fatal")
+		stats.count("lines", chunk_lines)
+		stats.count("records", len(records) - misses)
+		stats.count("parse_misses", misses)
+		position = next(positions) if positions else None
+		stats.progress(position or 0)
+		next_line = line_number + chunk_lines
+		if Options.show_progress and (line_number//Options.progress_count != next_line//Options.progress_count):
+			print "__main__ [status]: processing line", next_line//Options.progress_count*Options.progress_count
+		if Options.commit_batches:
+			committing = pipeline["batches"] >= Options.commit_batches
+		else:
+			committing = Options.commit_count != -1 and (line_number//Options.commit_count != next_line//Options.commit_count)
+		if committing:
+			commit(conn, c, wait = False)
+			if Options.checkpoint:
+				write_checkpoint(state, position, next_line)
+		line_number = next_line
+	f.close()
+	if "delta" in state:
+		delta_finish(c, state, writer)
+	commit(conn, c)
+	if Options.checkpoint:
+		write_checkpoint(state, None, line_number, done = True)
+	if profile:
+		profile.finish()
+	stats.end_phase()
+
+
 if __name__ == "__main__":
 	if Options.show_time:
 		start = time.clock()
-	if Options.use_native:
-		parse = __import__("native.parse").parse
+	if Options.use_native and not use_native():
+		print "__main__ [warning]: the native parser hasn't been built (see native/), using regex."
+		Options.use_native = False
+	if Options.profile and not profiling.available():
+		print "__main__ [warning]: profiling disabled."
+		Options.profile = None
+	if Options.use_copy and (Database.type != DatabaseTypes.POSTGRES or not Options.use_dict):
+		print "__main__ [warning]: copy loading requires postgres and use_dict, using inserts."
+		Options.use_copy = False
+	if Options.mysql_load_data and (Database.type != DatabaseTypes.MYSQL or not Options.use_dict):
+		print "__main__ [warning]: load data loading requires mysql and use_dict, using inserts."
+		Options.mysql_load_data = False
+	if Options.use_copy or Options.mysql_load_data:
+		# bulk loading always creates the keys after the load
+		Options.defer_indexes = True
+		# one transaction per list file, loading each table's rows at once
+		Options.commit_count = -1
+		Options.commit_batches = 0
+	if Options.sqlite_bulk:
+		if Database.type == DatabaseTypes.SQLITE:
+			# one transaction per list file
+			Options.commit_count = -1
+			Options.commit_batches = 0
+		else:
+			Options.sqlite_bulk = False
+	if Database.type == DatabaseTypes.ARROW:
+		if not Options.use_dict or Options.incremental:
+			print "__main__ [error]: exporting to arrow requires use_dict and can't be incremental."
+			quit()
+		# the files have no keys or indices to create
+		Options.defer_indexes = False
+	if Options.postprocess and not os.path.exists(mk_postprocess(get_schema_prefix(Database.type))):
+		print "__main__ [warning]: there is no postprocess script for this database type."
+		Options.postprocess = False
+	if Options.write_queue and not Options.use_dict:
+		print "__main__ [warning]: the background writer requires use_dict, writing in the main thread."
+		Options.write_queue = 0
+	if Options.resume:
+		Options.checkpoint = True
+	if Options.checkpoint and (not Options.use_dict or Options.snapshot or Options.incremental or Options.sqlite_bulk or
+			Database.type == DatabaseTypes.ARROW):
+		if Options.resume:
+			print "__main__ [error]: resuming requires use_dict and a database that isn't loaded in bulk, snapshots or incrementally."
+			quit()
+		print "__main__ [warning]: checkpoints require use_dict and a database that isn't loaded in bulk, snapshots or incrementally."
+		Options.checkpoint = False
+	if Options.resume:
+		# the tables and the rows committed up to the checkpoint are kept
+		Database.clear_old_db = False
+	if Options.search_index and not Options.use_dict:
+		print "__main__ [warning]: the search indices are built from the dictionaries, they require use_dict."
+		Options.search_index = False
+	if Options.defer_indexes and not Options.use_dict:
+		print "__main__ [warning]: deferring the indices requires use_dict, creating them with the tables."
+		Options.defer_indexes = False
 	if Options.use_dict:
 		dicts["people"] = {}
 		dicts["productions"] = {}
-		dicts["ratings"] = {}
-		dicts["business"] = {}
-		dicts["locations"] = {}
-		dicts["biographies"] = {}
 		counts["people"] = 1
 		counts["productions"] = 1
-		counts["ratings"] = 1
-		counts["business"] = 1
-		counts["locations"] = 1
+		# ids of the rows appended with append_row
 		counts["biographies"] = 1
+	if Options.resume:
+		if not load_checkpoint():
+			print "__main__ [error]: there is no checkpoint to resume from."
+			quit()
+	elif Options.checkpoint:
+		clear_checkpoint()
 	
 	process_flags = { 
 		"people": False,
@@ -503,7 +1554,29 @@ if __name__ == "__main__":
 		"biographies": True
 	}
 	
-	conn, c = connect_db(Database, create_tables_enabled = True)
+	if Options.incremental:
+		if not (Options.use_dict and Options.use_cache):
+			print "__main__ [error]: incremental imports require use_dict and use_cache."
+			quit()
+		# the dictionaries of the last import are expected to be out of date
+		if not (load_dict("people", verify = False) and load_dict("productions", verify = False)):
+			print "__main__ [error]: incremental imports require the dictionary caches of a previous import."
+			quit()
+		Database.clear_old_db = False
+		# the keys and indices of the existing tables are already there
+		Options.defer_indexes = False
+	
+	# start the parsing workers before connecting so they don't inherit the connection
+	pool = None
+	if Options.parse_processes > 1:
+		pool = multiprocessing.Pool(Options.parse_processes)
+	conn, c = connect_db(Database, create_tables_enabled = not (Options.incremental or Options.resume))
+	if Options.incremental:
+		# continue the ids generated in program for tables without a cached dictionary
+		c.execute("SELECT MAX(idbiographies) FROM biographies")
+		counts["biographies"] = (c.fetchone()[0] or 0) + 1
+	if Options.write_queue:
+		start_writer()
 	
 	if Options.use_native:
 		print "__main__ [status]: using native c parsing code."
@@ -520,86 +1593,12 @@ if __name__ == "__main__":
 		files_to_process = ["actresses", "actors"]
 		for file in files_to_process:
 			current_file = mk(file)
-			current_gender = ActorsGender.MALE if file=="actors" else ActorsGender.FEMALE
-			f = open(current_file)
-			# Skip over the information at the beginning and get to the actual data list
-			line_number = 1 
-			line = f.readline()
-			while(line and line != "----			------\n"):
-				line = f.readline()
-				line_number += 1
-			new_actor = True
-			for line in f:
-				if Options.show_progress and (line_number%Options.progress_count == 0):
-					print "__main__ [status]: processing line", line_number
-				if Options.commit_count != -1 and (line_number%Options.commit_count == 0):
-					conn.commit()
-				line_number += 1
-				if line == "\n":
-					new_actor = True
-					continue
-				elif line == "-----------------------------------------------------------------------------\n":
-					# this is the last valid line before there is a bunch of junk
-					break
-				if new_actor:
-					# reset all names to defaults
-					current_lastname = ""
-					current_firstname = ""
-					current_nickname = ""
-					current_number = 1
-					# use regex to parse out name parts
-					name = line.split('\t')[0]
-					m = re.match(ParseRegexes.name, name)
-					if not m:
-						print("__main__ [error]: while processing " + current_file + "[" + str(line_number) + "]: " + "invalid name : " + name)
-					else:
-						current_nickname = m.group(1).strip() if m.group(1) else None
-						current_lastname = m.group(3).strip() if m.group(3) else None
-						current_firstname = m.group(4).strip() # only required field
-						current_number = (rntoi(m.group(6)) + 1) if m.group(6) else 1
-					current_actor = select_or_insert(c, "people", {"lastname" : current_lastname, "firstname" : current_firstname, "nickname": current_nickname, "gender": current_gender, "number": current_number}, skip_lookup = True)
-				# process line
-				if new_actor:
-					new_actor = False
-					to_process = line.split('\t')[-1].strip() # use the rest of the line if we read in actor data
-				else:
-					to_process = line.strip()
-				good = False
-				n = None
-				n = re.match(ParseRegexes.acted_in, to_process)
-				if n:
-					good = True
-					title = n.group(1).strip()
-					try:
-						if n.group(3).strip() == "????":
-							year = -1
-						else:					
-							year = int(n.group(3)) # there always has to be a year
-					except ValueError:
-						print("__main__ [error]: while processing " + current_file + "[" + str(line_number) + "]: " +
-						"year not valid integer value: " + to_process)
-						quit()
-					number = (rntoi(n.group(4)) + 1) if n.group(4) else 1 # in roman numerals, needs to be converted
-					special_code = MoviesType.from_str(n.group(6))
-					broadcast_date = n.group(9).replace("(", "").replace(")","") if n.group(9) else "          "
-					episode_title = n.group(8).strip() if n.group(8) else broadcast_date
-					episode_series = int(n.group(10)) if n.group(10) else -1
-					episode_number = int(n.group(11)) if n.group(11) else -1
-					special_information = n.group(15).strip() if n.group(15) else None
-					character_name = n.group(17).strip() if n.group(17) else None
-					billing_position = int(n.group(19)) if n.group(19) else None
-				if good:
-					current_production = select_or_insert(c, "productions", {"title": title, "year": year, "number": number, "productions_type": special_code, "episode_title": episode_title, "season": episode_series, "episode_number": episode_number})
-					# insert into the db the acted in information
-					select_or_insert(c, "people_x_productions", {"idproductions": current_production, "idpeople": current_actor, "character": character_name, "billing_position": billing_position, "special_information": special_information}, skip_lookup = True, supress_output = True)
-				else:
-					print("__main__ [error]: while processing" + current_file + "[" + str(line_number) + "]: " + "invalid info: " + to_process)
-					if Options.use_native:
-						print "parsed as: ", n
-				# raw_input("Press Enter to continue...")
-			f.close()
-			conn.commit()
-			print "__main__ [status]: processing of", current_file, "complete. (last pid:", current_production, ")"
+			if Options.use_dict:
+				dict_sources.setdefault("people", []).append(current_file)
+				dict_sources.setdefault("productions", []).append(current_file)
+			state = {"list": file, "gender": ActorsGender.MALE if file=="actors" else ActorsGender.FEMALE, "production": None}
+			process_list(conn, c, pool, current_file, list_formats[file], write_people, state)
+			print "__main__ [status]: processing of", current_file, "complete. (last pid:", state["production"], ")"
 		if Options.use_cache and Options.use_dict:
 			save_dict("people")
 			save_dict("productions")
@@ -614,53 +1613,13 @@ if __name__ == "__main__":
 		current_file = mk("movies")
 		if Options.use_cache and Options.use_dict:
 			load_dict("productions")
-		f = open(current_file)
-		line_number = 1 
-		# Skip over the information at the beginning and get to the actual data list
-		line = f.readline()
-		while(line and line != "===========\n"):
-			line = f.readline()
-			line_number += 1
-		f.readline() # skip over the blank line inbetween movie list and header
-		line_number += 1
-		for line in f:
-			if Options.show_progress and (line_number%Options.progress_count == 0):
-				print "__main__ [status]: processing line", line_number
-			if Options.commit_count != -1 and (line_number%Options.commit_count == 0):
-				conn.commit()
-			line_number += 1
-			if line == 	"--------------------------------------------------------------------------------\n":
-				# this is the last valid line before there is a bunch of junk
-				break
-			m = re.match(ParseRegexes.movies, line)
-			if not m:
-				print("__main__ [error]: while processing " + current_file + "[" + str(line_number) + "]: " +
-				"invalid movie : " + line)
-			else:
-				title = m.group(1).strip()
-				try:
-					if m.group(3).strip() == "????":
-						year = -1
-					else:					
-						year = int(m.group(3)) # there always has to be a year
-				except ValueError:
-					print("__main__ [error]: while processing " + current_file + "[" + str(line_number) + "]: " +
-					"year not valid integer value: " + line)
-					quit()
-				number = (rntoi(m.group(4)) + 1) if m.group(4) else 1 # in roman numerals, needs to be converted
-				special_code = MoviesType.from_str(m.group(6))
-				broadcast_date = m.group(9).replace("(", "").replace(")","") if m.group(9) else "          "
-				episode_title = m.group(8).strip() if m.group(8) else broadcast_date
-				episode_series = int(m.group(10)) if m.group(10) else -1
-				episode_number = int(m.group(11)) if m.group(11) else -1
-				current_production = select_or_insert(c, "productions", {"title": title, "year": year, "number": number, "productions_type": special_code, "episode_title": episode_title, "season": episode_series, "episode_number": episode_number}, supress_output = True)
-			# raw_input("Press Enter to continue...")
-		f.close()
-		conn.commit()
+		if Options.use_dict:
+			dict_sources.setdefault("productions", []).append(current_file)
+		state = {"list": "movies", "production": None}
+		process_list(conn, c, pool, current_file, list_formats["movies"], write_movies, state)
 		if Options.use_cache and Options.use_dict:
-			save_dict("movies")
-			save_dict("series")
-		print "__main__ [status]: processing of", current_file, "complete. (last pid:", current_production, ")"
+			save_dict("productions")
+		print "__main__ [status]: processing of", current_file, "complete. (last pid:", state["production"], ")"
 
 		
 	#
@@ -676,72 +1635,9 @@ if __name__ == "__main__":
 				print "__main__ [status]: loaded productions dictionary cache file."
 			else:
 				print "__main__ [warning]: failed to load productions dictionary cache file."
-		f = open(current_file)
-		# Skip over the information at the beginning and get to the actual data list
-		line_number = 1 
-		line = f.readline()
-		while(line and line != "MOVIE RATINGS REPORT\n"):
-			line = f.readline()
-			line_number += 1
-		line = f.readline() # read over the seperator line
-		line = f.readline() # read over the seperator line
-		line_number += 1
-		for line in f:
-			if Options.show_progress and (line_number%Options.progress_count == 0):
-				print "__main__ [status]: processing line", line_number
-			if Options.commit_count != -1 and (line_number%Options.commit_count == 0):
-				conn.commit()
-			line_number += 1
-			if line == "\n":
-				continue
-			elif line == "------------------------------------------------------------------------------\n":
-					# this is the last valid line before there is a bunch of junk
-					break
-			else:
-				# reset all info to defaults
-				current_title = ""
-				current_year = -1
-				current_number = 1
-				current_special_code = MoviesType.M
-				current_distribution = ""
-				current_votes = -1
-				current_rating = -1
-				episode_title = ""
-				episode_series = -1
-				episode_number = -1
-				# use regex to parse out movie title parts
-				title = line.strip()
-				m = re.match(ParseRegexes.title_rating, title)
-				if m:
-					current_title = m.group(4).strip()
-					if m.group(6) and m.group(6).strip() == "????":
-						current_year = -1
-					elif m.group(6):
-						current_year = int(m.group(6))
-					current_number = (rntoi(m.group(7)) + 1) if m.group(7) else 1
-					current_special_code = MoviesType.from_str(m.group(9))
-					broadcast_date = m.group(12).replace("(", "").replace(")","") if m.group(12) else "          "
-					episode_title = m.group(11).strip() if m.group(11) else broadcast_date
-					episode_series = int(m.group(13)) if m.group(13) else -1
-					episode_number = int(m.group(14)) if m.group(14) else -1
-					current_distribution = m.group(1).strip() if m.group(1) else None
-					current_votes = m.group(2)
-					current_rating = m.group(3)
-					dict_only_search = True if Options.use_dict else False
-					current_production = select(c, "productions", {"title": current_title, "year": current_year, "number": current_number, "productions_type": current_special_code, "episode_title": episode_title, "season": episode_series, "episode_number": episode_number}, dict_only_search)
-					if current_production:
-						select_or_insert(c, "productions_ratings", {"idproductions": current_production, "distribution": current_distribution, "votes": current_votes, "rating": current_rating}, skip_lookup = True, supress_output = True)
-					else:
-						pass
-						# print("__main__ [error]: while processing %s [%d]: production/rating lookup failed: %s" % (current_file, line_number, title))
-				else:
-					print("__main__ [error]: while processing %s [%d]: invalid title/rating: %s" % (current_file, line_number, title))
-			# raw_input("Press Enter to continue...")
-		f.close()
-		conn.commit()
-		if Options.use_cache and Options.use_dict:
-			save_dict("ratings")
-		print "__main__ [status]: processing of", current_file, "complete. (last pid:", current_production, ")"
+		state = {"list": "ratings", "production": None}
+		process_list(conn, c, pool, current_file, list_formats["ratings"], write_ratings, state)
+		print "__main__ [status]: processing of", current_file, "complete. (last pid:", state["production"], ")"
 
 		
 	#
@@ -757,100 +1653,9 @@ if __name__ == "__main__":
 				print "__main__ [status]: loaded productions dictionary cache file."
 			else:
 				print "__main__ [warning]: failed to load productions dictionary cache file."
-		f = open(current_file)
-		# Skip over the information at the beginning and get to the actual data list
-		line_number = 1 
-		line = f.readline()
-		while(line and line != "BUSINESS LIST\n"):
-			line = f.readline()
-			line_number += 1
-		line = f.readline() # read over the seperator line
-		line = f.readline() # read over the seperator line
-		line_number += 1
-		current_movie = None
-		new_movie = True
-		is_valid = True
-		for line in f:
-			if Options.show_progress and (line_number%Options.progress_count == 0):
-				print "__main__ [status]: processing line", line_number
-			if Options.commit_count != -1 and (line_number%Options.commit_count == 0):
-				conn.commit()
-			line_number += 1
-			if line == "-------------------------------------------------------------------------------\n":
-				new_movie = True
-				continue
-			elif line == "\n":
-				continue
-			if new_movie:
-				# reset all info to defaults
-				current_title = ""
-				current_year = -1
-				current_number = 1
-				current_special_code = MoviesType.M
-				episode_title = ""
-				episode_series = -1
-				episode_number = -1
-				type = ""
-				currency = ""
-				amount = -1
-				region = ""
-				date = ""
-				screens = -1
-				episode_title = ""
-				episode_series = -1
-				episode_number = -1
-				# use regex to parse out movie title parts
-				title = line.strip()
-				m = re.match(ParseRegexes.title_business, title)
-				if m:
-					current_title = m.group(1).strip()
-					if m.group(3) and m.group(3).strip() == "????":
-						current_year = -1
-					elif m.group(3):
-						current_year = int(m.group(3))
-					current_number = (rntoi(m.group(4)) + 1) if m.group(4) else 1
-					current_special_code = MoviesType.from_str(m.group(6))
-					broadcast_date = m.group(9).replace("(", "").replace(")","") if m.group(9) else "          "
-					episode_title = m.group(8).strip() if m.group(8) else broadcast_date
-					episode_series = int(m.group(10)) if m.group(10) else -1
-					episode_number = int(m.group(11)) if m.group(11) else -1
-					dict_only_search = True if Options.use_dict else False
-					current_production = select(c, "productions", {"title": current_title, "year": current_year, "number": current_number, "productions_type": current_special_code, "episode_title": episode_title, "season": episode_series, "episode_number": episode_number}, dict_only_search)
-				if current_production:
-					is_valid = True
-					new_movie = False
-					continue
-				else:
-					is_valid = False
-					new_movie = False
-					continue
-			# process line
-			if is_valid:
-				to_process = line.strip()
-				n = re.match(ParseRegexes.data_business, to_process)
-				if n:
-					type = n.group(1).strip()
-					currency = n.group(3).strip() if n.group(3) else "USD"
-					amount = int(re.sub(",", "", n.group(5)))
-					amount = -1 if amount > 9223372036854775807 else amount
-					region = n.group(8).strip() if n.group(8) else None
-					date = n.group(11).strip() if n.group(11) else "31 December 2100"
-					screens = int(re.sub(",", "", n.group(14))) if n.group(14) else -1
-					if type == "BT":
-						type = "budget"
-					elif type == "GR":
-						type = "box office gross"
-					elif type == "OW":
-						type = "opening weekend box office take"
-					select_or_insert(c, "productions_business", {"idproductions": current_production, "business_type": type, "currency": currency, "amount": amount, "region": region, "date": date, "screens": screens}, skip_lookup = True, supress_output = True)
-				else:
-					pass
-			# raw_input("Press Enter to continue...")
-		f.close()
-		conn.commit()
-		if Options.use_cache and Options.use_dict:
-			save_dict("business")
-		print "__main__ [status]: processing of", current_file, "complete. (last pid:", current_production, ")"
+		state = {"list": "business", "production": None}
+		process_list(conn, c, pool, current_file, list_formats["business"], write_business, state)
+		print "__main__ [status]: processing of", current_file, "complete. (last pid:", state["production"], ")"
 
 		
 	#
@@ -866,71 +1671,9 @@ if __name__ == "__main__":
 				print "__main__ [status]: loaded productions dictionary cache file."
 			else:
 				print "__main__ [warning]: failed to load productions dictionary cache file."
-		f = open(current_file)
-		# Skip over the information at the beginning and get to the actual data list
-		line_number = 1 
-		line = f.readline()
-		while(line and line != "LOCATIONS LIST\n"):
-			line = f.readline()
-			line_number += 1
-		line = f.readline() # read over the seperator line
-		line = f.readline() # read over the seperator line
-		line_number += 1
-		for line in f:
-			if Options.show_progress and (line_number%Options.progress_count == 0):
-				print "__main__ [status]: processing line", line_number
-			if Options.commit_count != -1 and (line_number%Options.commit_count == 0):
-				conn.commit()
-			line_number += 1
-			if line == "\n":
-				continue
-			elif line == "-------------------------------------------------------------------------------\n":
-					# this is the last valid line before there is a bunch of junk
-					break
-			else:
-				# reset all info to defaults
-				current_title = ""
-				current_year = -1
-				current_number = 1
-				current_special_code = MoviesType.M
-				episode_title = "          "
-				episode_series = -1
-				episode_number = -1
-				location_name = ""
-				location = ""
-				location_info = ""
-				# use regex to parse out movie title parts
-				title = line.strip()
-				m = re.match(ParseRegexes.location, title)
-				if m:
-					current_title = m.group(1).strip()
-					if m.group(3) and m.group(3).strip() == "????":
-						current_year = -1
-					elif m.group(3):
-						current_year = int(m.group(3))
-					current_number = (rntoi(m.group(4)) + 1) if m.group(4) else 1
-					current_special_code = MoviesType.from_str(m.group(6))
-					broadcast_date = m.group(9).replace("(", "").replace(")","") if m.group(9) else "          "
-					episode_title = m.group(8).strip() if m.group(8) else broadcast_date
-					episode_series = int(m.group(10)) if m.group(10) else -1
-					episode_number = int(m.group(11)) if m.group(11) else -1
-					location_name = m.group(17).strip() if m.group(17) else None
-					location = m.group(18).strip() if m.group(18) else None
-					location_info = m.group(20).strip() if m.group(20) else None
-					dict_only_search = True if Options.use_dict else False
-					current_production = select(c, "productions", {"title": current_title, "year": current_year, "number": current_number, "productions_type": current_special_code, "episode_title": episode_title, "season": episode_series, "episode_number": episode_number}, dict_only_search)
-					if current_production:
-						select_or_insert(c, "productions_locations", {"idproductions": current_production, "location_name": location_name, "location": location, "location_info": location_info}, skip_lookup = True, supress_output = True)
-					else:
-						print("__main__ [error]: while processing %s [%d]: production/location lookup failed: %s" % (current_file, line_number, title))
-				else:
-					print("__main__ [error]: while processing %s [%d]: invalid title/location: %s" % (current_file, line_number, title))
-			# raw_input("Press Enter to continue...")
-		f.close()
-		conn.commit()
-		if Options.use_cache and Options.use_dict:
-			save_dict("locations")
-		print "__main__ [status]: processing of", current_file, "complete. (last pid:", current_production, ")"
+		state = {"list": "locations", "production": None}
+		process_list(conn, c, pool, current_file, list_formats["locations"], write_locations, state)
+		print "__main__ [status]: processing of", current_file, "complete. (last pid:", state["production"], ")"
 	
 	
 	#
@@ -946,91 +1689,32 @@ if __name__ == "__main__":
 				print "__main__ [status]: loaded people dictionary cache file."
 			else:
 				print "__main__ [warning]: failed to load people dictionary cache file."
-		f = open(current_file)
-		# Skip over the information at the beginning and get to the actual data list
-		line_number = 1 
-		line = f.readline()
-		while(line and line != "BIOGRAPHY LIST\n"):
-			line = f.readline()
-			line_number += 1
-		line = f.readline() # read over the seperator line
-		line = f.readline() # read over the seperator line
-		line_number += 1
-		current_person = None
-		new_bio = True
-		is_valid = True
-		for line in f:
-			if Options.show_progress and (line_number%Options.progress_count == 0):
-				print "__main__ [status]: processing line", line_number
-			if Options.commit_count != -1 and (line_number%Options.commit_count == 0):
-				conn.commit()
-			line_number += 1
-			if line == "-------------------------------------------------------------------------------\n":
-				new_bio = True
-				continue
-			elif line == "\n":
-				continue
-			if new_bio:
-				# reset all names to defaults
-				current_lastname = ""
-				current_firstname = ""
-				current_nickname = ""
-				current_number = 1
-				# use regex to parse out name parts
-				name = line.strip()
-				m = re.match(ParseRegexes.bio_name, name)
-				if not m:
-					print("__main__ [error]: while processing " + current_file + "[" + str(line_number) + "]: " +
-					"invalid name : " + name)
-				else:
-					current_nickname = m.group(1).strip() if m.group(1) else None
-					current_lastname = m.group(3).strip() if m.group(3) else None
-					current_firstname = m.group(4).strip()
-					current_number = (rntoi(m.group(6)) + 1) if m.group(6) else 1
-				# search for actor/actress
-				# try male default
-				current_person = None
-				dict_only_search = True if Options.use_dict else False
-				current_person = select(c, "people", {"lastname" : current_lastname, "firstname" : current_firstname, "nickname": current_nickname, "gender": ActorsGender.MALE, "number": current_number}, dict_only_search)
-				if not current_person:
-					# try female
-					current_person = select(c, "people", {"lastname" : current_lastname, "firstname" : current_firstname, "nickname": current_nickname, "gender": ActorsGender.FEMALE, "number": current_number}, dict_only_search)
-				new_bio = False
-				if current_person:
-					is_valid = True
-					continue
-				else:
-					is_valid = False
-					continue
-			# process line
-			if is_valid:
-				current_type = None
-				current_date = None
-				current_location = None
-				current_cod = None
-				to_process = line.strip()
-				n = re.match(ParseRegexes.bio_data, to_process)
-				if n:
-					current_type = n.group(1).strip()
-					current_date = n.group(8).strip()
-					current_location = n.group(9).strip() if n.group(9) else None
-					current_cod = n.group(11).strip() if n.group(11) else None
-					if current_type == "DB":
-						current_type = "born"
-					elif current_type == "DD":
-						current_type = "died"
-					select_or_insert(c, "biographies", {"idpeople": current_person, "biography_type": current_type, "biography_date": current_date, "biography_location": current_location, "cause_of_death": current_cod}, skip_lookup = True)
-				else:
-					pass
-		f.close()
-		conn.commit()
-		if Options.use_cache and Options.use_dict:
-			save_dict("biographies")
+		state = {"list": "biographies", "person": None}
+		process_list(conn, c, pool, current_file, list_formats["biographies"], write_biographies, state)
 		print "__main__ [status]: processing of", current_file, "complete."
 		
-		
+	if pool:
+		pool.close()
+		pool.join()
+	stop_writer()
+	if Options.search_index:
+		build_search_indices()
+	if Options.defer_indexes:
+		create_keys(conn, c)
+	if Options.postprocess:
+		postprocess(conn, c)
+	if Options.sqlite_bulk:
+		finish_sqlite(conn, c)
+	if Options.checkpoint:
+		# the import is complete, there is nothing to resume
+		clear_checkpoint()
 		
 	c.close()
 	conn.close()
+	if rejects["file"]:
+		rejects["file"].close()
+		print "__main__ [status]: rows that couldn't be resolved written to %s." % (Options.rejects_file)
 	if Options.show_time:
 		print "__main__ [status]: total time:", time.clock() - start, "seconds."
+	if Options.stats_file:
+		print "__main__ [status]: statistics written to %s." % (Options.stats_file)